@@ -0,0 +1,195 @@
+# benchmarks/bench_async_serving.py
+"""
+Tail latency of /predict and /plot under mixed traffic: ASGI app vs Flask app.
+
+Requests arrive open-loop (Poisson, --rate per second), so a slow request delays
+the ones behind it instead of slowing the arrival rate down. Most are single-row
+/predict calls; a --plot-fraction are /plot calls for random tickers, which hit a
+stubbed downloader that sleeps --download-latency seconds (no network). Latency
+is measured from the scheduled arrival time to the complete response.
+
+The ASGI app (homework13/app_async.py) is driven in-process through its ASGI
+callable. With --compare-sync the same schedule is replayed against the Flask app
+(homework13/app_flask.py) on --sync-workers threads, like a threaded WSGI server.
+
+    python benchmarks/bench_async_serving.py --rate 200 --duration 5 --compare-sync
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "homework" / "homework13"))
+
+
+def _make_artifacts(path: Path, n_features: int = 7, seed: int = 0) -> None:
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.impute import SimpleImputer
+    from sklearn.preprocessing import StandardScaler
+    from src.io import save_artifacts
+
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(2000, n_features))
+    y = (X[:, 0] + rng.normal(size=len(X)) > 0).astype(int)
+    imputer = SimpleImputer(strategy="median").fit(X)
+    model = RandomForestClassifier(n_estimators=100, random_state=seed).fit(imputer.transform(X), y)
+    save_artifacts(path, model, imputer, StandardScaler().fit(X), {"threshold": 0.5})
+
+
+class StubDownloader:
+    """download_data stand-in: sleeps like a slow upstream, returns synthetic daily closes."""
+
+    def __init__(self, latency: float, seed: int = 0):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._rng = np.random.default_rng(seed)
+
+    def __call__(self, ticker, start, end=None, auto_adjust=True):
+        with self._lock:
+            self.calls += 1
+            delay = self.latency * float(self._rng.lognormal(0, 0.25))
+        time.sleep(delay)
+        dates = pd.bdate_range(start, end or pd.Timestamp.today(), inclusive="left")
+        close = 100 + np.cumsum(np.random.default_rng(zlib.crc32(ticker.encode())).normal(0, 1, len(dates)))
+        return pd.DataFrame({"Date": dates, "Close": close, "Volume": 1e6})
+
+
+def schedule(rate: float, duration: float, plot_fraction: float, n_tickers: int, seed: int = 0) -> list:
+    """[(arrival_s, method, path, query, body)] with Poisson arrivals."""
+    rng = np.random.default_rng(seed)
+    arrivals = np.cumsum(rng.exponential(1 / rate, size=int(rate * duration * 1.5) + 10))
+    arrivals = arrivals[arrivals < duration]
+    reqs = []
+    for t in arrivals:
+        if rng.random() < plot_fraction:
+            ticker = f"T{rng.integers(n_tickers):03d}"
+            reqs.append((float(t), "GET", "/plot", f"ticker={ticker}&start=2020-01-01&end=2024-01-01", b""))
+        else:
+            row = rng.normal(size=7).round(4).tolist()
+            reqs.append((float(t), "POST", "/predict", "", json.dumps({"features": row}).encode()))
+    return reqs
+
+
+async def _asgi_call(app, method, path, query, body):
+    scope = {"type": "http", "method": method, "path": path, "query_string": query.encode(),
+             "headers": [(b"content-type", b"application/json")]}
+    sent = {"body": body, "more_body": False}
+    status = []
+
+    async def receive():
+        return sent
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send)
+    return status[0]
+
+
+def run_async(module, reqs) -> list:
+    async def main():
+        t0 = time.perf_counter() + 0.05
+        out = []
+
+        async def one(arrival, method, path, query, body):
+            await asyncio.sleep(max(0.0, t0 + arrival - time.perf_counter()))
+            status = await _asgi_call(module.app, method, path, query, body)
+            out.append((path, status, time.perf_counter() - (t0 + arrival)))
+
+        await asyncio.gather(*(one(*r) for r in reqs))
+        return out
+
+    return asyncio.run(main())
+
+
+def run_sync(module, reqs, workers: int) -> list:
+    out, lock = [], threading.Lock()
+    local = threading.local()
+
+    def one(arrival_at, method, path, query, body):
+        if not hasattr(local, "client"):
+            local.client = module.app.test_client()
+        url = f"{path}?{query}" if query else path
+        resp = local.client.open(url, method=method, data=body, content_type="application/json")
+        with lock:
+            out.append((path, resp.status_code, time.perf_counter() - arrival_at))
+
+    with ThreadPoolExecutor(workers) as pool:
+        t0 = time.perf_counter() + 0.05
+        for arrival, method, path, query, body in reqs:
+            time.sleep(max(0.0, t0 + arrival - time.perf_counter()))
+            pool.submit(one, t0 + arrival, method, path, query, body)
+    return out
+
+
+def summarize(mode: str, results: list) -> list:
+    df = pd.DataFrame(results, columns=["route", "status", "latency"])
+    rows = []
+    for route, grp in df.groupby("route"):
+        ms = grp["latency"].to_numpy() * 1e3
+        rows.append({"mode": mode, "route": route, "requests": len(grp),
+                     "errors": int(((grp["status"] >= 500) & (grp["status"] != 503)).sum()),
+                     "shed_503": int((grp["status"] == 503).sum()),
+                     "p50_ms": round(float(np.percentile(ms, 50)), 1),
+                     "p95_ms": round(float(np.percentile(ms, 95)), 1),
+                     "p99_ms": round(float(np.percentile(ms, 99)), 1),
+                     "max_ms": round(float(ms.max()), 1)})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rate", type=float, default=200, help="requests per second")
+    parser.add_argument("--duration", type=float, default=5, help="seconds of traffic")
+    parser.add_argument("--plot-fraction", type=float, default=0.1)
+    parser.add_argument("--tickers", type=int, default=100, help="distinct tickers requested by /plot")
+    parser.add_argument("--download-latency", type=float, default=0.3, help="stub download time (s)")
+    parser.add_argument("--compare-sync", action="store_true", help="also run the Flask app on a thread pool")
+    parser.add_argument("--sync-workers", type=int, default=8)
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench_async_"))
+    _make_artifacts(tmp / "artifacts")
+    os.environ.update({"ARTIFACT_DIR": str(tmp / "artifacts"), "MODEL_POLL_SECONDS": "0",
+                       "FEATURE_STORE_DIR": str(tmp / "features")})
+    reqs = schedule(args.rate, args.duration, args.plot_fraction, args.tickers)
+    rows, fetches = [], {}
+
+    modes = [("async", "app_async")] + ([("sync", "app_flask")] if args.compare_sync else [])
+    for mode, module_name in modes:
+        module = __import__(module_name)
+        stub = StubDownloader(args.download_latency)
+        module.PRICES.fetch = stub
+        module.PRICES.cache_dir = tmp / f"prices_{mode}"
+        results = run_async(module, reqs) if mode == "async" else run_sync(module, reqs, args.sync_workers)
+        rows += summarize(mode, results)
+        fetches[mode] = {"plot_requests": sum(r[2] == "/plot" for r in reqs), "downloads": stub.calls}
+        if mode == "async":
+            fetches[mode]["coalesced"] = module.DOWNLOADS.stats["coalesced"]
+
+    print(f"{len(reqs)} requests over {args.duration}s ({args.rate:g}/s, {args.plot_fraction:.0%} /plot, "
+          f"download latency {args.download_latency}s)")
+    print(pd.DataFrame(rows).to_string(index=False))
+    for mode, f in fetches.items():
+        print(f"{mode}: " + ", ".join(f"{k}={v}" for k, v in f.items()))
+    if args.json:
+        Path(args.json).write_text(json.dumps({"results": rows, "downloads": fetches}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# benchmarks/bench_encoding.py
+"""
+Categorical encoding of A-code columns: dict map loop vs CodeTable.encode_frame.
+
+The map loop is what the credit-risk training script did before CodeTable:
+`df[col].map(m).astype("category")` for every column. Both produce categoricals
+with the readable labels; before timing they are checked to be identical.
+
+    python benchmarks/bench_encoding.py
+    python benchmarks/bench_encoding.py --rows 1000000 --repeat 7 --dtype object
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.encoding import CodeTable  # noqa: E402
+
+# same shape as the German credit data's code columns: 2 to 11 codes per column
+MAPS = {
+    "checking_status": {f"A1{i}": f"cs{i}" for i in range(1, 5)},
+    "credit_history": {f"A3{i}": f"ch{i}" for i in range(5)},
+    "purpose": {f"A4{i}": f"p{i}" for i in range(11)},
+    "savings_status": {f"A6{i}": f"s{i}" for i in range(1, 6)},
+    "housing": {f"A15{i}": f"h{i}" for i in range(1, 4)},
+    "telephone": {"A191": "none", "A192": "yes_registered"},
+}
+
+
+def synthetic_codes(rows: int, dtype: str = "str", unknown: float = 0.01, seed: int = 0) -> pd.DataFrame:
+    """Random A-codes per column, with a fraction of unknown codes and missing values."""
+    rng = np.random.default_rng(seed)
+    out = {}
+    for col, m in MAPS.items():
+        values = rng.choice(np.array(list(m) + ["A999"], dtype=object), size=rows,
+                            p=[(1 - unknown) / len(m)] * len(m) + [unknown])
+        values[rng.random(rows) < unknown] = None
+        out[col] = pd.Series(values, dtype=dtype)
+    return pd.DataFrame(out)
+
+
+def map_loop(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    for col, m in MAPS.items():
+        df[col] = df[col].map(m).astype(pd.CategoricalDtype(list(m.values())))
+    return df
+
+
+def _seconds(fn, df, repeat: int) -> list:
+    fn(df)
+    out = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(df)
+        out.append(time.perf_counter() - t0)
+    return out
+
+
+def run(rows: int, repeat: int, dtype: str) -> list:
+    df = synthetic_codes(rows, dtype)
+    table = CodeTable(MAPS)
+    pd.testing.assert_frame_equal(map_loop(df), table.encode_frame(df))
+    results = []
+    for name, fn in [("map_loop", map_loop), ("code_table", table.encode_frame)]:
+        t = _seconds(fn, df, repeat)
+        results.append({
+            "method": name,
+            "rows": rows,
+            "dtype": dtype,
+            "median_ms": round(statistics.median(t) * 1e3, 1),
+            "best_ms": round(min(t) * 1e3, 1),
+            "rows_per_s": round(rows * len(MAPS) / statistics.median(t)),
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--dtype", choices=["str", "object"], default="str",
+                        help="column dtype: pandas strings (what read_csv gives) or plain object")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = run(args.rows, args.repeat, args.dtype)
+    table = pd.DataFrame(results).set_index("method")
+    print(table.to_string())
+    speedup = table.loc["map_loop", "median_ms"] / table.loc["code_table", "median_ms"]
+    print(f"code_table: {speedup:.1f}x faster than the map loop")
+    if args.json:
+        Path(args.json).write_text(json.dumps({"results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# benchmarks/bench_import_time.py
+"""
+Import-time report for the src package and cold start of the predict-only service.
+
+Each target runs in a fresh interpreter under `python -X importtime`, so nothing
+is cached between measurements. For every target the report shows the wall time,
+the total import time, which heavy third-party packages got loaded, and the
+slowest imports by cumulative time (like `python -X importtime` piped through sort).
+
+The "predict" target is the scoring-only path of homework13/app_flask.py: import
+the app and answer one /predict request (artifacts are generated in a temp dir).
+
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --target src --target predict --top 25 --repeat 5
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY = ["yfinance", "matplotlib", "pandas", "sklearn", "scipy", "flask", "pyarrow", "orjson"]
+
+_PREDICT = """
+import sys
+sys.path.insert(0, {app_dir!r})
+import app_flask
+resp = app_flask.app.test_client().post("/predict", json={{"features": [0.1] * 7}})
+assert resp.status_code == 200, resp.get_data(as_text=True)
+"""
+
+TARGETS = {
+    "src": "import src",
+    "src.serving": "import src.serving",
+    "src.registry": "import src.registry",
+    "src.fast_scorer": "import src.fast_scorer",
+    "src.features": "import src.features",
+    "src.data": "import src.data",
+    "src.cache": "import src.cache",
+    "predict": _PREDICT.format(app_dir=str(ROOT / "homework" / "homework13")),
+}
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def run_importtime(code: str, env: dict) -> dict:
+    """Wall time, per-module (self_us, cumulative_us) and the loaded heavy packages for one fresh run."""
+    probe = code + "\nimport sys as _s; print(','.join(m for m in {heavy!r} if m in _s.modules))".format(heavy=HEAVY)
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", probe], cwd=ROOT, env=env,
+                          capture_output=True, text=True)
+    wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+    modules, top_level_us = {}, 0
+    for m in _LINE.finditer(proc.stderr):
+        self_us, cum_us, indent, name = int(m.group(1)), int(m.group(2)), len(m.group(3)), m.group(4)
+        modules[name] = (self_us, cum_us)
+        if indent == 1:  # outermost imports; their cumulative times add up to the total
+            top_level_us += cum_us
+    loaded = [m for m in proc.stdout.strip().splitlines()[-1].split(",") if m] if proc.stdout.strip() else []
+    return {"wall_s": wall, "import_s": top_level_us / 1e6, "modules": modules, "heavy_loaded": loaded}
+
+
+def report(name: str, code: str, env: dict, repeat: int, top: int) -> dict:
+    runs = [run_importtime(code, env) for _ in range(repeat)]
+    best = min(runs, key=lambda r: r["import_s"])
+    slowest = sorted(best["modules"].items(), key=lambda kv: -kv[1][1])[:top]
+    return {
+        "target": name,
+        "wall_ms": round(statistics.median(r["wall_s"] for r in runs) * 1e3, 1),
+        "import_ms": round(statistics.median(r["import_s"] for r in runs) * 1e3, 1),
+        "modules": len(best["modules"]),
+        "heavy_loaded": best["heavy_loaded"],
+        "slowest": [{"module": m, "self_ms": round(s / 1e3, 2), "cumulative_ms": round(c / 1e3, 2)}
+                    for m, (s, c) in slowest],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--target", action="append", choices=sorted(TARGETS),
+                        help="what to import (repeatable; default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per target (median reported)")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports listed per target")
+    parser.add_argument("--json", help="also write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench_import_"))
+    sys.path[:0] = [str(ROOT), str(Path(__file__).resolve().parent)]
+    from run_suite import _make_artifacts
+    _make_artifacts(tmp / "artifacts")
+    env = {**os.environ, "PYTHONPATH": str(ROOT), "ARTIFACT_DIR": str(tmp / "artifacts"),
+           "MODEL_POLL_SECONDS": "0", "FEATURE_STORE_DIR": str(tmp / "features"), "PYTHONDONTWRITEBYTECODE": "1"}
+
+    reports = []
+    for name in args.target or list(TARGETS):
+        r = report(name, TARGETS[name], env, args.repeat, args.top)
+        reports.append(r)
+        print(f"\n== {name}: wall {r['wall_ms']:.0f} ms, imports {r['import_ms']:.0f} ms, {r['modules']} modules, "
+              f"heavy: {', '.join(r['heavy_loaded']) or '-'}")
+        print(f"{'cumulative_ms':>14} {'self_ms':>9}  module")
+        for s in r["slowest"]:
+            print(f"{s['cumulative_ms']:>14.1f} {s['self_ms']:>9.1f}  {s['module']}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"python": sys.version.split()[0], "results": reports}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# benchmarks/bench_io_formats.py
+"""
+Parse time and file size of the pipeline's table formats.
+
+Compares the current text paths (CSV, JSON records, JSON lines) with Parquet and
+Arrow IPC for: a full read, a projected read (Date, Close, Volume) and a projected
+read of one month. Uses a synthetic OHLCV table unless --input is given.
+
+    python benchmarks/bench_io_formats.py --rows 1000000
+    python benchmarks/bench_io_formats.py --input processed/sample_data_cleaned.csv \
+        --date-col date --columns date,ticker,price
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.storage import read_table, write_table  # noqa: E402
+
+COLUMNS = ["Date", "Close", "Volume"]
+FORMATS = ["csv", "json", "jsonl", "parquet", "arrow"]
+
+
+def synthetic_ohlcv(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, rows)))
+    return pd.DataFrame({
+        "Date": pd.date_range("2000-01-01", periods=rows, freq="min"),
+        "Open": close * (1 + rng.normal(0, 0.0005, rows)),
+        "High": close * (1 + np.abs(rng.normal(0, 0.001, rows))),
+        "Low": close * (1 - np.abs(rng.normal(0, 0.001, rows))),
+        "Close": close,
+        "Volume": rng.integers(100, 1_000_000, rows).astype("float64"),
+    })
+
+
+def _best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def run(df: pd.DataFrame, repeat: int = 3, columns=COLUMNS, date_col: str = "Date") -> list:
+    df = df.copy()
+    df[date_col] = pd.to_datetime(df[date_col])
+    mid = df[date_col].sort_values().iloc[len(df) // 2]
+    start, end = mid, mid + pd.DateOffset(months=1)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in FORMATS:
+            path = Path(tmp) / f"prices.{fmt}"
+            t_write = _best_of(lambda: write_table(df, path), 1)
+            results.append({
+                "format": fmt,
+                "size_mb": round(path.stat().st_size / 2**20, 2),
+                "write_s": round(t_write, 4),
+                "read_all_s": round(_best_of(lambda: read_table(path), repeat), 4),
+                "read_cols_s": round(_best_of(lambda: read_table(path, columns=columns), repeat), 4),
+                "read_range_s": round(_best_of(lambda: read_table(path, columns=columns, start=start, end=end,
+                                                                  date_col=date_col), repeat), 4),
+            })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000, help="rows of synthetic data")
+    parser.add_argument("--input", help="benchmark an existing CSV/JSON/Parquet file instead")
+    parser.add_argument("--date-col", default="Date", help="date column used for the range read")
+    parser.add_argument("--columns", default=",".join(COLUMNS), help="comma-separated columns for projected reads")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    df = read_table(args.input) if args.input else synthetic_ohlcv(args.rows)
+    results = run(df, args.repeat, columns=args.columns.split(","), date_col=args.date_col)
+    print(f"{len(df):,} rows x {df.shape[1]} columns")
+    print(pd.DataFrame(results).to_string(index=False))
+    if args.json:
+        Path(args.json).write_text(json.dumps({"rows": len(df), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
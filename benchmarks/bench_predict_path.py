@@ -0,0 +1,119 @@
+# benchmarks/bench_predict_path.py
+"""
+Per-request latency of /predict scoring: sklearn path vs compiled fast path.
+
+Each timed request is the full handler body for one row: decode the JSON body,
+validate it with parse_rows, impute + score, encode the response. The sklearn
+path uses json + predict_rows; the fast path uses loads_json/dumps_json (orjson
+if installed) + the FastScorer from compile_scorer. Before timing, both paths
+are checked to return identical results on the same rows.
+
+    python benchmarks/bench_predict_path.py
+    python benchmarks/bench_predict_path.py --artifacts artifacts --requests 20000
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.fast_scorer import compile_scorer  # noqa: E402
+from src.io import load_artifacts  # noqa: E402
+from src.serving import dumps_json, loads_json, parse_rows, predict_rows  # noqa: E402
+
+
+def synthetic_models(n_features: int = 7, rows: int = 2000, seed: int = 0) -> dict:
+    """Imputer + fitted models like the ones the training notebooks export."""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.impute import SimpleImputer
+    from sklearn.linear_model import LogisticRegression
+
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, n_features))
+    X[rng.random(X.shape) < 0.05] = np.nan
+    y = (np.nan_to_num(X[:, 0]) + rng.normal(size=rows) > 0).astype(int)
+    imputer = SimpleImputer(strategy="median").fit(X)
+    Xi = imputer.transform(X)
+    return {
+        "logistic": (LogisticRegression(max_iter=1000).fit(Xi, y), imputer, {"threshold": 0.5}),
+        "random_forest": (RandomForestClassifier(n_estimators=100, random_state=seed).fit(Xi, y),
+                          imputer, {"threshold": 0.5}),
+    }
+
+
+def _latencies(handler, bodies) -> np.ndarray:
+    out = np.empty(len(bodies))
+    for i, body in enumerate(bodies):
+        t0 = time.perf_counter()
+        handler(body)
+        out[i] = time.perf_counter() - t0
+    return out
+
+
+def run(models: dict, n_requests: int, warmup: int = 200, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    results = []
+    for name, (model, imputer, meta) in models.items():
+        scorer = compile_scorer(model, imputer, meta)
+        if scorer is None:
+            print(f"{name}: not supported by the fast path, skipped")
+            continue
+        n_features = len(imputer.statistics_)
+        rows = rng.normal(size=(n_requests + warmup, n_features)).round(6)
+        bodies = [json.dumps({"features": r.tolist()}).encode() for r in rows]
+
+        def sklearn_path(body):
+            X = parse_rows(json.loads(body)["features"], n_features)
+            return json.dumps(predict_rows(model, imputer, meta, X)[0]).encode()
+
+        def fast_path(body):
+            X = parse_rows(loads_json(body)["features"], n_features)
+            return dumps_json(scorer(X)[0])
+
+        same = all(json.loads(sklearn_path(b)) == json.loads(fast_path(b)) for b in bodies[:500])
+        if not same:
+            raise AssertionError(f"{name}: fast path results differ from sklearn")
+        for path, handler in [("sklearn", sklearn_path), ("fast", fast_path)]:
+            _latencies(handler, bodies[:warmup])
+            lat = _latencies(handler, bodies[warmup:]) * 1e6
+            results.append({
+                "model": name,
+                "path": path,
+                "requests": n_requests,
+                "p50_us": round(float(np.percentile(lat, 50)), 1),
+                "p99_us": round(float(np.percentile(lat, 99)), 1),
+                "mean_us": round(float(lat.mean()), 1),
+            })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--artifacts", help="benchmark a saved artifact directory instead of synthetic models")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.artifacts:
+        model, imputer, _, meta = load_artifacts(args.artifacts)
+        models = {Path(args.artifacts).name: (model, imputer, meta)}
+    else:
+        models = synthetic_models()
+    results = run(models, args.requests)
+    table = pd.DataFrame(results)
+    print(table.to_string(index=False))
+    for name, grp in table.groupby("model", sort=False):
+        p = grp.set_index("path")
+        if {"sklearn", "fast"} <= set(p.index):
+            print(f"{name}: p50 {p.loc['sklearn', 'p50_us'] / p.loc['fast', 'p50_us']:.1f}x, "
+                  f"p99 {p.loc['sklearn', 'p99_us'] / p.loc['fast', 'p99_us']:.1f}x faster")
+    if args.json:
+        Path(args.json).write_text(json.dumps({"results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# benchmarks/bench_prefork.py
+"""
+/predict throughput and memory of homework13/serve.py for different worker counts.
+
+For each --workers value the launcher is started on a free port with freshly
+generated artifacts (a 100-tree random forest), and once its --ready-file
+appears, --clients load-generating processes send single-row /predict requests
+in a closed loop for --duration seconds. The report shows requests per second,
+p50/p99 latency, and per-worker memory from /proc/<pid>/smaps_rollup (Linux):
+RSS, PSS and how much of each worker is still shared with its siblings.
+
+    python benchmarks/bench_prefork.py --workers 1 --workers 2 --workers 4
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+SERVE = ROOT / "homework" / "homework13" / "serve.py"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _client(port: int, duration: float, threads: int, out) -> None:
+    import threading
+
+    body = json.dumps({"features": [0.1] * 7}).encode()
+    url = f"http://127.0.0.1:{port}/predict"
+    latencies, errors, lock = [], [0], threading.Lock()
+    end = time.perf_counter() + duration
+
+    def loop():
+        mine, failed = [], 0
+        while time.perf_counter() < end:
+            t0 = time.perf_counter()
+            try:
+                req = urllib.request.Request(url, body, {"Content-Type": "application/json"})
+                with urllib.request.urlopen(req, timeout=30) as resp:
+                    resp.read()
+                mine.append(time.perf_counter() - t0)
+            except Exception:
+                failed += 1
+        with lock:
+            latencies.extend(mine)
+            errors[0] += failed
+
+    ts = [threading.Thread(target=loop) for _ in range(threads)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    out.put((latencies, errors[0]))
+
+
+def _memory(pid: int) -> dict:
+    fields = {}
+    try:
+        for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+            key, value = line.split(":")
+            fields[key] = int(value.split()[0]) / 1024
+    except OSError:
+        return {}
+    shared = fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)
+    return {"rss_mb": fields.get("Rss", 0), "pss_mb": fields.get("Pss", 0), "shared_mb": shared}
+
+
+def run(workers: int, args, tmp: Path) -> dict:
+    port, ready = _free_port(), tmp / f"ready-{workers}"
+    env = {**os.environ, "ARTIFACT_DIR": str(tmp / "artifacts"), "MODEL_POLL_SECONDS": "0",
+           "FEATURE_STORE_DIR": str(tmp / "features"), "METRICS_SAMPLE_RATE": "0"}
+    proc = subprocess.Popen([sys.executable, str(SERVE), "--port", str(port), "--workers", str(workers),
+                             "--threads", str(args.threads), "--ready-file", str(ready)],
+                            cwd=SERVE.parent, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 120
+        while not ready.exists():
+            if proc.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"serve.py with {workers} workers did not become ready")
+            time.sleep(0.1)
+
+        out = mp.Queue()
+        clients = [mp.Process(target=_client, args=(port, args.duration, args.client_threads, out))
+                   for _ in range(args.clients)]
+        for c in clients:
+            c.start()
+        results = [out.get() for _ in clients]
+        for c in clients:
+            c.join()
+
+        pids = subprocess.run(["pgrep", "-P", str(proc.pid)], capture_output=True, text=True).stdout.split()
+        mem = [m for m in (_memory(int(p)) for p in pids) if m]
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=60)
+
+    ms = np.concatenate([np.asarray(lat) for lat, _ in results]) * 1e3
+    return {
+        "workers": workers,
+        "requests": len(ms),
+        "errors": sum(e for _, e in results),
+        "req_per_s": round(len(ms) / args.duration, 1),
+        "p50_ms": round(float(np.percentile(ms, 50)), 2) if len(ms) else None,
+        "p99_ms": round(float(np.percentile(ms, 99)), 2) if len(ms) else None,
+        "worker_rss_mb": round(float(np.mean([m["rss_mb"] for m in mem])), 1) if mem else None,
+        "worker_pss_mb": round(float(np.mean([m["pss_mb"] for m in mem])), 1) if mem else None,
+        "worker_shared_mb": round(float(np.mean([m["shared_mb"] for m in mem])), 1) if mem else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, action="append", help="worker counts to try (repeatable)")
+    parser.add_argument("--threads", type=int, default=4, help="threads per worker")
+    parser.add_argument("--clients", type=int, default=2, help="load-generating processes")
+    parser.add_argument("--client-threads", type=int, default=8, help="concurrent requests per client process")
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    sys.path[:0] = [str(ROOT), str(Path(__file__).resolve().parent)]
+    from run_suite import _make_artifacts
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench_prefork_"))
+    _make_artifacts(tmp / "artifacts")
+    counts = args.workers or sorted({1, 2, os.cpu_count() or 1})
+    rows = [run(w, args, tmp) for w in counts]
+    print(f"{os.cpu_count()} CPUs, {args.clients} client processes x {args.client_threads} threads, "
+          f"{args.threads} threads per worker")
+    print(pd.DataFrame(rows).to_string(index=False))
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+# benchmarks/run_suite.py
+"""
+Regression benchmarks for the feature, cleaning, I/O and serving hot paths.
+
+Every case runs offline on synthetic OHLCV data: yfinance is replaced by a stub
+module before anything from src/ is imported, so /plot and download_data never
+touch the network. For each case the suite records the median and best wall
+time over --repeat runs (after one warm-up), the peak traced allocation of one
+extra run under tracemalloc, and throughput (rows, requests or loads per second).
+
+    python benchmarks/run_suite.py                            # quick preset, compare with baseline
+    python benchmarks/run_suite.py --preset full              # 1k..10M rows, 1..5k tickers
+    python benchmarks/run_suite.py --only features --repeat 5
+    python benchmarks/run_suite.py --save-baseline            # store this run as the new baseline
+
+Results go to --out as JSON. When --baseline exists, each case is compared with
+the stored result of the same name; a case whose median time (or peak memory)
+grew by more than --threshold is reported as a regression and the exit code is 1.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+PRESETS = {
+    "quick": {"rows": [1_000, 100_000], "tickers": [1, 100], "clean_rows": [100_000],
+              "task_rows": [100_000], "requests": 200},
+    "full": {"rows": [1_000, 100_000, 1_000_000, 10_000_000], "tickers": [1, 100, 1_000, 5_000],
+             "clean_rows": [100_000, 1_000_000, 10_000_000], "task_rows": [100_000, 1_000_000],
+             "requests": 1_000},
+}
+DAYS_PER_TICKER = 500
+
+
+# ---- synthetic data ------------------------------------------------------
+
+def synthetic_ohlcv(rows: int, tickers: int = 1, seed: int = 0, freq: str = "D") -> pd.DataFrame:
+    """
+    Long-format OHLCV frame: `tickers` random-walk series of rows // tickers bars each.
+
+    A single ticker gets no Ticker column, matching what download_data returns.
+    """
+    rng = np.random.default_rng(seed)
+    per = max(1, rows // tickers)
+    n = per * tickers
+    steps = rng.normal(0, 0.01, n).reshape(tickers, per)
+    start = rng.uniform(20, 500, (tickers, 1))
+    close = (start * np.exp(np.cumsum(steps, axis=1))).reshape(-1)
+    spread = np.abs(rng.normal(0, 0.005, n))
+    df = pd.DataFrame({
+        "Date": np.tile(pd.date_range("1990-01-01", periods=per, freq=freq).to_numpy(), tickers),
+        "Open": close * (1 + rng.normal(0, 0.002, n)),
+        "High": close * (1 + spread),
+        "Low": close * (1 - spread),
+        "Close": close,
+        "Volume": rng.integers(1_000, 10_000_000, n).astype("float64"),
+    })
+    if tickers > 1:
+        df.insert(0, "Ticker", pd.Categorical(np.repeat([f"T{i:05d}" for i in range(tickers)], per)))
+    return df
+
+
+def with_missing(df: pd.DataFrame, fraction: float = 0.05, seed: int = 0) -> pd.DataFrame:
+    """Copy of df with `fraction` of the numeric cells set to NaN (one column mostly missing)."""
+    rng = np.random.default_rng(seed)
+    df = df.copy()
+    for col in ["Open", "High", "Low", "Close", "Volume"]:
+        df.loc[rng.random(len(df)) < fraction, col] = np.nan
+    df["Sparse"] = np.where(rng.random(len(df)) < 0.3, df["Close"], np.nan)
+    return df
+
+
+class _StubYFinance(types.ModuleType):
+    """Offline stand-in for the yfinance module: download() returns deterministic daily bars."""
+
+    def __init__(self):
+        super().__init__("yfinance")
+        self.calls = 0
+
+    def download(self, tickers, start=None, end=None, auto_adjust=True, progress=False, **kwargs):
+        self.calls += 1
+        dates = pd.bdate_range(start or "2000-01-01", end or pd.Timestamp.today(), inclusive="left", name="Date")
+        df = synthetic_ohlcv(len(dates), seed=zlib.crc32(str(tickers).encode())).drop(columns="Date")
+        return df.set_index(dates[:len(df)])
+
+
+def install_yfinance_stub() -> _StubYFinance:
+    stub = _StubYFinance()
+    sys.modules["yfinance"] = stub
+    return stub
+
+
+# ---- cases ---------------------------------------------------------------
+
+class Case:
+    """
+    One benchmark: setup() builds the inputs (untimed), run(state) is the timed call.
+
+    Args:
+        name (str): Unique name, including the parameters (the baseline key).
+        setup: Callable returning the state passed to run.
+        run: Callable(state) doing the measured work.
+        items (int): Units processed per run, for throughput.
+        unit (str): What an item is ("rows", "requests", "loads").
+    """
+
+    def __init__(self, name, setup, run, items, unit="rows"):
+        self.name, self.setup, self.run, self.items, self.unit = name, setup, run, items, unit
+
+
+def feature_cases(preset: dict) -> list:
+    from src.features import build_features, build_features_panel
+
+    cases = []
+    for rows in preset["rows"]:
+        cases.append(Case(f"features.build_features[rows={rows}]",
+                          lambda rows=rows: synthetic_ohlcv(rows), build_features, rows))
+    for tickers in preset["tickers"]:
+        rows = tickers * DAYS_PER_TICKER
+        cases.append(Case(f"features.build_features_panel[tickers={tickers}]",
+                          lambda rows=rows, tickers=tickers: _with_ticker(synthetic_ohlcv(rows, tickers)),
+                          build_features_panel, rows))
+    return cases
+
+
+def _with_ticker(df: pd.DataFrame) -> pd.DataFrame:
+    if "Ticker" not in df.columns:
+        df.insert(0, "Ticker", "T00000")
+    return df
+
+
+def cleaning_cases(preset: dict) -> list:
+    from src.cleaning import CleaningPipeline, drop_missing, fill_missing_median, normalize_data
+
+    cols = ["Open", "High", "Low", "Close", "Volume", "Sparse"]
+
+    def functions(df):
+        out = drop_missing(df.copy(), 0.5)
+        out = fill_missing_median(out, [c for c in cols if c in out.columns])
+        return normalize_data(out, [c for c in cols if c in out.columns])
+
+    def pipeline(df):
+        return CleaningPipeline().drop_missing(0.5).fill_missing_median(cols).normalize(cols).fit_transform(df, copy=True)
+
+    cases = []
+    for rows in preset["clean_rows"]:
+        setup = lambda rows=rows: with_missing(synthetic_ohlcv(rows))
+        cases.append(Case(f"cleaning.functions[rows={rows}]", setup, functions, rows))
+        cases.append(Case(f"cleaning.CleaningPipeline[rows={rows}]", setup, pipeline, rows))
+    return cases
+
+
+def _make_artifacts(path: Path, n_features: int = 7, n_estimators: int = 100, seed: int = 0) -> None:
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.impute import SimpleImputer
+    from sklearn.preprocessing import StandardScaler
+    from src.io import save_artifacts
+
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(5_000, n_features))
+    y = (X[:, 0] + rng.normal(size=len(X)) > 0).astype(int)
+    imputer = SimpleImputer(strategy="median").fit(X)
+    model = RandomForestClassifier(n_estimators=n_estimators, random_state=seed).fit(imputer.transform(X), y)
+    save_artifacts(path, model, imputer, StandardScaler().fit(X), {"threshold": 0.5})
+
+
+def io_cases(preset: dict, tmp: Path) -> list:
+    from src.io import load_artifacts
+
+    art = tmp / "artifacts"
+
+    def setup():
+        if not (art / "meta.json").exists():
+            _make_artifacts(art)
+        return art
+
+    return [
+        Case("io.load_artifacts[mmap=none]", setup, lambda p: load_artifacts(p), 1, "loads"),
+        Case("io.load_artifacts[mmap=r]", setup, lambda p: load_artifacts(p, mmap_mode="r"), 1, "loads"),
+    ]
+
+
+def task_cases(preset: dict, tmp: Path) -> list:
+    sys.path.insert(0, str(ROOT / "homework" / "homework15"))
+    from app_task import my_task
+    from src.storage import write_table
+
+    cases = []
+    for rows in preset["task_rows"]:
+        for fmt in ("json", "parquet"):
+            src_path, out_path = tmp / f"task_{rows}.{fmt}", tmp / f"task_{rows}_clean.{fmt}"
+
+            def setup(rows=rows, src_path=src_path, fmt=fmt):
+                if not src_path.exists():
+                    df = synthetic_ohlcv(rows, freq="min")[["Date", "Close", "Volume"]]
+                    # a few duplicate timestamps and gaps, like a raw dump
+                    df = pd.concat([df, df.sample(frac=0.01, random_state=0)], ignore_index=True)
+                    df.loc[df.sample(frac=0.01, random_state=1).index, "Close"] = np.nan
+                    write_table(df, src_path, fmt=fmt)
+                return src_path
+
+            cases.append(Case(f"app_task.my_task[fmt={fmt},rows={rows}]", setup,
+                              lambda p, out_path=out_path: my_task(str(p), str(out_path)), rows))
+    return cases
+
+
+def serving_cases(preset: dict, tmp: Path) -> list:
+    os.environ.update({"ARTIFACT_DIR": str(tmp / "artifacts"), "MODEL_POLL_SECONDS": "0",
+                       "FEATURE_STORE_DIR": str(tmp / "features")})
+    if not (tmp / "artifacts" / "meta.json").exists():
+        _make_artifacts(tmp / "artifacts")
+    sys.path.insert(0, str(ROOT / "homework" / "homework13"))
+    import app_flask
+    from src.cache import ResponseCache
+
+    app_flask.PRICES.cache_dir = tmp / "prices"
+    client = app_flask.app.test_client()
+    n = preset["requests"]
+    rng = np.random.default_rng(0)
+    rows = rng.normal(size=(n, 7)).round(4).tolist()
+    batch = rng.normal(size=(1_000, 7)).round(4).tolist()
+
+    def predict(_):
+        for row in rows:
+            resp = client.post("/predict", json={"features": row})
+            assert resp.status_code == 200, resp.get_data(as_text=True)
+
+    def predict_batch(_):
+        resp = client.post("/predict/batch", json={"features": batch})
+        assert resp.status_code == 200, resp.get_data(as_text=True)
+
+    def plot(_):
+        # prices come from the (warm) price cache; a fresh response cache makes every chart a re-render
+        for i in range(max(1, n // 20)):
+            app_flask.PLOTS = ResponseCache()
+            resp = client.get(f"/plot?ticker=T{i % 5}&start=2020-01-01&end=2024-01-01")
+            assert resp.status_code == 200, resp.get_data(as_text=True)
+
+    return [
+        Case(f"flask./predict[requests={n}]", lambda: None, predict, n, "requests"),
+        Case("flask./predict/batch[rows=1000]", lambda: None, predict_batch, 1_000),
+        Case(f"flask./plot[requests={max(1, n // 20)}]", lambda: None, plot, max(1, n // 20), "requests"),
+    ]
+
+
+# ---- measuring -----------------------------------------------------------
+
+def measure(case: Case, repeat: int) -> dict:
+    state = case.setup()
+    case.run(state)  # warm-up: imports, caches, first-call allocations
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        case.run(state)
+        times.append(time.perf_counter() - t0)
+    # a separate run, since tracing every allocation slows the timed ones down
+    tracemalloc.start()
+    try:
+        case.run(state)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    median = statistics.median(times)
+    return {
+        "name": case.name,
+        "items": case.items,
+        "unit": case.unit,
+        "repeat": repeat,
+        "seconds_median": round(median, 6),
+        "seconds_min": round(min(times), 6),
+        "peak_mb": round(peak / 2**20, 3),
+        "throughput": round(case.items / median, 1) if median > 0 else None,
+    }
+
+
+def compare(results: list, baseline: dict, threshold: float, min_seconds: float = 1e-3, min_mb: float = 1.0) -> list:
+    """
+    Per-case change against the baseline run.
+
+    A case regresses when its median time grows by more than `threshold` (relative)
+    and by more than `min_seconds`, or its peak memory grows by more than `threshold`
+    and by more than `min_mb`.
+    Cases missing from either side are skipped.
+    """
+    base = {r["name"]: r for r in baseline.get("results", [])}
+    rows = []
+    for r in results:
+        b = base.get(r["name"])
+        if b is None:
+            continue
+        time_ratio = r["seconds_median"] / b["seconds_median"] if b["seconds_median"] else float("inf")
+        mem_ratio = r["peak_mb"] / b["peak_mb"] if b["peak_mb"] else 1.0
+        slower = time_ratio > 1 + threshold and r["seconds_median"] - b["seconds_median"] > min_seconds
+        bigger = mem_ratio > 1 + threshold and r["peak_mb"] - b["peak_mb"] > min_mb
+        rows.append({
+            "name": r["name"],
+            "baseline_s": b["seconds_median"], "current_s": r["seconds_median"], "time_ratio": round(time_ratio, 3),
+            "baseline_mb": b["peak_mb"], "current_mb": r["peak_mb"], "mem_ratio": round(mem_ratio, 3),
+            "regression": bool(slower or bigger),
+        })
+    return rows
+
+
+def environment() -> dict:
+    import sklearn
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+    }
+
+
+GROUPS = ["features", "cleaning", "io", "app_task", "flask"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument("--only", action="append", default=[],
+                        help="run cases matching this glob or group name (repeatable), e.g. 'features' or '*panel*'")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", type=Path, default=RESULTS_DIR / "latest.json")
+    parser.add_argument("--baseline", type=Path, default=RESULTS_DIR / "baseline.json")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative growth of median time / peak memory before a case counts as a regression")
+    parser.add_argument("--save-baseline", action="store_true", help="also write this run to --baseline")
+    args = parser.parse_args(argv)
+
+    stub = install_yfinance_stub()
+    sys.path.insert(0, str(ROOT))
+    preset = PRESETS[args.preset]
+    selected = lambda name: not args.only or any(
+        name.split(".")[0] == pat or fnmatch.fnmatch(name, pat) for pat in args.only)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench_suite_") as tmp:
+        tmp = Path(tmp)
+        builders = {
+            "features": lambda: feature_cases(preset),
+            "cleaning": lambda: cleaning_cases(preset),
+            "io": lambda: io_cases(preset, tmp),
+            "app_task": lambda: task_cases(preset, tmp),
+            "flask": lambda: serving_cases(preset, tmp),
+        }
+        for group in GROUPS:
+            # a group name selects that group; any other pattern is matched against every case name
+            if args.only and not any(pat == group or pat not in GROUPS for pat in args.only):
+                continue
+            for case in builders[group]():
+                if not selected(case.name):
+                    continue
+                r = measure(case, args.repeat)
+                results.append(r)
+                print(f"{r['name']:<48} {r['seconds_median'] * 1e3:>10.2f} ms  {r['peak_mb']:>9.1f} MB  "
+                      f"{r['throughput'] or 0:>14,.0f} {r['unit']}/s", flush=True)
+
+    report = {"preset": args.preset, "environment": environment(), "yfinance_stub_calls": stub.calls,
+              "results": results}
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(report, indent=2))
+    print(f"\nSaved {len(results)} results → {args.out}")
+
+    status = 0
+    if args.baseline.exists() and args.baseline.resolve() != args.out.resolve():
+        rows = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        if rows:
+            print(f"\nAgainst {args.baseline} (threshold +{args.threshold:.0%}):")
+            print(pd.DataFrame(rows).to_string(index=False))
+            regressions = [r["name"] for r in rows if r["regression"]]
+            if regressions:
+                print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+                status = 1
+    elif not args.save_baseline:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"Saved baseline → {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
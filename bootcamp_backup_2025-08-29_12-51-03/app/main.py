@@ -1,31 +1,149 @@
+import importlib.util
+import sys
+from pathlib import Path
+
 from flask import Flask, request, jsonify, send_file
-import os, io, json
+import os, io, json, threading, warnings
 import joblib
 import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 import matplotlib.pyplot as plt
-from pathlib import Path
+
+
+def _course_module(name):
+    """
+    <course repo>/src/<name>.py, loaded by file path as `_course_src_<name>`.
+
+    The course repo's shared src/ package sits two levels above this file. It is not
+    put on sys.path: as `src` it would shadow this project's own src/ package.
+    """
+    path = Path(__file__).resolve().parents[2] / "src" / f"{name}.py"
+    if not path.exists():
+        raise ImportError(f"Could not find the course repo's {path}.")
+    spec = importlib.util.spec_from_file_location(f"_course_src_{name}", path)
+    module = sys.modules[spec.name] = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# shared helpers from the course repo: latency metrics and the categorical code table
+_metrics, _encoding = _course_module("metrics"), _course_module("encoding")
+Metrics, stage = _metrics.Metrics, _metrics.stage
+CodeTable, RowEncoder = _encoding.CodeTable, _encoding.RowEncoder
 
 load_dotenv()
 
 BASE_DIR = Path(__file__).resolve().parent  # repo root
 MODEL_PATH = Path(os.getenv("MODEL_PATH", BASE_DIR / "project" / "model" / "model.joblib"))
 FEATURES_PATH = Path(os.getenv("FEATURES_PATH", BASE_DIR / "project" / "model" / "feature_names.json"))
+CODE_TABLE_PATH = Path(os.getenv("CODE_TABLE_PATH", BASE_DIR / "project" / "model" / "code_table.json"))
 DATA_PATH = Path(os.getenv("DATA_PATH", BASE_DIR / "project" / "data" / "raw" / "german.data-numeric"))
 
 app = Flask(__name__)
+# request/stage latency histograms at /metrics (METRICS_SAMPLE_RATE, METRICS_PROFILE_REQUESTS)
+metrics = Metrics.from_env().init_app(app)
+
+# /predict hands the model plain ndarray rows in feature_names order, while it was fitted on a
+# DataFrame, so sklearn warns about missing feature names on every call. The filter is installed
+# once here: catch_warnings() per request swaps the process-wide filter list and races between threads.
+warnings.filterwarnings("ignore", message="X does not have valid feature names", category=UserWarning)
 
 model = None
 feature_names = None
+row_encoder = None
 
 def load_model():
-    global model, feature_names
+    global model, feature_names, row_encoder
     model = joblib.load(MODEL_PATH) if MODEL_PATH.exists() else None
     feature_names = json.loads(FEATURES_PATH.read_text()) if FEATURES_PATH.exists() else None
+    code_table = CodeTable.load(CODE_TABLE_PATH) if CODE_TABLE_PATH.exists() else None
+    row_encoder = RowEncoder(feature_names, code_table) if feature_names is not None else None
 
 load_model()
 
+GERMAN_COLUMNS = [
+    "checking_status", "duration_months", "credit_history", "purpose", "credit_amount",
+    "savings_status", "employment_since", "installment_rate_pct", "personal_status_sex", "other_debtors",
+    "residence_since", "property_magnitude", "age_years", "other_installment_plans", "housing",
+    "number_credits", "job", "people_liable", "telephone", "foreign_worker",
+    "existing_credit", "dependents", "own_telephone", "foreign_worker_flag", "target"
+]
+MAX_BINS = 1000
+
+class HistogramIndex:
+    """
+    The /plot dataset parsed once into typed NumPy columns, with sorted copies per column.
+
+    A histogram for any bin count is then a binary search of the bin edges in the
+    sorted values (O(bins log n)) and is cached per (column, bins). Every lookup
+    checks the file's mtime, and a changed file is re-parsed and the cache dropped.
+    A reload swaps in new column/cache objects rather than clearing the old ones, so
+    a histogram computed from the previous parse only lands in that parse's caches.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._mtime = None
+        self._columns = []   # one array per column, in file order
+        self._sorted = {}    # column position -> sorted finite values
+        self._hist = {}      # (column position, bins) -> (counts, edges)
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        mtime = self.path.stat().st_mtime_ns
+        if mtime == self._mtime:
+            return
+        with self._lock:
+            if mtime == self._mtime:
+                return
+            # pandas maps sep=r"\s+" to the C parser's whitespace mode (no python engine needed)
+            df = pd.read_csv(self.path, sep=r"\s+", header=None)
+            self._columns = [df[c].to_numpy() for c in df.columns]
+            self._sorted, self._hist = {}, {}
+            self._mtime = mtime
+
+    def _snapshot(self):
+        """(columns, sorted, hist) from one parse of the file, read together under the lock."""
+        self._ensure_loaded()
+        with self._lock:
+            return self._columns, self._sorted, self._hist
+
+    def column_names(self):
+        """Labels from the saved feature_names (+ target), the known 25-column layout, or positions."""
+        return self._names(len(self._snapshot()[0]))
+
+    @staticmethod
+    def _names(n):
+        if feature_names and n == len(feature_names) + 1:
+            return feature_names + ["target"]
+        if n == len(GERMAN_COLUMNS):
+            return GERMAN_COLUMNS
+        return [str(i) for i in range(n)]
+
+    def histogram(self, col, bins):
+        """(counts, edges) with the same bins and counts as np.histogram(values, bins)."""
+        columns, sorted_, hist = self._snapshot()
+        i = self._names(len(columns)).index(col)
+        key = (i, bins)
+        cached = hist.get(key)
+        if cached is not None:
+            return cached
+        values = sorted_.get(i)
+        if values is None:
+            values = columns[i].astype(float)
+            values = sorted_[i] = np.sort(values[np.isfinite(values)])
+        edges = np.histogram_bin_edges(values[[0, -1]] if len(values) else values, bins=bins)
+        # bins are [a, b) except the last, which also includes its right edge
+        inner = np.searchsorted(values, edges[1:-1], side="left")
+        counts = np.diff(np.concatenate(([0], inner, [len(values)])))
+        hist[key] = (counts, edges)
+        return counts, edges
+
+DATA_INDEX = HistogramIndex(DATA_PATH)
+if DATA_PATH.exists():
+    DATA_INDEX.column_names()  # parse at startup rather than on the first /plot
+
 @app.get("/health")
 def health():
     return {
@@ -34,36 +152,31 @@ def health():
         "features_loaded": feature_names is not None
     }
 
-def _df_from_payload(payload, feature_names):
-    if payload is None:
-        raise ValueError("Missing 'features' in JSON body.")
-    if isinstance(payload, dict):
-        row = {col: payload.get(col, 0) for col in feature_names}
-        return pd.DataFrame([row], columns=feature_names)
-    elif isinstance(payload, list):
-        if len(payload) != len(feature_names):
-            raise ValueError(f"Expected {len(feature_names)} values, got {len(payload)}.")
-        return pd.DataFrame([payload], columns=feature_names)
-    else:
-        raise ValueError("Invalid 'features' type; must be object or array.")
-
 @app.post("/predict")
 def predict():
     if model is None or feature_names is None:
         return jsonify({"error": "Model or feature names not loaded. Train & save first."}), 500
     try:
-        data = request.get_json(force=True)
-        X1 = _df_from_payload(data.get("features"), feature_names)
+        with stage("parse"):
+            data = request.get_json(force=True)
+            # filled in place in a per-thread (1, n_features) buffer, no DataFrame per request
+            X1 = row_encoder.encode(data.get("features"))
     except Exception as e:
         return jsonify({"error": str(e)}), 400
-    proba1 = float(model.predict_proba(X1)[0, 1])
+    with stage("predict"):
+        proba1 = float(model.predict_proba(X1)[0, 1])
     pred = int(proba1 >= 0.5)
     return jsonify({"prediction": pred, "prob_default": round(proba1, 6)})
 
 @app.get("/plot")
 def plot():
     col = request.args.get("col", "credit_amount")
-    bins = int(request.args.get("bins", 30))
+    try:
+        bins = int(request.args.get("bins", 30))
+        if not 1 <= bins <= MAX_BINS:
+            raise ValueError
+    except ValueError:
+        return jsonify({"error": f"bins must be an integer between 1 and {MAX_BINS}."}), 400
     if not DATA_PATH.exists():
         # Demo plot — guarantees non-empty PNG even if dataset missing
         x = np.linspace(0, 2*np.pi, 200)
@@ -72,28 +185,21 @@ def plot():
         plt.plot(x, y)
         plt.title("Demo sine wave (DATA_PATH not found)")
     else:
-        df = pd.read_csv(DATA_PATH, sep=r"\s+", header=None, engine="python")
-        # Try to label columns using saved feature_names (+ target as last)
-        if feature_names and df.shape[1] == len(feature_names) + 1:
-            df.columns = feature_names + ["target"]
-        elif df.shape[1] == 25:
-            df.columns = [
-                "checking_status", "duration_months", "credit_history", "purpose", "credit_amount",
-                "savings_status", "employment_since", "installment_rate_pct", "personal_status_sex", "other_debtors",
-                "residence_since", "property_magnitude", "age_years", "other_installment_plans", "housing",
-                "number_credits", "job", "people_liable", "telephone", "foreign_worker",
-                "existing_credit", "dependents", "own_telephone", "foreign_worker_flag", "target"
-            ]
-        # else: leave numeric indexing
-        if col not in df.columns:
-            return jsonify({"error": f"Column '{col}' not found. Choose from: {', '.join(map(str, df.columns))}"}), 400
-        fig = plt.figure()
-        plt.hist(df[col].values, bins=bins)
-        plt.title(f"Histogram of {col}")
-        plt.xlabel(col); plt.ylabel("Count")
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", bbox_inches="tight")
-    plt.close(fig)
+        with stage("load"):
+            columns = DATA_INDEX.column_names()
+        if col not in columns:
+            return jsonify({"error": f"Column '{col}' not found. Choose from: {', '.join(columns)}"}), 400
+        with stage("render"):
+            counts, edges = DATA_INDEX.histogram(col, bins)
+            fig = plt.figure()
+            # precomputed counts drawn as weights on the bin left edges: same bars as plt.hist(values)
+            plt.hist(edges[:-1], bins=edges, weights=counts)
+            plt.title(f"Histogram of {col}")
+            plt.xlabel(col); plt.ylabel("Count")
+    with stage("encode"):
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", bbox_inches="tight")
+        plt.close(fig)
     buf.seek(0)
     return send_file(buf, mimetype="image/png", download_name="plot.png")
 
@@ -1,5 +1,44 @@
+import importlib.util
+import sys
+from pathlib import Path
+import os, json
+import pandas as pd
+import numpy as np
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+from sklearn.pipeline import Pipeline
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+import joblib
+from dotenv import load_dotenv
+
+
+def _course_module(name):
+    """
+    <course repo>/src/<name>.py, loaded by file path as `_course_src_<name>`.
+
+    The course repo's shared src/ package sits two levels above this file. It is not
+    put on sys.path: as `src` it would shadow this project's own src/ package.
+    """
+    path = Path(__file__).resolve().parents[2] / "src" / f"{name}.py"
+    if not path.exists():
+        raise ImportError(f"Could not find the course repo's {path}.")
+    spec = importlib.util.spec_from_file_location(f"_course_src_{name}", path)
+    module = sys.modules[spec.name] = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# CodeTable lives in the top-level src/ package of the course repo
+CodeTable = _course_module("encoding").CodeTable
+
+# Load env vars
+load_dotenv()
+BASE_DIR = Path(__file__).resolve().parent.parent  # go up from model/ to project root
+RAW_DATA_PATH = Path(os.getenv("RAW_DATA_PATH", BASE_DIR / "data" / "german.data"))
+
 # 1) Load raw categorical dataset
-df_raw = pd.read_csv("data/german.data", sep=r"\s+", header=None, engine="python")
+df_raw = pd.read_csv(RAW_DATA_PATH, sep=r"\s+", header=None)
 
 # 2) Official column names (20 features + target)
 cols = [
@@ -36,9 +75,10 @@ map_dicts = {
     "foreign_worker": {"A201":"yes","A202":"no"},
 }
 
-for c, m in map_dicts.items():
-    if c in df_raw.columns:
-        df_raw[c] = df_raw[c].map(m).astype("category")
+# compiled once into an index of codes per column; each column is encoded by looking up its distinct values
+CODE_TABLE = CodeTable(map_dicts)
+raw_codes = df_raw[list(map_dicts)].copy()  # kept for the serving code table below
+df_raw = CODE_TABLE.encode_frame(df_raw)
 
 # 5) Ensure 'age' is numeric years
 df_raw["age"] = pd.to_numeric(df_raw["age"], errors="coerce")
@@ -50,25 +90,11 @@ print("\nCategorical example values:")
 print(df_raw[["checking_status","purpose","savings_status"]].head())
 
 # project/src/train_model.py
-from pathlib import Path
-import os, json
-import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-from sklearn.pipeline import Pipeline
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import roc_auc_score
-import joblib
-from dotenv import load_dotenv
-
-# Load env vars
-load_dotenv()
-BASE_DIR = Path(__file__).resolve().parent.parent  # go up from src/ to project root
-DATA_PATH = Path(os.getenv("DATA_PATH", BASE_DIR / "data" / "raw" / "german.data-numeric"))
+DATA_PATH = Path(os.getenv("DATA_PATH", BASE_DIR / "data" / "german.data-numeric"))
 MODEL_DIR = Path(os.getenv("MODEL_DIR", BASE_DIR / "model"))
 MODEL_PATH = Path(os.getenv("MODEL_PATH", MODEL_DIR / "model.joblib"))
 FEATURES_PATH = Path(os.getenv("FEATURES_PATH", MODEL_DIR / "feature_names.json"))
+CODE_TABLE_PATH = Path(os.getenv("CODE_TABLE_PATH", MODEL_DIR / "code_table.json"))
 
 MODEL_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -76,7 +102,7 @@ if not DATA_PATH.exists():
     raise FileNotFoundError(f"DATA_PATH not found: {DATA_PATH}\\nSet DATA_PATH in .env or put the file there.")
 
 # Load dataset (25 columns: 24 features + target)
-df = pd.read_csv(DATA_PATH, sep=r"\\s+", header=None, engine="python")
+df = pd.read_csv(DATA_PATH, sep=r"\s+", header=None)
 if df.shape[1] != 25:
     raise ValueError(f"Expected 25 columns, got {df.shape[1]}. Check dataset format.")
 
@@ -118,4 +144,11 @@ print(f"Validation AUC: {auc:.4f}")
 joblib.dump(pipe, MODEL_PATH)
 FEATURES_PATH.write_text(json.dumps(list(X.columns), indent=2))
 print(f"Saved model → {MODEL_PATH}")
-print(f"Saved feature names → {FEATURES_PATH}")
\ No newline at end of file
+print(f"Saved feature names → {FEATURES_PATH}")
+# The app uses this to accept A-codes / labels. It is learned from the rows both files share,
+# so each code maps to the number german.data-numeric actually uses in that slot (A11 -> 1, ...);
+# a slot gets an entry only if it has a raw column's name and holds its recoding; strings sent
+# for any other slot are rejected.
+serve_table = CodeTable.from_aligned(raw_codes, X, map_dicts)
+serve_table.save(CODE_TABLE_PATH)
+print(f"Saved code table ({', '.join(serve_table.columns)}) → {CODE_TABLE_PATH}")
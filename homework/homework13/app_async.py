@@ -0,0 +1,247 @@
+"""
+ASGI version of app_flask.py with the same /health, /predict, /predict/batch,
+/plot and /metrics contract, for serving with any ASGI server:
+
+    uvicorn app_async:app --port 5050
+
+Nothing blocking runs on the event loop. Downloads and PNG rendering go to their
+own bounded thread pools, and scoring goes to a separate inference pool, so slow
+upstream fetches can't hold up /predict. Concurrent /plot requests for the same
+ticker and range share one download.
+"""
+import sys
+from pathlib import Path
+
+# the shared src/ package lives at the repo root, two levels up (homework/homework13/<this file>)
+repo_root = Path(__file__).resolve().parents[2]
+if not (repo_root / "src" / "__init__.py").exists():
+    raise RuntimeError(f"Could not find 'src/__init__.py' under {repo_root}.")
+if str(repo_root) not in sys.path:
+    sys.path.insert(0, str(repo_root))
+# --------------------------------------------------------------------
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from urllib.parse import parse_qs
+
+from src.registry import ModelRegistry
+from src.serving import parse_payload, score_loaded, loads_json, dumps_json, SingleFlight
+from src.fast_scorer import compile_scorer
+from src.cache import PriceCache, ResponseCache
+from src.plotting import render_price_png
+from src.feature_store import FeatureStore
+from src.metrics import Metrics, stage
+
+ART_DIR = Path(os.getenv("ARTIFACT_DIR", repo_root / "artifacts"))
+MAX_BATCH_ROWS = int(os.getenv("MAX_BATCH_ROWS", 10000))
+MAX_BODY_BYTES = int(os.getenv("MAX_BODY_BYTES", 16 * 2**20))
+ARTIFACT_MMAP_MODE = os.getenv("ARTIFACT_MMAP_MODE", "r") or None
+ARTIFACT_LAZY = os.getenv("ARTIFACT_LAZY", "0") == "1"
+MODEL_POLL_SECONDS = float(os.getenv("MODEL_POLL_SECONDS", 5))
+FAST_SCORER = os.getenv("FAST_SCORER", "1") == "1"
+
+# pool sizes; /plot requests beyond ASYNC_MAX_PENDING_PLOTS waiting at once get a 503 instead of queueing
+DOWNLOAD_WORKERS = int(os.getenv("ASYNC_DOWNLOAD_WORKERS", 8))
+RENDER_WORKERS = int(os.getenv("ASYNC_RENDER_WORKERS", 2))
+PREDICT_WORKERS = int(os.getenv("ASYNC_PREDICT_WORKERS", 2))
+MAX_PENDING_PLOTS = int(os.getenv("ASYNC_MAX_PENDING_PLOTS", 64))
+
+REGISTRY = ModelRegistry(ART_DIR, poll_interval=MODEL_POLL_SECONDS, prepare=compile_scorer if FAST_SCORER else None,
+                         mmap_mode=ARTIFACT_MMAP_MODE, lazy=ARTIFACT_LAZY).start()
+if REGISTRY.current() is None:
+    print(f"[WARN] Could not load artifacts from {ART_DIR}: {REGISTRY.last_error}")
+
+PRICES = PriceCache()
+PLOTS = ResponseCache(ttl=float(os.getenv("PLOT_CACHE_TTL", 300)),
+                      max_bytes=int(os.getenv("PLOT_CACHE_MAX_BYTES", 64 * 2**20)))
+FEATURES = FeatureStore()
+METRICS = Metrics.from_env()
+
+DOWNLOAD_POOL = ThreadPoolExecutor(DOWNLOAD_WORKERS, thread_name_prefix="download")
+RENDER_POOL = ThreadPoolExecutor(RENDER_WORKERS, thread_name_prefix="render")
+PREDICT_POOL = ThreadPoolExecutor(PREDICT_WORKERS, thread_name_prefix="predict")
+DOWNLOADS = SingleFlight()
+_plot_slots = None  # asyncio.Semaphore, created on the serving loop
+
+
+async def _in_pool(pool, fn, *args):
+    # copy the request context so stage() timings inside the worker land on this request
+    ctx = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(pool, functools.partial(ctx.run, fn, *args))
+
+
+class _Response:
+    __slots__ = ("status", "body", "content_type", "headers")
+
+    def __init__(self, status, body=b"", content_type="application/json", headers=()):
+        self.status, self.body, self.content_type, self.headers = status, body, content_type, list(headers)
+
+
+def _json(obj, status=200):
+    with stage("encode"):
+        return _Response(status, dumps_json(obj))
+
+
+# ---- handlers ----------------------------------------------------------
+
+async def health(scope, body):
+    status = "ok" if REGISTRY.current() is not None else "degraded"
+    return _json({"status": status, **REGISTRY.status()})
+
+
+async def predict(scope, body, batch_only=False):
+    """Same contract as app_flask /predict (and /predict/batch when batch_only)."""
+    art = REGISTRY.current()
+    if art is None:
+        return _json({"error": "Model not loaded. Train/export artifacts first."}, 503)
+    try:
+        with stage("parse"):
+            try:
+                data = loads_json(body) if body else {}
+            except ValueError:
+                data = {}
+            X, is_batch = parse_payload(data, art, MAX_BATCH_ROWS, FEATURES)
+    except ValueError as e:
+        return _json({"error": str(e)}, 400)
+
+    results = await _in_pool(PREDICT_POOL, score_loaded, art, X)
+    if is_batch or batch_only:
+        return _json({"results": results})
+    return _json(results[0])
+
+
+async def predict_batch(scope, body):
+    return await predict(scope, body, batch_only=True)
+
+
+async def plot(scope, body):
+    """Same query parameters, caching and ETag behaviour as app_flask /plot."""
+    global _plot_slots
+    args = {k: v[-1] for k, v in parse_qs(scope.get("query_string", b"").decode()).items()}
+    ticker = args.get("ticker", "AAPL").upper()
+    start = args.get("start", "2020-01-01")
+    end = args.get("end") or None
+    try:
+        width, height = (int(v) for v in args.get("size", "800x400").lower().split("x"))
+        if not (100 <= width <= 4000 and 100 <= height <= 4000):
+            raise ValueError
+    except ValueError:
+        return _json({"error": "size must be WIDTHxHEIGHT in pixels, each between 100 and 4000."}, 400)
+    try:
+        start = date.fromisoformat(start).isoformat()
+        end = date.fromisoformat(end).isoformat() if end else None
+    except ValueError:
+        return _json({"error": "start and end must be dates as YYYY-MM-DD."}, 400)
+
+    key = (ticker, start, end or date.today().isoformat(), width, height)
+    cached = PLOTS.get(key)
+    if cached is None:
+        if _plot_slots is None:
+            _plot_slots = asyncio.Semaphore(MAX_PENDING_PLOTS)
+        if _plot_slots.locked():
+            return _json({"error": "Too many plot requests in progress; retry shortly."}, 503)
+        async with _plot_slots:
+            try:
+                with stage("download"):
+                    df = await DOWNLOADS.run((ticker, start, end), lambda: _in_pool(
+                        DOWNLOAD_POOL, functools.partial(PRICES.get, ticker, start=start, end=end, auto_adjust=True)))
+            except Exception as e:
+                return _json({"error": f"Failed to download data for {ticker}: {e}"}, 502)
+            if df is None or df.empty or "Close" not in df.columns:
+                return _json({"error": f"No data available for {ticker} in given range."}, 404)
+            body = await _in_pool(RENDER_POOL, render_price_png, df["Date"].to_numpy(), df["Close"].to_numpy(),
+                                  ticker, width, height)
+        etag = PLOTS.put(key, body)
+    else:
+        body, etag = cached
+
+    headers = [(b"etag", f'"{etag}"'.encode()), (b"cache-control", f"max-age={int(PLOTS.ttl)}".encode())]
+    if_none_match = dict(scope.get("headers", [])).get(b"if-none-match", b"").decode()
+    if etag in {t.strip().strip('"') for t in if_none_match.replace("W/", "").split(",")} or if_none_match == "*":
+        return _Response(304, b"", "image/png", headers)
+    return _Response(200, body, "image/png", headers)
+
+
+async def metrics(scope, body):
+    return _Response(200, METRICS.render().encode(), "text/plain; version=0.0.4")
+
+
+ROUTES = {
+    ("GET", "/health"): health,
+    ("POST", "/predict"): predict,
+    ("POST", "/predict/batch"): predict_batch,
+    ("GET", "/plot"): plot,
+    ("GET", "/metrics"): metrics,
+}
+
+
+# ---- ASGI plumbing ------------------------------------------------------
+
+async def _read_body(receive) -> bytes:
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        size += len(chunks[-1])
+        if size > MAX_BODY_BYTES:
+            raise ValueError("Request body too large.")
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            REGISTRY.stop()
+            for pool in (DOWNLOAD_POOL, RENDER_POOL, PREDICT_POOL):
+                pool.shutdown(wait=False, cancel_futures=True)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def _dispatch(handler, method, path, scope, receive):
+    if handler is None:
+        if any(p == path for _, p in ROUTES):
+            return _Response(405, dumps_json({"error": "Method not allowed."}))
+        return _Response(404, dumps_json({"error": "Not found."}))
+    try:
+        body = await _read_body(receive) if method == "POST" else b""
+    except ValueError as e:
+        return _Response(413, dumps_json({"error": str(e)}))
+    return await handler(scope, body)
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await _lifespan(receive, send)
+    if scope["type"] != "http":
+        return
+
+    method, path = scope["method"], scope["path"]
+    handler = ROUTES.get((method, path))
+    route = path if handler is not None else "unmatched"
+    token = METRICS.start_request(route)
+    try:
+        resp = await _dispatch(handler, method, path, scope, receive)
+    except Exception as e:
+        resp = _Response(500, dumps_json({"error": f"{type(e).__name__}: {e}"}))
+    METRICS.end_request(token, route, method, resp.status)
+
+    headers = [(b"content-type", resp.content_type.encode()), (b"content-length", str(len(resp.body)).encode()),
+               *resp.headers]
+    await send({"type": "http.response.start", "status": resp.status, "headers": headers})
+    await send({"type": "http.response.body", "body": resp.body})
+
+
+if __name__ == "__main__":
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("Install an ASGI server to run this app, e.g. `pip install uvicorn`.")
+    uvicorn.run(app, host="127.0.0.1", port=5050)
@@ -1,67 +1,116 @@
 import sys
 from pathlib import Path
 
-_here = Path(__file__).resolve()
-for p in [_here.parent] + list(_here.parents):
-    if (p / "src" / "__init__.py").exists():
-        sys.path.insert(0, str(p))  
-        repo_root = p
-        break
-else:
-    raise RuntimeError(
-        "Could not find 'src/__init__.py'. "
-        "Run from your project root or ensure a 'src/' package exists."
-    )
+# the shared src/ package lives at the repo root, two levels up (homework/homework13/<this file>)
+repo_root = Path(__file__).resolve().parents[2]
+if not (repo_root / "src" / "__init__.py").exists():
+    raise RuntimeError(f"Could not find 'src/__init__.py' under {repo_root}.")
+if str(repo_root) not in sys.path:
+    sys.path.insert(0, str(repo_root))
 # --------------------------------------------------------------------
 
 from flask import Flask, request, jsonify, Response
-import numpy as np
-import matplotlib
-matplotlib.use("Agg")  # headless backend for servers
-import matplotlib.pyplot as plt
-import io
-
-from src.io import load_artifacts 
-
-ART_DIR = repo_root / "artifacts"
-
-try:
-    MODEL, IMPUTER, SCALER, META = load_artifacts(ART_DIR)
-except Exception as e:
-    MODEL = IMPUTER = SCALER = META = None
-    print(f"[WARN] Could not load artifacts from {ART_DIR}: {e}")
+import os
+from datetime import date
+
+from src.registry import ModelRegistry
+from src.serving import parse_payload, score_loaded, MicroBatcher, loads_json, dumps_json
+from src.fast_scorer import compile_scorer
+from src.cache import PriceCache, ResponseCache
+from src.plotting import render_price_png
+from src.feature_store import FeatureStore
+from src.metrics import Metrics, stage
+
+ART_DIR = Path(os.getenv("ARTIFACT_DIR", repo_root / "artifacts"))
+MAX_BATCH_ROWS = int(os.getenv("MAX_BATCH_ROWS", 10000))
+# >0 merges single-row /predict calls arriving within this many ms into one model call
+MICROBATCH_WINDOW_MS = float(os.getenv("MICROBATCH_WINDOW_MS", 0))
+
+# "r" maps uncompressed arrays read-only so forked workers share them; ARTIFACT_LAZY=1 defers unpickling
+ARTIFACT_MMAP_MODE = os.getenv("ARTIFACT_MMAP_MODE", "r") or None
+ARTIFACT_LAZY = os.getenv("ARTIFACT_LAZY", "0") == "1"
+# how often to check ART_DIR (VERSION file or meta.json hash) for a retrained model; 0 = never
+MODEL_POLL_SECONDS = float(os.getenv("MODEL_POLL_SECONDS", 5))
+# compile imputer + model into a NumPy-only scorer at load time (verified against sklearn, else skipped)
+FAST_SCORER = os.getenv("FAST_SCORER", "1") == "1"
+
+REGISTRY = ModelRegistry(ART_DIR, poll_interval=MODEL_POLL_SECONDS, prepare=compile_scorer if FAST_SCORER else None,
+                         mmap_mode=ARTIFACT_MMAP_MODE, lazy=ARTIFACT_LAZY).start()
+if REGISTRY.current() is None:
+    print(f"[WARN] Could not load artifacts from {ART_DIR}: {REGISTRY.last_error}")
+
+# persistent per-ticker price cache (dir from $PRICE_CACHE_DIR); only missing date ranges hit yfinance
+PRICES = PriceCache()
+# rendered /plot PNGs keyed by (ticker, start, end, width, height)
+PLOTS = ResponseCache(ttl=float(os.getenv("PLOT_CACHE_TTL", 300)),
+                      max_bytes=int(os.getenv("PLOT_CACHE_MAX_BYTES", 64 * 2**20)))
+
+# precomputed float32 feature rows per ticker (dir from $FEATURE_STORE_DIR), for {"ticker": ...} requests
+FEATURES = FeatureStore()
 
 app = Flask(__name__)
+# per-route/per-stage latency histograms at /metrics (METRICS_SAMPLE_RATE, METRICS_PROFILE_REQUESTS)
+METRICS = Metrics.from_env().init_app(app)
 
 @app.get("/health")
 def health():
-    status = "ok" if MODEL is not None else "degraded"
-    return jsonify({"status": status})
+    status = "ok" if REGISTRY.current() is not None else "degraded"
+    return jsonify({"status": status, **REGISTRY.status()})
 
-@app.post("/predict")
-def predict():
-    if MODEL is None or IMPUTER is None:
-        return jsonify({"error": "Model not loaded. Train/export artifacts first."}), 503
+def _score(X, art=None):
+    # take one snapshot so a hot-swap mid-request can't mix old imputer with new model
+    return score_loaded(art or REGISTRY.current(), X)
 
-    data = request.get_json(silent=True) or {}
-    features = data.get("features")
+def _json(obj):
+    with stage("encode"):
+        body = dumps_json(obj)
+    return Response(body, mimetype="application/json")
 
-    if not isinstance(features, list) or not all(isinstance(x, (int, float)) for x in features):
-        return jsonify({"error": "Body must be JSON with numeric list 'features'."}), 400
+BATCHER = MicroBatcher(_score, window_s=MICROBATCH_WINDOW_MS / 1000) if MICROBATCH_WINDOW_MS > 0 else None
 
-    X = np.array(features, dtype=float).reshape(1, -1)
-    X_imp = IMPUTER.transform(X)
-    
+def _parse_request_rows(art):
+    try:
+        data = loads_json(request.get_data()) if request.is_json else {}
+    except ValueError:
+        data = {}
+    return parse_payload(data, art, MAX_BATCH_ROWS, FEATURES)
 
-    if hasattr(MODEL, "predict_proba"):
-        proba_up = float(MODEL.predict_proba(X_imp)[:, 1][0])
-        threshold = (META or {}).get("threshold", 0.5)
-        pred_up = int(proba_up >= threshold)
-        return jsonify({"proba_up": round(proba_up, 6), "pred_up": pred_up})
+@app.post("/predict")
+def predict():
+    """
+    Score one row (`{"features": [..]}`) or a batch (`{"features": [[..], [..]]}`).
+    `{"ticker": "AAPL"}` scores the latest row in the feature store.
+    A batch returns `{"results": [...]}` with one entry per row.
+    """
+    art = REGISTRY.current()
+    if art is None:
+        return jsonify({"error": "Model not loaded. Train/export artifacts first."}), 503
 
+    try:
+        with stage("parse"):
+            X, is_batch = _parse_request_rows(art)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if is_batch:
+        return _json({"results": _score(X, art)})
+    if BATCHER is not None:
+        return _json(BATCHER.submit(X[0]))
+    return _json(_score(X, art)[0])
+
+@app.post("/predict/batch")
+def predict_batch():
+    """Score a list of rows in one imputer + model call."""
+    art = REGISTRY.current()
+    if art is None:
+        return jsonify({"error": "Model not loaded. Train/export artifacts first."}), 503
 
-    pred = float(MODEL.predict(X_imp)[0])
-    return jsonify({"prediction": pred})
+    try:
+        with stage("parse"):
+            X, _ = _parse_request_rows(art)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return _json({"results": _score(X, art)})
 
 @app.get("/plot")
 def plot():
@@ -71,47 +120,48 @@ def plot():
       - ticker= AAPL (default)
       - start= 2020-01-01 (default)
       - end=   today (default via yfinance)
+      - size=  800x400 (default, pixels)
+    Responses carry an ETag; a matching If-None-Match gets a 304.
     """
-    from flask import request
-    from src import download_data  # uses your src/data.py
-
     ticker = request.args.get("ticker", "AAPL").upper()
     start  = request.args.get("start", "2020-01-01")
     end    = request.args.get("end", None)  # let yfinance default to today if None
-
-    # Download OHLCV
     try:
-        df = download_data(ticker, start=start, end=end, auto_adjust=True)
-    except Exception as e:
-        return jsonify({"error": f"Failed to download data for {ticker}: {e}"}), 502
-
-    # Basic validation
-    if df is None or df.empty or "Close" not in df.columns:
-        return jsonify({"error": f"No data available for {ticker} in given range."}), 404
-
-    # Ensure plotting on Date vs Close
-    # yfinance reset_index() gives 'Date' as a column already
-    # Convert Date to pandas datetime in case it's not
+        width, height = (int(v) for v in request.args.get("size", "800x400").lower().split("x"))
+        if not (100 <= width <= 4000 and 100 <= height <= 4000):
+            raise ValueError
+    except ValueError:
+        return jsonify({"error": "size must be WIDTHxHEIGHT in pixels, each between 100 and 4000."}), 400
     try:
-        import pandas as pd
-        df["Date"] = pd.to_datetime(df["Date"])
-    except Exception:
-        pass
-
-    # Build figure
-    fig, ax = plt.subplots(figsize=(8, 4))
-    ax.plot(df["Date"], df["Close"], label=f"{ticker} Close")
-    ax.set_title(f"{ticker} Closing Price")
-    ax.set_xlabel("Date")
-    ax.set_ylabel("Price")
-    ax.grid(True, alpha=0.3)
-    ax.legend()
-
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", bbox_inches="tight")
-    plt.close(fig)
-    buf.seek(0)
-    return Response(buf.getvalue(), mimetype="image/png")
+        start = date.fromisoformat(start).isoformat()
+        end = date.fromisoformat(end).isoformat() if end else None
+    except ValueError:
+        return jsonify({"error": "start and end must be dates as YYYY-MM-DD."}), 400
+
+    # an open-ended range changes daily, so today's date is part of its key
+    key = (ticker, start, end or date.today().isoformat(), width, height)
+    cached = PLOTS.get(key)
+    if cached is None:
+        # Download OHLCV
+        try:
+            with stage("download"):
+                df = PRICES.get(ticker, start=start, end=end, auto_adjust=True)
+        except Exception as e:
+            return jsonify({"error": f"Failed to download data for {ticker}: {e}"}), 502
+
+        # Basic validation
+        if df is None or df.empty or "Close" not in df.columns:
+            return jsonify({"error": f"No data available for {ticker} in given range."}), 404
+
+        body = render_price_png(df["Date"].to_numpy(), df["Close"].to_numpy(), ticker, width, height)
+        etag = PLOTS.put(key, body)
+    else:
+        body, etag = cached
+
+    resp = Response(body, mimetype="image/png")
+    resp.set_etag(etag)
+    resp.cache_control.max_age = int(PLOTS.ttl)
+    return resp.make_conditional(request)
 
 if __name__ == "__main__":
     app.run(host="127.0.0.1", port=5050, debug=True)
\ No newline at end of file
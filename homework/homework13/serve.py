@@ -0,0 +1,360 @@
+"""
+Pre-forking production launcher for app_flask.py.
+
+    python serve.py --workers 4 --threads 8 --port 5050
+
+The parent imports the app once, so the artifacts are loaded (and the fast scorer
+compiled) before any worker exists. It then freezes the GC and forks the workers,
+which inherit the model copy-on-write: its pages stay shared because nothing
+writes to them. All workers accept from one listening socket opened by the
+parent, and each serves requests on a bounded thread pool.
+
+A worker reports ready over a pipe once its own /health answers "ok"; the parent
+logs when the whole generation is ready and touches --ready-file for external
+probes.
+
+Workers don't watch the artifacts themselves (each would unpickle a private copy
+and they could serve different versions). The parent stops the registry's watcher
+before the first fork and checks for a new version every MODEL_POLL_SECONDS; a
+new version is loaded once in the parent and rolled out as a graceful restart.
+Signals to the parent:
+
+    SIGHUP           graceful restart: reload artifacts in the parent, fork a new
+                     generation, wait until it is ready, then drain the old one
+                     (in-flight requests finish). If the new workers never get
+                     ready, they are stopped and the old ones keep serving.
+    SIGTERM, SIGINT  drain all workers (up to --graceful-timeout) and exit.
+
+Workers that die are replaced. Unix only (needs fork).
+"""
+import argparse
+import gc
+import logging
+import os
+import select
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+
+log = logging.getLogger("serve")
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        if os.getenv("SERVE_ACCESS_LOG", "0") == "1":
+            super().log_message(format, *args)
+
+
+class PooledWSGIServer(WSGIServer):
+    """
+    WSGI server on an already-listening socket, handling requests on a fixed thread pool.
+
+    A connection is only accepted when a thread is free, so a busy worker leaves new
+    connections in the shared backlog for an idle one to pick up.
+
+    Args:
+        sock (socket.socket): Listening socket (set non-blocking, shared between workers).
+        app: WSGI application.
+        threads (int): Requests handled concurrently by this process.
+    """
+
+    def __init__(self, sock, app, threads: int):
+        super().__init__(sock.getsockname()[:2], _QuietHandler, bind_and_activate=False)
+        self.socket.close()
+        self.socket = sock
+        host, port = sock.getsockname()[:2]
+        self.server_name, self.server_port = socket.getfqdn(host), port
+        self.setup_environ()
+        self.set_app(app)
+        self._slots = threading.BoundedSemaphore(threads)
+        self._pool = ThreadPoolExecutor(threads, thread_name_prefix="http")
+
+    def get_request(self):
+        self._slots.acquire()
+        try:
+            conn, addr = self.socket.accept()
+        except OSError:  # another worker took the connection first
+            self._slots.release()
+            raise
+        conn.setblocking(True)
+        return conn, addr
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def drain(self):
+        """Wait for in-flight requests; call after serve_forever() has returned."""
+        self._pool.shutdown(wait=True)
+
+
+def _worker(sock, threads: int, ready_fd: int) -> None:
+    """Body of a forked worker; never returns."""
+    code = 0
+    try:
+        gc.enable()
+        import app_flask  # already imported by the parent: this is a dict lookup
+
+        server = PooledWSGIServer(sock, app_flask.app, threads)
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+
+        health = app_flask.app.test_client().get("/health").get_json() or {}
+        os.write(ready_fd, b"1" if health.get("status") == "ok" else b"0")
+        os.close(ready_fd)
+
+        server.serve_forever(poll_interval=0.5)
+        server.drain()
+    except BaseException:
+        logging.exception("[serve] worker %d crashed", os.getpid())
+        code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(code)
+
+
+class Arbiter:
+    """
+    Parent process: owns the listening socket, forks workers, reacts to signals.
+
+    Args:
+        sock (socket.socket): Listening socket shared with the workers.
+        workers (int): Worker processes per generation.
+        threads (int): Request threads per worker.
+        graceful_timeout (float): Seconds a stopping worker gets to drain before SIGKILL.
+        ready_timeout (float): Seconds to wait for a new generation to report healthy.
+        ready_file (Path | None): Touched when all workers are ready, removed on exit.
+        model_poll (float): Seconds between checks for new artifacts; a new version
+            triggers a graceful restart. 0 disables the check.
+    """
+
+    def __init__(self, sock, workers: int, threads: int, graceful_timeout: float = 30,
+                 ready_timeout: float = 60, ready_file=None, model_poll: float = 0):
+        self.sock = sock
+        self.n_workers = workers
+        self.threads = threads
+        self.graceful_timeout = graceful_timeout
+        self.ready_timeout = ready_timeout
+        self.ready_file = Path(ready_file) if ready_file else None
+        self.model_poll = model_poll
+        self.workers = {}  # pid -> ready pipe read fd (None once read)
+        self._signals = []
+        self._wakeup_r, self._wakeup_w = os.pipe()
+
+    # ---- process management ----
+    def spawn(self) -> int:
+        r, w = os.pipe()
+        gc.freeze()  # move everything loaded so far out of GC tracking, so collections don't touch shared pages
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl-C reaches the whole group; the parent decides
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            os.close(r)
+            for fd in (self._wakeup_r, self._wakeup_w):
+                os.close(fd)
+            _worker(self.sock, self.threads, w)
+        os.close(w)
+        self.workers[pid] = r
+        return pid
+
+    def wait_ready(self, pids, timeout: float) -> bool:
+        """True once every pid reported a healthy /health within `timeout` seconds."""
+        pending = {self.workers[pid]: pid for pid in pids if self.workers.get(pid) is not None}
+        healthy, deadline = True, time.monotonic() + timeout
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                log.warning("[serve] workers %s not ready after %.0fs", sorted(pending.values()), timeout)
+                return False
+            readable, _, _ = select.select(list(pending), [], [], min(remaining, 0.5))
+            for fd in readable:
+                pid = pending.pop(fd)
+                status = os.read(fd, 1)
+                os.close(fd)
+                self.workers[pid] = None
+                if status != b"1":
+                    log.warning("[serve] worker %d is up but unhealthy (model not loaded?)", pid)
+                    healthy = False
+            self.reap()
+            dead = [fd for fd, pid in pending.items() if pid not in self.workers]
+            if dead:
+                log.warning("[serve] worker(s) %s exited before becoming ready", [pending[fd] for fd in dead])
+                return False
+        return healthy
+
+    def stop(self, pids, timeout: float) -> None:
+        """SIGTERM, wait up to `timeout` for the workers to drain, then SIGKILL the rest."""
+        pids = [p for p in pids if p in self.workers]
+        for pid in pids:
+            self._kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + timeout
+        while any(p in self.workers for p in pids) and time.monotonic() < deadline:
+            time.sleep(0.05)
+            self.reap()
+        for pid in [p for p in pids if p in self.workers]:
+            log.warning("[serve] worker %d did not stop in %.0fs; killing it", pid, timeout)
+            self._kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            self._forget(pid)
+
+    def reap(self) -> list:
+        """Collect exited workers; returns their pids."""
+        gone = []
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            if pid in self.workers:
+                self._forget(pid)
+                gone.append(pid)
+        return gone
+
+    def _forget(self, pid):
+        fd = self.workers.pop(pid, None)
+        if fd is not None:
+            os.close(fd)
+
+    @staticmethod
+    def _kill(pid, sig):
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
+    # ---- lifecycle ----
+    def _on_signal(self, signum, frame):
+        self._signals.append(signum)
+        os.write(self._wakeup_w, b"!")
+
+    def _mark_ready(self, ready: bool) -> None:
+        if self.ready_file is None:
+            return
+        if ready:
+            self.ready_file.touch()
+        elif self.ready_file.exists():
+            self.ready_file.unlink()
+
+    def restart(self, reload: bool = True) -> None:
+        """Graceful restart: new generation first, old one drained only once the new one is ready."""
+        import app_flask
+
+        if reload:
+            log.info("[serve] SIGHUP: reloading artifacts and starting a new generation")
+            app_flask.REGISTRY.reload()
+        old = list(self.workers)
+        new = [self.spawn() for _ in range(self.n_workers)]
+        if self.wait_ready(new, self.ready_timeout):
+            self.stop(old, self.graceful_timeout)
+            log.info("[serve] restart complete: workers %s", new)
+        else:
+            log.warning("[serve] new generation not ready; keeping workers %s", old)
+            self.stop(new, self.graceful_timeout)
+
+    def check_model(self) -> None:
+        """Load new artifacts in the parent, if any, and roll them out to a new generation."""
+        import app_flask
+
+        if app_flask.REGISTRY.reload():
+            log.info("[serve] new model version %s: starting a new generation", app_flask.REGISTRY.current().version)
+            self.restart(reload=False)
+
+    def run(self) -> None:
+        for sig in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT, signal.SIGCHLD):
+            signal.signal(sig, self._on_signal)
+        pids = [self.spawn() for _ in range(self.n_workers)]
+        ready = self.wait_ready(pids, self.ready_timeout)
+        self._mark_ready(ready)
+        host, port = self.sock.getsockname()[:2]
+        log.info("[serve] %d workers x %d threads on http://%s:%d (%s)", self.n_workers, self.threads, host, port,
+                 "ready" if ready else "NOT ready")
+        last_spawn, last_poll = 0.0, time.monotonic()
+        try:
+            while True:
+                select.select([self._wakeup_r], [], [], 1.0)
+                while True:  # drain the wakeup pipe
+                    if not select.select([self._wakeup_r], [], [], 0)[0]:
+                        break
+                    os.read(self._wakeup_r, 64)
+                signals, self._signals = self._signals, []
+                if signal.SIGTERM in signals or signal.SIGINT in signals:
+                    break
+                if signal.SIGHUP in signals:
+                    self.restart()
+                    self._mark_ready(bool(self.workers))
+                    last_poll = time.monotonic()
+                elif self.model_poll > 0 and time.monotonic() - last_poll >= self.model_poll:
+                    self.check_model()
+                    self._mark_ready(bool(self.workers))
+                    last_poll = time.monotonic()
+                for pid in self.reap():
+                    log.warning("[serve] worker %d exited unexpectedly", pid)
+                # replace dead workers, at most one per second so a crashing app doesn't fork-loop
+                if len(self.workers) < self.n_workers and time.monotonic() - last_spawn >= 1.0:
+                    last_spawn = time.monotonic()
+                    self.spawn()
+        finally:
+            log.info("[serve] shutting down %d workers", len(self.workers))
+            self._mark_ready(False)
+            self.stop(list(self.workers), self.graceful_timeout)
+
+
+def listen(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.setblocking(False)  # every worker polls it; only one wins each accept()
+    sock.set_inheritable(True)
+    return sock
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default=os.getenv("SERVE_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("SERVE_PORT", 5050)))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("SERVE_WORKERS", os.cpu_count() or 1)))
+    parser.add_argument("--threads", type=int, default=int(os.getenv("SERVE_THREADS", 4)))
+    parser.add_argument("--graceful-timeout", type=float, default=float(os.getenv("SERVE_GRACEFUL_TIMEOUT", 30)))
+    parser.add_argument("--ready-timeout", type=float, default=float(os.getenv("SERVE_READY_TIMEOUT", 60)))
+    parser.add_argument("--ready-file", default=os.getenv("SERVE_READY_FILE"),
+                        help="touched once every worker reports healthy (for readiness probes)")
+    args = parser.parse_args(argv)
+    if not hasattr(os, "fork"):
+        raise SystemExit("serve.py needs os.fork(); use app_async.py with an ASGI server on this platform.")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(process)d %(message)s")
+    sock = listen(args.host, args.port)
+    # loaded once here; the workers share these pages copy-on-write
+    gc.disable()
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    import app_flask
+
+    # no thread may run across fork(), and the workers must not reload on their own:
+    # stop the watcher (it stays stopped in the children) and poll from the Arbiter
+    model_poll = app_flask.REGISTRY.poll_interval
+    app_flask.REGISTRY.stop(wait=True)
+
+    Arbiter(sock, max(1, args.workers), max(1, args.threads), args.graceful_timeout, args.ready_timeout,
+            args.ready_file, model_poll).run()
+
+
+if __name__ == "__main__":
+    main()
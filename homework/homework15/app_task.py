@@ -2,22 +2,251 @@
 import argparse, json, logging, sys
 from datetime import datetime
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
+# the shared src/ package lives at the repo root, two levels up (homework/homework15/<this file>)
+repo_root = Path(__file__).resolve().parents[2]
+if not (repo_root / "src" / "__init__.py").exists():
+    raise RuntimeError(f"Could not find 'src/__init__.py' under {repo_root}.")
+if str(repo_root) not in sys.path:
+    sys.path.insert(0, str(repo_root))
+
+from src.storage import read_table, write_table, table_format, PRICE_DTYPES
+
 REQUIRED_COLS = ["Date", "Close", "Volume"]
 
 def _read_any(path: str) -> pd.DataFrame:
-    p = Path(path)
-    if p.suffix.lower() in {".csv"}:
-        return pd.read_csv(p)
-    return pd.read_json(p)  # default: json
+    """CSV / JSON / JSON-lines / Parquet / Arrow, reading only the columns this step uses."""
+    fmt = table_format(path, default="json")
+    if fmt in {"parquet", "ipc"}:
+        return read_table(path, columns=REQUIRED_COLS, dtypes=PRICE_DTYPES, fmt=fmt)
+    return read_table(path, fmt=fmt)  # text formats: let the schema check below report what's missing
+
+def _write_any(df: pd.DataFrame, path: str) -> None:
+    """Write in the format implied by the suffix (.json keeps the indented records layout)."""
+    write_table(df, path, fmt=table_format(path, default="json"))
+
+class QuantileSketch:
+    """
+    Streaming quantile sketch (DDSketch-style log buckets).
+
+    Any quantile is returned within `rel_accuracy` relative error, and memory
+    depends on the value range (a few thousand buckets for prices), not on how
+    many values were added.
+    """
+
+    def __init__(self, rel_accuracy: float = 0.001):
+        self.gamma = (1 + rel_accuracy) / (1 - rel_accuracy)
+        self.log_gamma = np.log(self.gamma)
+        self.pos, self.neg = {}, {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, values) -> None:
+        v = np.asarray(values, dtype=float)
+        v = v[np.isfinite(v)]
+        self.count += len(v)
+        self.zeros += int((v == 0).sum())
+        for store, arr in ((self.pos, v[v > 0]), (self.neg, -v[v < 0])):
+            if len(arr):
+                keys, counts = np.unique(np.ceil(np.log(arr) / self.log_gamma).astype(np.int64), return_counts=True)
+                for k, c in zip(keys.tolist(), counts.tolist()):
+                    store[k] = store.get(k, 0) + c
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def _ranked(self, rank: int) -> float:
+        # walk buckets from the most negative value to the most positive
+        buckets = [(-self._value(k), c) for k, c in sorted(self.neg.items(), reverse=True)]
+        buckets.append((0.0, self.zeros))
+        buckets += [(self._value(k), c) for k, c in sorted(self.pos.items())]
+        seen = 0
+        for value, c in buckets:
+            seen += c
+            if seen > rank:
+                return value
+        return buckets[-1][0]
+
+    def quantile(self, q: float) -> float:
+        """Linearly interpolated between neighbouring ranks, like pandas' default."""
+        if self.count == 0:
+            return np.nan
+        rank = q * (self.count - 1)
+        lo = int(np.floor(rank))
+        frac = rank - lo
+        v_lo = self._ranked(lo)
+        if frac == 0 or lo + 1 >= self.count:
+            return v_lo
+        return v_lo + (self._ranked(lo + 1) - v_lo) * frac
+
+
+class _SeenDates:
+    """
+    Exact set of int64 timestamps kept as a few sorted numpy runs (8 bytes per date).
+
+    New runs are merged with the previous one while it is no bigger, so there are
+    only O(log n) runs to binary-search and merging stays amortised O(n log n).
+    """
+
+    def __init__(self):
+        self.runs = []
+
+    def _contains_many(self, v: np.ndarray) -> np.ndarray:
+        found = np.zeros(len(v), dtype=bool)
+        for run in self.runs:
+            idx = np.minimum(np.searchsorted(run, v), len(run) - 1)
+            found |= run[idx] == v
+        return found
+
+    def first_seen(self, v: np.ndarray) -> np.ndarray:
+        """Mask of values not seen in earlier calls (first occurrence only); records them."""
+        mask = ~pd.Index(v).duplicated() & ~self._contains_many(v)
+        run = np.unique(v[mask])
+        while self.runs and len(self.runs[-1]) <= len(run):
+            run = np.union1d(self.runs.pop(), run)
+        if len(run):
+            self.runs.append(run)
+        return mask
+
+
+def _iter_parquet(path: str, chunksize: int):
+    import pyarrow.parquet as pq
+    pf = pq.ParquetFile(path)
+    missing = [c for c in REQUIRED_COLS if c not in pf.schema_arrow.names]
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}. Got: {pf.schema_arrow.names}")
+    for batch in pf.iter_batches(batch_size=chunksize, columns=REQUIRED_COLS):
+        yield batch.to_pandas()
+
+def _iter_ipc(path: str, chunksize: int):
+    import pyarrow.dataset as ds
+    dataset = ds.dataset(path, format="ipc")
+    missing = [c for c in REQUIRED_COLS if c not in dataset.schema.names]
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}. Got: {dataset.schema.names}")
+    for batch in dataset.to_batches(batch_size=chunksize, columns=REQUIRED_COLS):
+        yield batch.to_pandas()
+
+def _iter_loaded(path: str, chunksize: int):
+    # a JSON array can't be parsed incrementally with pandas: load it, then hand it out in chunks
+    logging.warning("[clean] %s is a JSON array and is read whole; use .jsonl to bound memory", Path(path).name)
+    df = _read_any(path)
+    for i in range(0, max(len(df), 1), chunksize):
+        yield df.iloc[i:i + chunksize]
+
+def _iter_chunks(path: str, chunksize: int):
+    """Chunks of at most `chunksize` rows, for every input format my_task accepts."""
+    fmt = table_format(path, default="json")
+    if fmt == "csv":
+        return pd.read_csv(path, chunksize=chunksize)
+    if fmt == "jsonl":
+        return pd.read_json(path, lines=True, chunksize=chunksize)
+    if fmt == "parquet":
+        return _iter_parquet(path, chunksize)
+    if fmt == "ipc":
+        return _iter_ipc(path, chunksize)
+    return _iter_loaded(path, chunksize)
+
+
+class _ChunkWriter:
+    """Appends cleaned chunks to .parquet, .json (one array) or newline-delimited JSON (anything else)."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.kind = {".parquet": "parquet", ".json": "json"}.get(self.path.suffix.lower(), "ndjson")
+        self.rows = 0
+        self._pq = None
+        self._f = None if self.kind == "parquet" else open(self.path, "w")
+        if self.kind == "json":
+            self._f.write("[")
+
+    def write(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+        if self.kind == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._pq is None:
+                self._schema = table.schema  # later chunks are cast to the first chunk's dtypes
+                self._pq = pq.ParquetWriter(self.path, self._schema)
+            self._pq.write_table(table.cast(self._schema))
+        else:
+            lines = df.to_json(orient="records", date_format="iso", lines=True).strip()
+            if self.kind == "json":
+                self._f.write(("," if self.rows else "") + "\n" + lines.replace("\n", ",\n"))
+            else:
+                self._f.write(lines + "\n")
+        self.rows += len(df)
+
+    def close(self) -> None:
+        if self.kind == "parquet":
+            if self._pq is None:  # no rows at all: still leave a valid (empty) file
+                pd.DataFrame(columns=REQUIRED_COLS).to_parquet(self.path, index=False)
+            else:
+                self._pq.close()
+        else:
+            if self.kind == "json":
+                self._f.write("\n]\n")
+            self._f.close()
+
+
+def _clean_chunks(input_path: str, chunksize: int):
+    """Yield each chunk validated, date-parsed, deduped against earlier chunks and NA-dropped."""
+    seen = _SeenDates()
+    for i, chunk in enumerate(_iter_chunks(input_path, chunksize)):
+        missing = [c for c in REQUIRED_COLS if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"Chunk {i}: missing required columns: {missing}. Got: {list(chunk.columns)}")
+        chunk = chunk[REQUIRED_COLS].copy()
+        chunk["Date"] = pd.to_datetime(chunk["Date"], errors="coerce")
+        chunk = chunk.dropna(subset=["Date"])
+        keys = chunk["Date"].to_numpy().astype("datetime64[ns]").view("int64")
+        chunk = chunk[seen.first_seen(keys)]
+        yield chunk.dropna(subset=["Close", "Volume"])
+
+
+def my_task_streaming(input_path: str, output_path: str, chunksize: int = 500_000) -> None:
+    """
+    Out-of-core clean step with memory bounded by `chunksize`.
+
+    Two passes over the input: the first feeds a quantile sketch for the 0.001/0.999
+    Close clip bounds, the second clips and appends each chunk to the output
+    (.parquet, .json, or newline-delimited JSON).
+
+    Compared with my_task on the same input: the same rows are kept (duplicates keep
+    the first occurrence in file order in both), but rows are only sorted by Date
+    within each chunk, so the order matches only when the input is already sorted
+    (as tick dumps are). The clip bounds come from the sketch and are within its
+    relative accuracy (0.1% per bound) of the exact quantiles, so only clipped
+    values can differ. JSON-array input is read whole; use .jsonl to bound memory.
+    """
+    logging.info("[clean] streaming start (chunksize=%d)", chunksize)
+    sketch = QuantileSketch()
+    for chunk in _clean_chunks(input_path, chunksize):
+        sketch.add(chunk["Close"].to_numpy())
+    q_low, q_hi = sketch.quantile(0.001), sketch.quantile(0.999)
+    logging.info("[clean] %d rows after dedupe/NA drop; clip Close to [%.6g, %.6g]", sketch.count, q_low, q_hi)
+
+    writer = _ChunkWriter(output_path)
+    try:
+        for chunk in _clean_chunks(input_path, chunksize):
+            chunk["Close"] = chunk["Close"].clip(lower=q_low, upper=q_hi)
+            writer.write(chunk.sort_values("Date", kind="stable"))
+    finally:
+        writer.close()
+    logging.info("[clean] wrote %d rows to %s", writer.rows, output_path)
 
-def _write_json(df: pd.DataFrame, path: str) -> None:
-    Path(path).parent.mkdir(parents=True, exist_ok=True)
-    Path(path).write_text(df.to_json(orient="records", date_format="iso", indent=2))
+def my_task(input_path: str, output_path: str, chunksize: int = None) -> None:
+    """Clean step: load → validate schema → dedupe/sort → drop NAs → write JSON.
 
-def my_task(input_path: str, output_path: str) -> None:
-    """Clean step: load → validate schema → dedupe/sort → drop NAs → write JSON."""
+    With `chunksize`, runs my_task_streaming instead (for inputs that don't fit in memory).
+    """
+    if chunksize:
+        return my_task_streaming(input_path, output_path, chunksize)
     logging.info("[clean] start")
     df = _read_any(input_path)
 
@@ -26,9 +255,9 @@ def my_task(input_path: str, output_path: str) -> None:
     if missing:
         raise ValueError(f"Missing required columns: {missing}. Got: {list(df.columns)}")
 
-    # ensure datetime + sort
+    # ensure datetime + sort (stable, so the dedupe below keeps the first row in file order)
     df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-    df = df.dropna(subset=["Date"]).sort_values("Date")
+    df = df.dropna(subset=["Date"]).sort_values("Date", kind="stable")
 
     # dedupe & drop nans on key fields
     before = len(df)
@@ -42,7 +271,7 @@ def my_task(input_path: str, output_path: str) -> None:
     # metadata
     df.attrs["run_at"] = datetime.utcnow().isoformat()
 
-    _write_json(df[REQUIRED_COLS], output_path)
+    _write_any(df[REQUIRED_COLS], output_path)
     logging.info("[clean] wrote %s", output_path)
 
 def _ensure_sample_input(path: str) -> None:
@@ -61,6 +290,8 @@ def main(argv=None):
     parser = argparse.ArgumentParser(description="Homework task: clean")
     parser.add_argument("--input", required=True)
     parser.add_argument("--output", required=True)
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="stream the input in chunks of this many rows (.jsonl/.json/.parquet out)")
     args = parser.parse_args(argv)
 
     logging.basicConfig(level=logging.INFO, handlers=[logging.StreamHandler(sys.stdout)])
@@ -70,7 +301,7 @@ def main(argv=None):
         logging.warning("[clean] '%s' not found; creating a sample file.", args.input)
         _ensure_sample_input(args.input)
 
-    my_task(args.input, args.output)
+    my_task(args.input, args.output, chunksize=args.chunksize)
 
 if __name__ == "__main__":
     # Detect Jupyter vs Terminal run
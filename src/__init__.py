@@ -1,13 +1,32 @@
 # src/__init__.py
-from .data import download_data
-from .features import build_features, FEATURE_COLUMNS
-# If you want to expose IO utils at top-level, do it *once*:
-# from .io import save_artifacts, load_artifacts
-
-__all__ = [
-    "download_data",
-    "build_features",
-    "FEATURE_COLUMNS",
-    "save_artifacts", 
-    "load_artifacts",
-]
+# Public names are resolved on first use (PEP 562), so `import src` or importing one
+# submodule (e.g. src.serving in a scoring-only process) doesn't drag in pandas,
+# yfinance or the rest of the package.
+import importlib
+
+_EXPORTS = {
+    "download_data": ".data",
+    "download_many": ".data",
+    "build_features": ".features",
+    "FEATURE_COLUMNS": ".features",
+    "FeatureState": ".features",
+    "build_features_panel": ".features",
+    "FeatureStore": ".feature_store",
+    "save_artifacts": ".io",
+    "load_artifacts": ".io",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,176 @@
+# src/backtest.py
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from .features import FEATURE_COLUMNS
+
+
+def walk_forward_folds(n: int, train_size: int, test_size: int, step: int = None, mode: str = "expanding"):
+    """
+    Train/test index ranges for a walk-forward backtest over n time-ordered rows.
+
+    Args:
+        n (int): Number of rows.
+        train_size (int): Rows in the first training window (every window when mode="sliding").
+        test_size (int): Rows scored per fold.
+        step (int | None): How far each fold moves forward (default: test_size). Must be
+            at least test_size, so every row is scored once.
+        mode (str): "expanding" keeps all history; "sliding" keeps the last train_size rows.
+
+    Returns:
+        list[tuple[range, range]]: (train rows, test rows) per fold.
+    """
+    if mode not in {"expanding", "sliding"}:
+        raise ValueError("mode must be 'expanding' or 'sliding'")
+    step = step or test_size
+    if step < test_size:
+        raise ValueError(f"step ({step}) must be >= test_size ({test_size}); "
+                         "overlapping test windows would score rows twice.")
+    folds = []
+    for t in range(train_size, n, step):
+        start = 0 if mode == "expanding" else t - train_size
+        folds.append((range(start, t), range(t, min(t + test_size, n))))
+    return folds
+
+
+def _final_estimator(est):
+    return est.steps[-1][1] if hasattr(est, "steps") else est
+
+
+def _warm_start(est) -> bool:
+    """
+    Turn on warm starts where they mean "start from the previous solution".
+
+    Only linear models qualify: for forests, warm_start=True means "add trees" and
+    a refit with the same n_estimators would silently keep the old model.
+    """
+    if not type(_final_estimator(est)).__module__.startswith("sklearn.linear_model"):
+        return False
+    keys = [k for k in est.get_params() if k == "warm_start" or k.endswith("__warm_start")]
+    est.set_params(**{k: True for k in keys})
+    return bool(keys)
+
+
+def _run_folds(model, X, y, chains, warm_start: bool, incremental: bool):
+    """
+    Fit/score a contiguous run of fold chains in one process.
+
+    The model is reused between the folds of a chain and starts cold at each chain.
+    """
+    out = []
+    for chain in chains:
+        est, fitted_to = None, 0
+        for train, test in chain:
+            t0 = time.perf_counter()
+            if est is None:
+                est = clone(model)
+                if warm_start:
+                    _warm_start(est)
+            if incremental:
+                # expanding window + partial_fit: only feed the rows added since the last fold
+                est.partial_fit(X[fitted_to:train.stop], y[fitted_to:train.stop], classes=np.array([0, 1]))
+            else:
+                est.fit(X[train.start:train.stop], y[train.start:train.stop])
+            fitted_to = train.stop
+            fit_s = time.perf_counter() - t0
+            t1 = time.perf_counter()
+            pred = est.predict(X[test.start:test.stop])
+            out.append({"pred": pred, "fit_seconds": fit_s, "predict_seconds": time.perf_counter() - t1})
+    return out
+
+
+def run_backtest(df: pd.DataFrame, model=None, train_size: int = 500, test_size: int = 60, step: int = None,
+                 mode: str = "expanding", n_jobs: int = 1, features=FEATURE_COLUMNS, long_only: bool = False,
+                 warm_start: bool = True, chain_folds: int = 8) -> dict:
+    """
+    Walk-forward backtest of an up/down classifier on build_features output.
+
+    Folds are grouped into chains of chain_folds consecutive folds. Within a chain the
+    model is reused: estimators with partial_fit are updated with only the new rows
+    (expanding mode), and linear models are refit from the previous coefficients
+    (warm_start); each chain starts from a cold fit. The chains are split into n_jobs
+    contiguous runs, each handled by one worker process, so the results don't depend
+    on n_jobs. Rows with missing features or Return_next are dropped.
+
+    Args:
+        df (pd.DataFrame): Output of build_features (needs features, 'Target', 'Return_next').
+        model: Unfitted sklearn classifier (default: StandardScaler + LogisticRegression).
+        train_size, test_size, step, mode: See walk_forward_folds.
+        n_jobs (int): Worker processes.
+        features (list[str]): Feature columns.
+        long_only (bool): Position is 1/0 for up/down instead of +1/-1.
+        warm_start (bool): Reuse the previous fold's model where the estimator allows it.
+        chain_folds (int): Folds per warm-start chain; also the unit of work split across
+            n_jobs, so at most ceil(folds / chain_folds) workers are used.
+
+    Returns:
+        dict: "predictions" (one row per scored bar: pred, position, pnl, hit),
+        "folds" (per-fold metrics and timings), "summary" (overall metrics),
+        "wall_seconds".
+    """
+    t0 = time.perf_counter()
+    model = model if model is not None else make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000))
+    data = df.dropna(subset=list(features) + ["Return_next"])
+    X = data[list(features)].to_numpy(dtype=np.float64)
+    y = data["Target"].to_numpy()
+    ret = data["Return_next"].to_numpy(dtype=np.float64)
+
+    folds = walk_forward_folds(len(data), train_size, test_size, step, mode)
+    if not folds:
+        raise ValueError(f"Not enough rows ({len(data)}) for train_size={train_size}.")
+    incremental = warm_start and mode == "expanding" and hasattr(model, "partial_fit")
+
+    # chain boundaries depend only on chain_folds, never on n_jobs
+    chain_folds = max(1, chain_folds)
+    chains = [folds[i:i + chain_folds] for i in range(0, len(folds), chain_folds)]
+    n_jobs = max(1, min(n_jobs, len(chains)))
+    runs = [list(r) for r in np.array_split(np.arange(len(chains)), n_jobs) if len(r)]
+    fold_runs = [[chains[i] for i in r] for r in runs]
+    if n_jobs == 1:
+        results = [_run_folds(model, X, y, fold_runs[0], warm_start, incremental)]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as ex:
+            results = list(ex.map(_run_folds, [model] * len(fold_runs), [X] * len(fold_runs),
+                                  [y] * len(fold_runs), fold_runs, [warm_start] * len(fold_runs),
+                                  [incremental] * len(fold_runs)))
+    fold_results = [r for run in results for r in run]
+
+    # vectorized metrics over every out-of-sample bar
+    test_idx = np.concatenate([np.arange(test.start, test.stop) for _, test in folds])
+    fold_id = np.concatenate([np.full(len(test), i) for i, (_, test) in enumerate(folds)])
+    pred = np.concatenate([r["pred"] for r in fold_results]).astype(int)
+    position = pred if long_only else 2 * pred - 1
+    pnl = position * ret[test_idx]
+    hit = pred == y[test_idx]
+
+    predictions = pd.DataFrame({"fold": fold_id, "pred": pred, "position": position, "pnl": pnl, "hit": hit},
+                               index=data.index[test_idx])
+    per_fold = predictions.groupby("fold").agg(rows=("pnl", "size"), hit_rate=("hit", "mean"), pnl=("pnl", "sum"))
+    per_fold["train_rows"] = [len(train) for train, _ in folds]
+    per_fold["fit_seconds"] = [r["fit_seconds"] for r in fold_results]
+    per_fold["predict_seconds"] = [r["predict_seconds"] for r in fold_results]
+
+    equity = np.cumprod(1 + pnl)
+    drawdown = equity / np.maximum.accumulate(equity) - 1
+    std = pnl.std(ddof=1) if len(pnl) > 1 else np.nan
+    wall = time.perf_counter() - t0
+    summary = {
+        "folds": len(folds),
+        "rows_scored": int(len(pnl)),
+        "hit_rate": float(hit.mean()),
+        "total_return": float(equity[-1] - 1),
+        "mean_pnl": float(pnl.mean()),
+        "sharpe_annualized": float(np.sqrt(252) * pnl.mean() / std) if std and std > 0 else np.nan,
+        "max_drawdown": float(drawdown.min()),
+        "n_jobs": n_jobs,
+        "fit_seconds_total": float(per_fold["fit_seconds"].sum()),
+        "wall_seconds": round(wall, 4),
+    }
+    return {"predictions": predictions, "folds": per_fold, "summary": summary, "wall_seconds": wall}
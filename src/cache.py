@@ -0,0 +1,219 @@
+# src/cache.py
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+from .data import download_data
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "cache" / "prices"
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Flat columns + tz-naive datetime 'Date', so frames from different fetches can be merged."""
+    df = df.copy()
+    if isinstance(df.columns, pd.MultiIndex):  # newer yfinance returns (Price, Ticker) columns
+        df.columns = df.columns.get_level_values(0)
+    df.columns.name = None
+    if "Date" not in df.columns:
+        df = df.reset_index().rename(columns={"index": "Date"})
+    df["Date"] = pd.to_datetime(df["Date"])
+    if df["Date"].dt.tz is not None:
+        df["Date"] = df["Date"].dt.tz_localize(None)
+    return df
+
+
+def _write_atomic(target: Path, write) -> None:
+    # temp name unique per process and thread: prefork workers can share one cache dir
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+class PriceCache:
+    """
+    Persistent, range-aware cache in front of download_data.
+
+    Each ticker is stored as one Parquet file plus a small JSON index recording
+    the contiguous [start, end) date range already fetched. A request only
+    downloads the missing head and/or tail segment and merges it in. A segment
+    that comes back empty is not recorded as covered (yfinance also returns an
+    empty frame when a download fails), so it is asked for again next time. Recently
+    used tickers are also kept in an in-memory LRU bounded by `max_memory_bytes`.
+
+    Args:
+        cache_dir: Where to keep the files (default: $PRICE_CACHE_DIR or data/cache/prices).
+        fetch: Callable with download_data's signature; swap in a fake for offline use.
+        max_memory_bytes (int): Byte budget for the in-memory LRU.
+    """
+
+    def __init__(self, cache_dir=None, fetch=download_data, max_memory_bytes: int = 256 * 2**20):
+        self.cache_dir = Path(cache_dir or os.getenv("PRICE_CACHE_DIR", DEFAULT_CACHE_DIR))
+        self.fetch = fetch
+        self.max_memory_bytes = max_memory_bytes
+        self._mem = OrderedDict()  # key -> (frame, covered, nbytes)
+        self._mem_bytes = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "fetches": 0}
+
+    def get(self, ticker: str, start: str, end: str = None, auto_adjust: bool = True) -> pd.DataFrame:
+        """
+        Same contract as download_data: Date + OHLCV rows with start <= Date < end.
+
+        end=None means "up to today" (today itself is never marked as cached, since
+        its bar may still change).
+        """
+        key = (ticker.upper(), bool(auto_adjust))
+        s = pd.Timestamp(start).normalize()
+        e = pd.Timestamp(end).normalize() if end else pd.Timestamp.today().normalize()
+
+        with self._lock_for(key):
+            df, covered = self._load(key)
+            missing = []
+            if covered is None:
+                missing.append((s, e))
+            else:
+                cs, ce = covered
+                if s < cs:
+                    missing.append((s, cs))  # also bridges a gap when the request ends before cs
+                if e > ce:
+                    missing.append((ce, e))
+
+            if missing:
+                fetched = []
+                lo, hi = covered or (None, None)
+                for a, b in missing:
+                    self.stats["fetches"] += 1
+                    got = self.fetch(key[0], start=a.strftime("%Y-%m-%d"), end=b.strftime("%Y-%m-%d"),
+                                     auto_adjust=auto_adjust)
+                    if got is None or not len(got):
+                        continue  # leave the segment uncovered so it is retried
+                    fetched.append(_normalize(got))
+                    # each segment borders the covered range, so the union stays contiguous
+                    lo, hi = (a, b) if lo is None else (min(lo, a), max(hi, b))
+                if fetched:
+                    parts = [df, *fetched] if df is not None else fetched
+                    df = (pd.concat(parts, ignore_index=True)
+                            .drop_duplicates(subset="Date", keep="last")
+                            .sort_values("Date", ignore_index=True))
+                    covered = (lo, hi)
+                    self._save(key, df, covered)
+                elif df is None:
+                    return pd.DataFrame(columns=["Date"])
+            self._remember(key, df, covered)
+
+        out = df[(df["Date"] >= s) & (df["Date"] < e)]
+        return out.reset_index(drop=True)
+
+    # ---- storage ---------------------------------------------------------
+
+    def _paths(self, key):
+        ticker, adjusted = key
+        stem = ticker if adjusted else f"{ticker}_raw"
+        return self.cache_dir / f"{stem}.parquet", self.cache_dir / f"{stem}.json"
+
+    def _lock_for(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _load(self, key):
+        with self._lock:
+            if key in self._mem:
+                self._mem.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                df, covered, _ = self._mem[key]
+                return df, covered
+        data_path, index_path = self._paths(key)
+        if not (data_path.exists() and index_path.exists()):
+            return None, None
+        idx = json.loads(index_path.read_text())
+        self.stats["disk_hits"] += 1
+        return pd.read_parquet(data_path), (pd.Timestamp(idx["start"]), pd.Timestamp(idx["end"]))
+
+    def _save(self, key, df, covered):
+        data_path, index_path = self._paths(key)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        index = {"start": covered[0].strftime("%Y-%m-%d"), "end": covered[1].strftime("%Y-%m-%d"), "rows": len(df)}
+        # write-then-rename so a crash never leaves a half-written file behind; the data goes
+        # first, so a reader never sees an index covering rows the data file doesn't have yet
+        _write_atomic(data_path, lambda tmp: df.to_parquet(tmp, index=False))
+        _write_atomic(index_path, lambda tmp: tmp.write_text(json.dumps(index, indent=2)))
+
+    def _remember(self, key, df, covered):
+        nbytes = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            if key in self._mem:
+                self._mem_bytes -= self._mem.pop(key)[2]
+            self._mem[key] = (df, covered, nbytes)
+            self._mem_bytes += nbytes
+            # evict least recently used, but always keep the entry just added
+            while self._mem_bytes > self.max_memory_bytes and len(self._mem) > 1:
+                _, (_, _, freed) = self._mem.popitem(last=False)
+                self._mem_bytes -= freed
+
+    def clear_memory(self) -> None:
+        """Drop the in-memory LRU (files on disk are kept)."""
+        with self._lock:
+            self._mem.clear()
+            self._mem_bytes = 0
+
+
+class ResponseCache:
+    """
+    In-memory cache of rendered response bodies with a TTL and a byte budget.
+
+    Each entry gets a strong ETag (sha1 of the body) so clients can revalidate with
+    If-None-Match and receive a 304 instead of the image.
+
+    Args:
+        ttl (float): Seconds an entry stays fresh.
+        max_bytes (int): Total body size kept; least recently used entries go first.
+    """
+
+    def __init__(self, ttl: float = 300, max_bytes: int = 64 * 2**20):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (body, etag, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, key):
+        """(body, etag) if a fresh entry exists, else None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[2] < time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[0], entry[1]
+
+    def put(self, key, body: bytes) -> str:
+        """Store a body and return its ETag."""
+        etag = hashlib.sha1(body).hexdigest()
+        if len(body) > self.max_bytes:
+            return etag
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (body, etag, time.monotonic() + self.ttl)
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+        return etag
+
+    def _drop(self, key):
+        body, _, _ = self._entries.pop(key)
+        self._bytes -= len(body)
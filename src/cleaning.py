@@ -6,6 +6,11 @@
 
 # src/cleaning.py
 
+import json
+import warnings
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 from sklearn.preprocessing import MinMaxScaler
 
@@ -40,5 +45,143 @@ def normalize_data(df: pd.DataFrame, columns: list) -> pd.DataFrame:
 # In[ ]:
 
 
+class CleaningPipeline:
+    """
+    Fused version of drop_missing / fill_missing_median / normalize_data.
+
+    Steps are declared up front, then fit() computes every statistic they need in
+    one pass over the numeric block (missing ratios, medians, min/max) and
+    transform() applies them all in one vectorized pass, in place where possible.
+    The fitted statistics can be saved so inference-time transforms never refit.
+
+    Median filling and min-max scaling commute (the median of a rescaled column is
+    the rescaled median), so only a drop step's position matters: a fill declared
+    before it means filled columns no longer count as missing.
+
+    Usage:
+        pipe = CleaningPipeline().drop_missing(0.5).fill_missing_median(cols).normalize(cols)
+        train = pipe.fit_transform(train)
+        pipe.save("cleaning.json")
+        live = CleaningPipeline.load("cleaning.json").transform(live)
+    """
+
+    def __init__(self, float32: bool = False):
+        self.steps = []
+        self.float32 = float32
+        self.dropped_ = None
+        self.medians_ = None
+        self.minmax_ = None
+
+    # ---- declaring steps ----
+    def drop_missing(self, threshold: float = 0.5) -> "CleaningPipeline":
+        self.steps.append(("drop_missing", threshold))
+        return self
+
+    def fill_missing_median(self, columns: list) -> "CleaningPipeline":
+        self.steps.append(("fill_missing_median", list(columns)))
+        return self
+
+    def normalize(self, columns: list) -> "CleaningPipeline":
+        self.steps.append(("normalize", list(columns)))
+        return self
+
+    # ---- fitting ----
+    def fit(self, df: pd.DataFrame) -> "CleaningPipeline":
+        fill_cols = [c for name, arg in self.steps if name == "fill_missing_median" for c in arg if c in df.columns]
+        norm_cols = [c for name, arg in self.steps if name == "normalize" for c in arg if c in df.columns]
+        block_cols = list(dict.fromkeys(fill_cols + norm_cols))
+
+        # single pass over the numeric block for all per-column statistics
+        block = df[block_cols].to_numpy(dtype=np.float64)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns -> NaN stats
+            med = np.nanmedian(block, axis=0) if block.size else np.empty(0)
+            lo = np.nanmin(block, axis=0) if block.size else np.empty(0)
+            hi = np.nanmax(block, axis=0) if block.size else np.empty(0)
+        medians = dict(zip(block_cols, med.tolist()))
+
+        dropped, filled_so_far = set(), set()
+        for name, arg in self.steps:
+            if name == "fill_missing_median":
+                filled_so_far.update(c for c in arg if c in df.columns and not np.isnan(medians[c]))
+            elif name == "drop_missing":
+                ratio = df.isnull().mean()
+                ratio[ratio.index.isin(filled_so_far)] = 0.0
+                dropped.update(ratio[ratio > arg].index)
+
+        self.dropped_ = [c for c in df.columns if c in dropped]
+        self.medians_ = {c: medians[c] for c in dict.fromkeys(fill_cols) if c not in dropped}
+        self.minmax_ = {c: (lo[block_cols.index(c)].item(), hi[block_cols.index(c)].item())
+                        for c in dict.fromkeys(norm_cols) if c not in dropped}
+        return self
+
+    # ---- applying ----
+    def transform(self, df: pd.DataFrame, copy: bool = False) -> pd.DataFrame:
+        """Apply the fitted steps. With copy=False the input frame is modified in place."""
+        if self.dropped_ is None:
+            raise RuntimeError("CleaningPipeline is not fitted; call fit() or load() first.")
+        if copy:
+            df = df.copy()
+        drop = [c for c in self.dropped_ if c in df.columns]
+        if drop:
+            df.drop(columns=drop, inplace=True)
+
+        cols = list(dict.fromkeys([*self.medians_, *self.minmax_]))
+        if not cols:
+            return df
+        dtype = np.float32 if self.float32 else np.float64
+        block = df[cols].to_numpy(dtype=dtype, copy=True)
+
+        fill = np.array([self.medians_.get(c, np.nan) for c in cols], dtype=dtype)
+        np.copyto(block, fill, where=np.isnan(block) & ~np.isnan(fill))
+
+        # same arithmetic as MinMaxScaler: X * scale + (-min * scale), zero range -> scale 1
+        scale = np.ones(len(cols), dtype=np.float64)
+        offset = np.zeros(len(cols), dtype=np.float64)
+        for i, c in enumerate(cols):
+            if c in self.minmax_:
+                lo, hi = self.minmax_[c]
+                rng = hi - lo
+                scale[i] = 1.0 / rng if rng != 0 else 1.0
+                offset[i] = -lo * scale[i]
+        block *= scale.astype(dtype)
+        block += offset.astype(dtype)
+
+        df[cols] = block
+        return df
+
+    def fit_transform(self, df: pd.DataFrame, copy: bool = False) -> pd.DataFrame:
+        return self.fit(df).transform(df, copy=copy)
+
+    # ---- persistence ----
+    def to_dict(self) -> dict:
+        return {
+            "steps": [list(s) for s in self.steps],
+            "float32": self.float32,
+            "dropped": self.dropped_,
+            "medians": self.medians_,
+            "minmax": self.minmax_,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "CleaningPipeline":
+        pipe = cls(float32=d.get("float32", False))
+        pipe.steps = [tuple(s) for s in d["steps"]]
+        pipe.dropped_ = d["dropped"]
+        pipe.medians_ = d["medians"]
+        pipe.minmax_ = {c: tuple(v) for c, v in d["minmax"].items()} if d["minmax"] is not None else None
+        return pipe
+
+    def save(self, path) -> None:
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2))
+
+    @classmethod
+    def load(cls, path) -> "CleaningPipeline":
+        return cls.from_dict(json.loads(Path(path).read_text()))
+
+
+# In[ ]:
+
+
 
 
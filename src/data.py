@@ -1,5 +1,9 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import pandas as pd
-import yfinance as yf
 
 def download_data(ticker: str, start: str, end: str, auto_adjust: bool = True) -> pd.DataFrame:
     """
@@ -15,7 +19,80 @@ def download_data(ticker: str, start: str, end: str, auto_adjust: bool = True) -
         pd.DataFrame: DataFrame with Date + OHLCV data.
     """
 
+    import yfinance as yf  # deferred: only processes that actually download pay for importing it
     df = yf.download(ticker, start=start, end=end, auto_adjust=auto_adjust, progress=False)
     return df.reset_index()  # gives a 'Date' column
-    
-    
\ No newline at end of file
+
+
+class _RateLimiter:
+    """Spaces call starts at least 1/rate seconds apart across threads."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self.lock = threading.Lock()
+        self.next_at = 0.0
+
+    def wait(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            at = max(now, self.next_at)
+            self.next_at = at + self.interval
+        if at > now:
+            time.sleep(at - now)
+
+
+def download_many(tickers, start: str, end: str, max_workers: int = 8, rate_limit: float = None,
+                  retries: int = 3, backoff: float = 0.5, auto_adjust: bool = True,
+                  fetch=None, stats: dict = None):
+    """
+    Download many tickers concurrently, yielding each frame as soon as it arrives.
+
+    Args:
+        tickers (list[str]): Tickers to fetch.
+        start (str): Start date (YYYY-MM-DD).
+        end (str): End date (YYYY-MM-DD).
+        max_workers (int): Maximum number of downloads in flight.
+        rate_limit (float | None): Maximum download starts per second (None = unlimited).
+        retries (int): Extra attempts per ticker after a failure.
+        backoff (float): Base delay in seconds; attempt n waits backoff * 2**n (plus jitter).
+        auto_adjust (bool): Passed through to the fetch function.
+        fetch: Callable with download_data's signature (default: download_data).
+            Swap in a stub to benchmark or test offline.
+        stats (dict | None): Filled in place with {ticker: {"ok", "attempts", "seconds", "rows", "error"}}.
+
+    Yields:
+        tuple[str, pd.DataFrame]: (ticker, frame) in completion order. Tickers that still
+        fail after all retries are not yielded; see `stats` for their errors.
+    """
+    fetch = fetch or download_data
+    stats = {} if stats is None else stats
+    limiter = _RateLimiter(rate_limit) if rate_limit else None
+
+    def _one(ticker):
+        t0 = time.perf_counter()
+        for attempt in range(retries + 1):
+            if limiter:
+                limiter.wait()
+            try:
+                df = fetch(ticker, start=start, end=end, auto_adjust=auto_adjust)
+                stats[ticker] = {"ok": True, "attempts": attempt + 1, "seconds": time.perf_counter() - t0,
+                                 "rows": len(df), "error": None}
+                return df
+            except Exception as e:
+                error = e
+                if attempt < retries:
+                    time.sleep(backoff * 2 ** attempt + random.uniform(0, backoff))
+        stats[ticker] = {"ok": False, "attempts": retries + 1, "seconds": time.perf_counter() - t0,
+                         "rows": 0, "error": repr(error)}
+        return None
+
+    ex = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {ex.submit(_one, t): t for t in tickers}
+        for fut in as_completed(futures):
+            df = fut.result()
+            if df is not None:
+                yield futures[fut], df
+    finally:
+        # stopping the iteration early drops downloads that have not started yet
+        ex.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,188 @@
+# src/encoding.py
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+class CodeTable:
+    """
+    Compiled categorical code table, e.g. for the German credit data's A-codes.
+
+    Each column's mapping {"A11": "<0", "A12": "0<= <200", ...} is compiled once
+    into a pd.Index of its codes. A whole column is encoded by factorizing it and
+    looking up only its distinct values in that index, instead of mapping every
+    value through a dict and re-factorizing the labels into a categorical.
+
+    Single values at serve time (code()) map to the number the model was trained
+    on, which is the position unless `values` says otherwise (see from_aligned).
+
+    Args:
+        maps (dict[str, dict[str, str]]): Column -> {code: label}; the order of each
+            dict defines the integer codes 0..k-1.
+        values (dict[str, dict[str, float]] | None): Column -> {code: model value}
+            for columns whose model encoding is not the position.
+    """
+
+    def __init__(self, maps: dict, values: dict = None):
+        self.maps = {col: dict(m) for col, m in maps.items()}
+        self.values = {col: dict(v) for col, v in (values or {}).items()}
+        unknown = set(self.values) - set(self.maps)
+        if unknown:
+            raise ValueError(f"Values given for columns without codes: {sorted(unknown)}.")
+        self._index, self._by_string = {}, {}
+        for col, m in self.maps.items():
+            codes = list(m)
+            self._index[col] = pd.Index(codes)
+            value = self.values.get(col) or {c: i for i, c in enumerate(codes)}
+            if set(value) != set(codes):
+                raise ValueError(f"Values for '{col}' must cover exactly its codes {codes}.")
+            # for single values at serve time: both the raw code and the readable label
+            self._by_string[col] = {**{c: value[c] for c in codes},
+                                    **{label: value[c] for c, label in m.items()}}
+
+    @classmethod
+    def from_aligned(cls, raw: pd.DataFrame, encoded: pd.DataFrame, maps: dict) -> "CodeTable":
+        """
+        Code table reproducing an existing numeric encoding of the same rows.
+
+        `raw` holds the A-codes (e.g. german.data) and `encoded` the same rows as
+        numbers (e.g. german.data-numeric, with the model's column names). A column
+        of `maps` gets an entry when the encoded column of the same name is a
+        one-to-one recoding of it: its own labels and the numbers actually used
+        (A11 -> 1, ..., A14 -> 4). Columns whose encoded counterpart is missing or
+        holds something else (amounts, one-hot indicators) get no entry, so strings
+        sent for them are rejected.
+        """
+        if len(raw) != len(encoded):
+            raise ValueError(f"raw and encoded must hold the same rows, got {len(raw)} and {len(encoded)}.")
+        table_maps, values = {}, {}
+        for col, m in maps.items():
+            if col not in encoded.columns:
+                continue
+            pairs = pd.DataFrame({"code": raw[col].to_numpy(), "value": encoded[col].to_numpy()}).drop_duplicates()
+            one_to_one = pairs["code"].is_unique and pairs["value"].is_unique and len(pairs) > 1
+            if one_to_one and set(pairs["code"]) <= set(m):
+                seen = dict(zip(pairs["code"], pairs["value"].tolist()))
+                table_maps[col] = {c: label for c, label in m.items() if c in seen}
+                values[col] = {c: seen[c] for c in table_maps[col]}
+        return cls(table_maps, values)
+
+    @property
+    def columns(self) -> list:
+        return list(self.maps)
+
+    def categories(self, col: str) -> list:
+        """Readable labels of a column, in code order."""
+        return list(self.maps[col].values())
+
+    def encode(self, col: str, values) -> np.ndarray:
+        """Integer codes (int16, -1 for unknown or missing) for an array of raw codes like 'A43'."""
+        if not hasattr(values, "dtype"):
+            values = np.asarray(values, dtype=object)
+        codes, uniques = pd.factorize(values)
+        # position of each distinct value, plus a trailing -1 that missing values (code -1) pick up
+        positions = np.append(self._index[col].get_indexer(uniques), -1).astype(np.int16)
+        return positions[codes]
+
+    def encode_frame(self, df: pd.DataFrame, as_category: bool = True) -> pd.DataFrame:
+        """
+        Encode every table column present in df.
+
+        as_category=True gives pandas categoricals with the readable labels (unknown
+        codes become NaN); False gives the raw int16 codes.
+        """
+        df = df.copy()
+        for col in self.columns:
+            if col in df.columns:
+                codes = self.encode(col, df[col])
+                df[col] = pd.Categorical.from_codes(codes, self.categories(col)) if as_category else codes
+        return df
+
+    def code(self, col: str, value) -> float:
+        """Model value for one raw code ('A43') or label ('radio_tv'); numbers pass through."""
+        if isinstance(value, str):
+            try:
+                return self._by_string[col][value]
+            except KeyError:
+                raise ValueError(f"Unknown value '{value}' for '{col}'.")
+        return value
+
+    def to_dict(self) -> dict:
+        return {"columns": self.maps, "values": self.values}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "CodeTable":
+        return cls(d["columns"], d.get("values"))
+
+    def save(self, path) -> None:
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2))
+
+    @classmethod
+    def load(cls, path) -> "CodeTable":
+        return cls.from_dict(json.loads(Path(path).read_text()))
+
+
+class RowEncoder:
+    """
+    Turns a /predict payload into one float64 feature row without building a DataFrame.
+
+    The feature order and the code-table column of each slot are resolved once;
+    each call fills a preallocated per-thread (1, n_features) buffer and returns it,
+    so the row is only valid until the same thread encodes the next payload.
+
+    Args:
+        feature_names (list[str]): Model feature order.
+        code_table (CodeTable | None): Lets categorical slots accept codes or labels.
+    """
+
+    def __init__(self, feature_names, code_table: CodeTable = None):
+        self.feature_names = list(feature_names)
+        self.index = {name: i for i, name in enumerate(self.feature_names)}
+        self.categorical = {} if code_table is None else \
+            {i: name for i, name in enumerate(self.feature_names) if name in code_table.maps}
+        self.code_table = code_table
+        self._local = threading.local()
+
+    def _buffer(self) -> np.ndarray:
+        buf = getattr(self._local, "row", None)
+        if buf is None:
+            buf = self._local.row = np.zeros((1, len(self.feature_names)), dtype=np.float64)
+        return buf
+
+    def _value(self, i, value) -> float:
+        if isinstance(value, str):
+            if i in self.categorical:
+                return self.code_table.code(self.categorical[i], value)
+            try:
+                return float(value)
+            except ValueError:
+                raise ValueError(f"Expected a number for '{self.feature_names[i]}', got '{value}'.")
+        if value is None or isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"Invalid value for '{self.feature_names[i]}': {value!r}.")
+        return value
+
+    def encode(self, payload) -> np.ndarray:
+        """
+        (1, n_features) row from a dict (missing features default to 0, unknown keys
+        are ignored) or a list in feature order.
+        """
+        if payload is None:
+            raise ValueError("Missing 'features' in JSON body.")
+        row = self._buffer()
+        if isinstance(payload, dict):
+            row[0, :] = 0.0
+            for name, value in payload.items():
+                i = self.index.get(name)
+                if i is not None:
+                    row[0, i] = self._value(i, value)
+        elif isinstance(payload, list):
+            if len(payload) != len(self.feature_names):
+                raise ValueError(f"Expected {len(self.feature_names)} values, got {len(payload)}.")
+            for i, value in enumerate(payload):
+                row[0, i] = self._value(i, value)
+        else:
+            raise ValueError("Invalid 'features' type; must be object or array.")
+        return row
@@ -0,0 +1,246 @@
+# src/fast_scorer.py
+import logging
+import threading
+
+import numpy as np
+from scipy.special import expit  # the same ufunc sklearn's LogisticRegression.predict_proba uses
+
+from .metrics import stage
+from .serving import predict_rows
+
+_LINEAR_CLASSIFIERS = {"LogisticRegression"}
+_LINEAR_REGRESSORS = {"LinearRegression", "Ridge", "Lasso", "ElasticNet"}
+_TREE_CLASSIFIERS = {"DecisionTreeClassifier", "ExtraTreeClassifier", "RandomForestClassifier", "ExtraTreesClassifier"}
+_TREE_REGRESSORS = {"DecisionTreeRegressor", "ExtraTreeRegressor", "RandomForestRegressor", "ExtraTreesRegressor"}
+
+
+class _Buffers(threading.local):
+    """Per-thread scratch arrays, grown on demand and reused across requests."""
+
+    def get(self, name, n_rows, n_cols, dtype):
+        buf = self.__dict__.get(name)
+        if buf is None or buf.shape[0] < n_rows or buf.shape[1] != n_cols:
+            buf = self.__dict__[name] = np.empty((max(n_rows, 16), n_cols), dtype=dtype)
+        return buf[:n_rows]
+
+
+def _compile_imputer(imputer):
+    """(fill values, kept column indices or None) reproducing SimpleImputer.transform on NaNs."""
+    if imputer is None:
+        return None, None
+    if type(imputer).__name__ != "SimpleImputer" or getattr(imputer, "add_indicator", False):
+        return False
+    if not (isinstance(imputer.missing_values, float) and np.isnan(imputer.missing_values)):
+        return False
+    stats = np.asarray(imputer.statistics_, dtype=np.float64)
+    invalid = np.isnan(stats)
+    if invalid.any() and not getattr(imputer, "keep_empty_features", False):
+        # sklearn drops all-missing columns instead of filling them
+        return np.where(invalid, 0.0, stats), np.flatnonzero(~invalid)
+    return np.where(invalid, 0.0, stats), None
+
+
+def _compile_trees(estimators, classifier: bool):
+    """Concatenate fitted trees into flat node arrays so all of them are walked at once."""
+    left, right, feature, threshold, missing_left, value, roots = [], [], [], [], [], [], []
+    offset, depth = 0, 0
+    for est in estimators:
+        t = est.tree_
+        if t.n_outputs != 1 or (classifier and t.value.shape[2] != 2):
+            return None
+        n = t.node_count
+        is_leaf = t.children_left == -1
+        nodes = np.arange(n)
+        # leaves point at themselves, so extra steps past a shallow leaf are no-ops
+        left.append(np.where(is_leaf, nodes, t.children_left) + offset)
+        right.append(np.where(is_leaf, nodes, t.children_right) + offset)
+        feature.append(np.where(is_leaf, 0, t.feature))
+        threshold.append(t.threshold)
+        missing_left.append(np.asarray(getattr(t, "missing_go_to_left", np.zeros(n)), dtype=bool))
+        v = t.value[:, 0, :]
+        if classifier:
+            total = v.sum(axis=1)
+            # sklearn >= 1.4 stores class fractions; older versions store counts and normalize at predict
+            if not np.allclose(total[is_leaf], 1.0):
+                total[total == 0] = 1
+                v = v / total[:, None]
+            value.append(v[:, 1])
+        else:
+            value.append(v[:, 0])
+        roots.append(offset)
+        offset += n
+        depth = max(depth, t.max_depth)
+    return {
+        "left": np.concatenate(left), "right": np.concatenate(right),
+        "feature": np.concatenate(feature), "threshold": np.concatenate(threshold),
+        "missing_left": np.concatenate(missing_left), "value": np.concatenate(value),
+        "roots": np.asarray(roots), "depth": depth,
+    }
+
+
+class FastScorer:
+    """
+    NumPy-only replacement for imputer.transform + model.predict_proba/predict.
+
+    Built by compile_scorer from the fitted objects: the imputer becomes a fill
+    vector, a StandardScaler becomes mean/scale arrays, a linear model becomes a
+    dot product and tree ensembles become flat node arrays walked for all trees in
+    one vectorized loop. The operations are the ones sklearn performs (same dtypes,
+    same order of accumulation), minus its per-call input validation.
+
+    Calling it returns the same list of result dicts as predict_rows.
+    """
+
+    def __init__(self, kind, fill, keep, scale_steps, params, threshold, n_features):
+        self.kind = kind  # "linear_proba" | "linear" | "tree_proba" | "tree"
+        self.fill, self.keep = fill, keep
+        self.scale_steps = scale_steps
+        self.params = params
+        self.threshold = threshold
+        self.n_features = n_features
+        self._buf = _Buffers()
+
+    def raw(self, X: np.ndarray) -> np.ndarray:
+        """Positive-class probability (classifiers) or prediction (regressors) per row."""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features per row, got {X.shape[-1]}.")
+        if np.isinf(X).any():
+            raise ValueError("Input X contains infinity or a value too large for dtype('float64').")
+        with stage("impute"):
+            Z = self._buf.get("x", X.shape[0], X.shape[1], np.float64)
+            np.copyto(Z, X)
+            if self.fill is not None:
+                np.copyto(Z, self.fill, where=np.isnan(Z))
+                if self.keep is not None:
+                    Z = Z[:, self.keep]
+
+        with stage("predict"):
+            for mean, scale in self.scale_steps:
+                if mean is not None:
+                    Z -= mean
+                if scale is not None:
+                    Z /= scale
+            p = self.params
+            if self.kind.startswith("linear"):
+                z = (Z @ p["coef_T"] + p["intercept"]).reshape(-1)
+                return expit(z, out=z) if self.kind == "linear_proba" else z
+            return self._walk_trees(Z)
+
+    def __call__(self, X: np.ndarray) -> list:
+        out = self.raw(X)
+        if self.kind.endswith("proba"):
+            return [{"proba_up": round(float(v), 6), "pred_up": int(v >= self.threshold)} for v in out]
+        return [{"prediction": float(v)} for v in out]
+
+    def _walk_trees(self, Z):
+        p = self.params
+        n, roots = Z.shape[0], p["roots"]
+        # sklearn compares float32 features against float64 thresholds
+        Xf = self._buf.get("x32", n, Z.shape[1], np.float32)
+        np.copyto(Xf, Z, casting="unsafe")
+        rows = np.repeat(np.arange(n), len(roots))
+        node = np.tile(roots, n)
+        for _ in range(p["depth"]):
+            x = Xf[rows, p["feature"][node]]
+            go_left = np.where(np.isnan(x), p["missing_left"][node], x <= p["threshold"][node])
+            node = np.where(go_left, p["left"][node], p["right"][node])
+        leaf = p["value"][node].reshape(n, len(roots))
+        if not p["forest"]:
+            return leaf[:, 0].copy()
+        # accumulate tree by tree, in estimator order, exactly like the forest's predict
+        acc = np.zeros(n)
+        for t in range(len(roots)):
+            acc += leaf[:, t]
+        acc /= len(roots)
+        return acc
+
+
+def _probe_rows(fill, n_features, trees=None, n: int = 256, seed: int = 0):
+    """Rows around the imputer's statistics, with NaNs and values sitting exactly on tree split thresholds."""
+    rng = np.random.default_rng(seed)
+    base = fill if fill is not None else np.zeros(n_features)
+    X = base + rng.normal(size=(n, n_features)) * np.maximum(np.abs(base), 1.0)
+    X[rng.random(X.shape) < 0.05] = np.nan
+    if trees is not None:
+        split = np.flatnonzero(trees["left"] != np.arange(len(trees["left"])))
+        if len(split):
+            pick = rng.choice(split, size=n // 2)
+            rows = rng.integers(0, n, size=n // 2)
+            X[rows, trees["feature"][pick]] = trees["threshold"][pick]
+    return X
+
+
+def compile_scorer(model, imputer, meta=None, verify: bool = True):
+    """
+    Compile fitted artifacts into a FastScorer, or return None if unsupported.
+
+    Supported: a SimpleImputer (NaN missing values, no indicator) followed by a
+    model or Pipeline of StandardScaler steps ending in LogisticRegression (binary),
+    a linear regressor, or a decision tree / random forest / extra trees
+    (classifier with 2 classes or single-output regressor).
+
+    With verify=True (default) the scorer is run against the sklearn path on
+    probe rows, including NaNs and values exactly on tree thresholds; if any
+    result differs, a warning is logged and None is returned so callers keep
+    using predict_rows.
+
+    LazyArtifact proxies (load_artifacts(..., lazy=True)) are loaded here, since
+    compiling needs the fitted parameters.
+    """
+    from .io import unwrap  # joblib only when compiling
+
+    model, imputer = unwrap(model), unwrap(imputer)
+    imp = _compile_imputer(imputer)
+    if imp is False:
+        return None
+    fill, keep = imp
+
+    steps = list(model.steps) if hasattr(model, "steps") else [("model", model)]
+    scale_steps = []
+    for _, step in steps[:-1]:
+        if type(step).__name__ != "StandardScaler":
+            return None
+        scale_steps.append((step.mean_ if step.with_mean else None, step.scale_ if step.with_std else None))
+    est = steps[-1][1]
+    name = type(est).__name__
+    threshold = (meta or {}).get("threshold", 0.5)
+    trees = None
+
+    if name in _LINEAR_CLASSIFIERS:
+        if len(est.classes_) != 2:
+            return None
+        kind, params = "linear_proba", {"coef_T": est.coef_.T, "intercept": est.intercept_}
+    elif name in _LINEAR_REGRESSORS:
+        if np.ndim(est.coef_) != 1:
+            return None
+        kind, params = "linear", {"coef_T": est.coef_.T, "intercept": est.intercept_}
+    elif name in _TREE_CLASSIFIERS | _TREE_REGRESSORS:
+        classifier = name in _TREE_CLASSIFIERS
+        if classifier and len(est.classes_) != 2:
+            return None
+        forest = hasattr(est, "estimators_")
+        trees = _compile_trees(est.estimators_ if forest else [est], classifier)
+        if trees is None:
+            return None
+        kind, params = ("tree_proba" if classifier else "tree"), {**trees, "forest": forest}
+    else:
+        return None
+
+    n_features = len(fill) if fill is not None else getattr(model, "n_features_in_", None)
+    if n_features is None:
+        return None
+    scorer = FastScorer(kind, fill, keep, scale_steps, params, threshold, n_features)
+
+    if verify:
+        X = _probe_rows(fill, n_features, trees)
+        ok = False
+        try:
+            ok = scorer(X) == predict_rows(model, imputer, meta, X) and all(
+                scorer([row]) == predict_rows(model, imputer, meta, row[None, :]) for row in X[:8])
+        except Exception as e:
+            logging.warning("[fast_scorer] verification failed for %s: %s", name, e)
+        if not ok:
+            logging.warning("[fast_scorer] %s results differ from sklearn; using the sklearn path", name)
+            return None
+    return scorer
@@ -0,0 +1,177 @@
+# src/feature_store.py
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .features import FEATURE_COLUMNS
+
+DEFAULT_STORE_DIR = Path(__file__).resolve().parent.parent / "data" / "features"
+
+
+def _dates_ns(df: pd.DataFrame) -> np.ndarray:
+    dates = df["Date"] if "Date" in df.columns else df.index
+    return pd.DatetimeIndex(pd.to_datetime(dates)).as_unit("ns").asi8
+
+
+class FeatureStore:
+    """
+    On-disk store of FEATURE_COLUMNS per ticker as contiguous float32 column files.
+
+    Layout: <root>/<TICKER>/dates.i8 (int64 ns timestamps, ascending),
+    <root>/<TICKER>/<column>.f4 (one raw float32 array per feature) and meta.json
+    (row count + columns). Reads memory-map the files, so slicing a date range
+    binary-searches the dates and only touches the pages of the rows returned.
+    Appends write raw bytes to the end of each file and bump the row count last,
+    so a crash mid-append leaves the previous rows intact.
+
+    Every memory map keeps a file descriptor open (1 + len(columns) per ticker),
+    so only the `max_open` most recently read tickers stay mapped; older ones are
+    dropped and re-mapped on their next read.
+
+    Args:
+        root: Store directory (default: $FEATURE_STORE_DIR or data/features).
+        columns (list[str]): Feature columns to keep (default FEATURE_COLUMNS).
+        max_open (int | None): Tickers kept mapped at once (default: $FEATURE_STORE_MAX_OPEN or 64).
+    """
+
+    def __init__(self, root=None, columns=FEATURE_COLUMNS, max_open: int = None):
+        self.root = Path(root or os.getenv("FEATURE_STORE_DIR", DEFAULT_STORE_DIR))
+        self.columns = list(columns)
+        self.max_open = max(1, int(max_open or os.getenv("FEATURE_STORE_MAX_OPEN", 64)))
+        self._maps = OrderedDict()  # ticker -> (rows, dates memmap, {col: memmap}, file key), least recent first
+        self._lock = threading.Lock()
+
+    def tickers(self) -> list:
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if (p / "meta.json").exists())
+
+    def rows(self, ticker: str) -> int:
+        meta = self._meta_path(ticker)
+        return json.loads(meta.read_text())["rows"] if meta.exists() else 0
+
+    # ---- writing ----
+    def write(self, ticker: str, df: pd.DataFrame) -> None:
+        """Replace a ticker's history with the features in df (needs 'Date' column or DatetimeIndex)."""
+        d = self._dir(ticker)
+        d.mkdir(parents=True, exist_ok=True)
+        self._set_rows(ticker, 0)
+        with self._lock:
+            self._maps.pop(ticker.upper(), None)
+        for f in d.glob("*.[fi][48]"):
+            f.unlink()
+        self.append(ticker, df)
+
+    def append(self, ticker: str, df: pd.DataFrame) -> int:
+        """Append rows newer than the stored ones; returns the new row count."""
+        if df.empty:
+            return self.rows(ticker)
+        dates = _dates_ns(df)
+        if np.any(np.diff(dates) <= 0):
+            raise ValueError("Dates must be strictly increasing.")
+        d = self._dir(ticker)
+        d.mkdir(parents=True, exist_ok=True)
+        n = self.rows(ticker)
+        if n:
+            last = self._open(ticker)[1][-1]
+            if dates[0] <= last:
+                raise ValueError(f"Can only append rows after {pd.Timestamp(last)}; got {pd.Timestamp(dates[0])}.")
+
+        values = df[self.columns].to_numpy(dtype=np.float32)
+        files = [(d / "dates.i8", dates.astype("<i8"))] + \
+                [(d / f"{c}.f4", np.ascontiguousarray(values[:, i]).astype("<f4")) for i, c in enumerate(self.columns)]
+        for path, arr in files:
+            with open(path, "r+b" if path.exists() else "wb") as f:
+                f.truncate(n * arr.itemsize)  # drop any tail left by an interrupted append
+                f.seek(0, os.SEEK_END)
+                f.write(arr.tobytes())
+        self._set_rows(ticker, n + len(df))
+        return n + len(df)
+
+    # ---- reading ----
+    def columns_view(self, ticker: str, start=None, end=None) -> tuple:
+        """Zero-copy (dates, {column: float32 view}) for start <= Date < end."""
+        _, dates, cols, _ = self._open(ticker)
+        lo, hi = self._bounds(dates, start, end)
+        return dates[lo:hi], {c: m[lo:hi] for c, m in cols.items()}
+
+    def read_matrix(self, ticker: str, start=None, end=None, columns=None) -> tuple:
+        """(dates as datetime64[ns], float32 matrix of shape (rows, len(columns))) for a date range."""
+        dates, cols = self.columns_view(ticker, start, end)
+        columns = self._check_columns(ticker, columns or self.columns)
+        return dates.view("datetime64[ns]"), np.column_stack([cols[c] for c in columns]) \
+            if len(dates) else np.empty((0, len(columns)), dtype=np.float32)
+
+    def read(self, ticker: str, start=None, end=None, columns=None) -> pd.DataFrame:
+        """Feature frame indexed by Date for start <= Date < end."""
+        columns = columns or self.columns
+        dates, X = self.read_matrix(ticker, start, end, columns)
+        return pd.DataFrame(X, index=pd.DatetimeIndex(dates, name="Date"), columns=columns)
+
+    def latest(self, ticker: str, n: int = 1, columns=None) -> np.ndarray:
+        """Last n feature rows as a float32 (n, k) matrix, e.g. for /predict."""
+        _, _, cols, _ = self._open(ticker)
+        return np.column_stack([cols[c][-n:] for c in self._check_columns(ticker, columns or self.columns)])
+
+    # ---- internals ----
+    def _dir(self, ticker):
+        return self.root / ticker.upper()
+
+    def _meta_path(self, ticker):
+        return self._dir(ticker) / "meta.json"
+
+    def _set_rows(self, ticker, rows):
+        meta = {"rows": rows, "columns": self.columns, "dtype": "float32"}
+        tmp = self._meta_path(ticker).with_suffix(".tmp")
+        tmp.write_text(json.dumps(meta, indent=2))
+        os.replace(tmp, self._meta_path(ticker))
+
+    def _check_columns(self, ticker, columns):
+        unknown = [c for c in columns if c not in self.columns]
+        if unknown:
+            raise ValueError(f"Feature store for {ticker.upper()} has no column(s) {unknown}; "
+                             f"stored columns: {self.columns}.")
+        return columns
+
+    def _open(self, ticker):
+        # meta.json is replaced (new inode, new mtime) on every write/append, appends grow
+        # dates.i8 and write() recreates it, so this key changes whenever the stored data
+        # does; while it matches, the cached maps are reused without re-reading meta.json
+        d = self._dir(ticker)
+        try:
+            meta_st, dates_st = self._meta_path(ticker).stat(), (d / "dates.i8").stat()
+        except FileNotFoundError:
+            raise KeyError(f"No features stored for {ticker.upper()}.")
+        key = (meta_st.st_ino, meta_st.st_mtime_ns, dates_st.st_ino, dates_st.st_size)
+        with self._lock:
+            cached = self._maps.get(ticker.upper())
+            if cached is not None and cached[3] == key:
+                self._maps.move_to_end(ticker.upper())
+            else:
+                meta = json.loads(self._meta_path(ticker).read_text())
+                rows = meta["rows"]
+                if rows == 0:
+                    raise KeyError(f"No features stored for {ticker.upper()}.")
+                missing = [c for c in self.columns if c not in meta["columns"]]
+                if missing:
+                    raise ValueError(f"Features stored for {ticker.upper()} lack column(s) {missing} "
+                                     f"(stored: {meta['columns']}); rewrite them with this store's columns.")
+                dates = np.memmap(d / "dates.i8", dtype="<i8", mode="r", shape=(rows,))
+                cols = {c: np.memmap(d / f"{c}.f4", dtype="<f4", mode="r", shape=(rows,)) for c in self.columns}
+                self._maps.pop(ticker.upper(), None)
+                cached = self._maps[ticker.upper()] = (rows, dates, cols, key)
+                while len(self._maps) > self.max_open:
+                    # views already handed out keep their own reference to the map
+                    self._maps.popitem(last=False)
+        return cached
+
+    @staticmethod
+    def _bounds(dates, start, end):
+        lo = 0 if start is None else int(np.searchsorted(dates, pd.Timestamp(start).value, side="left"))
+        hi = len(dates) if end is None else int(np.searchsorted(dates, pd.Timestamp(end).value, side="left"))
+        return lo, max(lo, hi)
@@ -1,4 +1,9 @@
 # project/src/features.py
+import logging
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
 
@@ -30,4 +35,230 @@ def build_features(df: pd.DataFrame) -> pd.DataFrame:
     # Replace infinities so imputer can handle them later
     df.replace([np.inf, -np.inf], np.nan, inplace=True)
 
-    return df
\ No newline at end of file
+    return df
+
+_PCT_CHANGE_PADS = int(pd.__version__.split(".")[0]) < 3
+
+
+class _RollingWindow:
+    """
+    Fixed-size window with O(1) mean/std updates (Welford add/remove).
+
+    Mirrors pandas `rolling(window)` with the default min_periods: the stats are
+    NaN until the window is full and while it holds any NaN value.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.n = 0          # finite values currently in the window
+        self.mean_ = 0.0
+        self.m2 = 0.0
+
+    def push(self, x: float) -> None:
+        if len(self.values) == self.window:
+            self._remove(self.values[0])
+        self.values.append(x)
+        if np.isfinite(x):
+            self.n += 1
+            delta = x - self.mean_
+            self.mean_ += delta / self.n
+            self.m2 += delta * (x - self.mean_)
+
+    def _remove(self, x: float) -> None:
+        if not np.isfinite(x):
+            return
+        if self.n == 1:
+            self.n, self.mean_, self.m2 = 0, 0.0, 0.0
+            return
+        self.n -= 1
+        delta = x - self.mean_
+        self.mean_ -= delta / self.n
+        self.m2 -= delta * (x - self.mean_)
+
+    def _full(self) -> bool:
+        return self.n == self.window
+
+    def mean(self) -> float:
+        return self.mean_ if self._full() else np.nan
+
+    def std(self) -> float:
+        if not self._full() or self.window < 2:
+            return np.nan
+        return float(np.sqrt(max(self.m2, 0.0) / (self.window - 1)))
+
+
+class FeatureState:
+    """
+    Incremental version of build_features for append-only price feeds.
+
+    Each update(close, volume) costs O(1) and returns the FEATURE_COLUMNS values
+    for the new bar, matching the last row build_features would produce on the
+    full history (up to floating-point rounding).
+
+    Usage:
+        state = FeatureState.from_frame(history_df)
+        row = state.update(close=191.2, volume=5.1e7)   # dict keyed by FEATURE_COLUMNS
+        json.dump(state.snapshot(), f)                   # restart without a recompute
+        state = FeatureState.restore(json.load(f))
+    """
+
+    # longest lookback: Volatility20 needs 20 returns, i.e. 21 closes
+    SEED_ROWS = 21
+
+    def __init__(self):
+        self.prev_close = np.float64(np.nan)
+        self.returns = deque([np.nan, np.nan], maxlen=2)  # last two returns, for Lag1/Lag2
+        self.ma5 = _RollingWindow(5)
+        self.ma10 = _RollingWindow(10)
+        self.ma20 = _RollingWindow(20)
+        self.vol20 = _RollingWindow(20)
+        self.n_updates = 0
+
+    def update(self, close: float, volume: float) -> dict:
+        """Append one bar and return its feature row."""
+        close = np.float64(close)
+        # pandas < 3 pct_change pads missing closes before dividing
+        c = self.prev_close if (_PCT_CHANGE_PADS and np.isnan(close)) else close
+        # x/0 -> inf, which build_features turns into NaN
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ret = c / self.prev_close - 1.0
+        if not np.isfinite(ret):
+            ret = np.nan
+        lag1, lag2 = self.returns[-1], self.returns[-2]
+
+        self.ma5.push(close)
+        self.ma10.push(close)
+        self.ma20.push(close)
+        self.vol20.push(ret)
+        self.returns.append(ret)
+        self.prev_close = c
+        self.n_updates += 1
+
+        row = {
+            "MA5": self.ma5.mean(),
+            "MA10": self.ma10.mean(),
+            "MA20": self.ma20.mean(),
+            "Volatility20": self.vol20.std(),
+            "Lag1": lag1,
+            "Lag2": lag2,
+            "Volume": float(volume),
+        }
+        return {c: (v if np.isfinite(v) else np.nan) for c, v in row.items()}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "FeatureState":
+        """Seed a state from the tail of an existing ['Close', 'Volume'] frame."""
+        state = cls()
+        tail = df[["Close", "Volume"]].tail(cls.SEED_ROWS)
+        for close, volume in tail.itertuples(index=False):
+            state.update(close, volume)
+        state.n_updates = len(df)
+        return state
+
+    def snapshot(self) -> dict:
+        """JSON-serialisable state; NaN is stored as None."""
+        def clean(vals):
+            return [None if v is None or np.isnan(v) else float(v) for v in vals]
+        return {
+            "prev_close": clean([self.prev_close])[0],
+            "closes": clean(self.ma20.values),
+            "returns": clean(self.vol20.values),
+            "lags": clean(self.returns),
+            "n_updates": self.n_updates,
+        }
+
+    @classmethod
+    def restore(cls, snap: dict) -> "FeatureState":
+        """Rebuild a state saved with snapshot()."""
+        def nan(vals):
+            return [np.nan if v is None else v for v in vals]
+        state = cls()
+        closes, returns = nan(snap["closes"]), nan(snap["returns"])
+        # replay the windows so the running sums are rebuilt exactly
+        for w in (state.ma5, state.ma10, state.ma20):
+            for c in closes[-w.window:]:
+                w.push(c)
+        for r in returns:
+            state.vol20.push(r)
+        state.returns.extend(nan(snap["lags"]))
+        state.prev_close = np.float64(nan([snap["prev_close"]])[0])
+        state.n_updates = snap["n_updates"]
+        return state
+
+
+def _panel_block(df: pd.DataFrame, by: str) -> pd.DataFrame:
+    """
+    build_features over a frame whose tickers are already contiguous and time-ordered.
+
+    Rolling stats run once over the whole column; rows whose window would
+    reach into the previous ticker are then masked, which is what a per-ticker
+    loop would have left as NaN.
+    """
+    df = df.copy()
+    g = df.groupby(by, sort=False)
+    pos = g.cumcount().to_numpy()
+    last = pos == g[by].transform("size").to_numpy() - 1
+
+    ret = g["Close"].pct_change()
+    df["Return"] = ret
+    df["Return_next"] = ret.shift(-1).mask(last)
+    df["Target"] = (df["Return_next"] > 0).astype(int)
+
+    for w in (5, 10, 20):
+        df[f"MA{w}"] = df["Close"].rolling(w).mean().mask(pos < w - 1)
+    df["Volatility20"] = ret.rolling(20).std().mask(pos < 20)
+    df["Lag1"] = ret.shift(1).mask(pos < 1)
+    df["Lag2"] = ret.shift(2).mask(pos < 2)
+
+    df.replace([np.inf, -np.inf], np.nan, inplace=True)
+    return df
+
+
+def build_features_panel(df: pd.DataFrame, by: str = "Ticker", date_col: str = "Date",
+                         n_jobs: int = 1) -> pd.DataFrame:
+    """
+    build_features for a long-format multi-ticker frame.
+
+    Same columns as build_features, computed per ticker with vectorized rolling
+    operations instead of a Python loop over tickers.
+
+    Args:
+        df (pd.DataFrame): Long frame with at least [by, 'Close', 'Volume'].
+        by (str): Ticker column.
+        date_col (str): Rows are ordered by this column within each ticker when present;
+            otherwise the existing row order is kept.
+        n_jobs (int): >1 shards tickers across a process pool (for very large universes).
+
+    Returns:
+        pd.DataFrame: Feature frame sorted by (by, date_col). Throughput is stored in
+        `out.attrs["build_stats"]` (rows, tickers, seconds, rows_per_sec).
+    """
+    t0 = time.perf_counter()
+    sort_cols = [by, date_col] if date_col in df.columns else [by]
+    df = df.sort_values(sort_cols, kind="stable").reset_index(drop=True)
+
+    sizes = df.groupby(by, sort=False).size()
+    n_jobs = max(1, min(n_jobs, len(sizes)))
+    if n_jobs == 1:
+        out = _panel_block(df, by)
+    else:
+        # contiguous ticker ranges with roughly equal row counts, so the concat stays in order
+        cum = sizes.cumsum().to_numpy()
+        targets = np.linspace(0, len(df), n_jobs + 1)[1:-1]
+        cuts = [0, *cum[np.searchsorted(cum, targets)].tolist(), len(df)]
+        shards = [df.iloc[a:b] for a, b in zip(cuts[:-1], cuts[1:]) if b > a]
+        with ProcessPoolExecutor(max_workers=n_jobs) as ex:
+            out = pd.concat(list(ex.map(_panel_block, shards, [by] * len(shards))), ignore_index=True)
+
+    seconds = time.perf_counter() - t0
+    out.attrs["build_stats"] = {
+        "rows": len(out),
+        "tickers": len(sizes),
+        "n_jobs": n_jobs,
+        "seconds": round(seconds, 4),
+        "rows_per_sec": round(len(out) / seconds, 1) if seconds > 0 else None,
+    }
+    logging.info("[features] panel: %d rows / %d tickers in %.3fs (%.0f rows/s)",
+                 len(out), len(sizes), seconds, len(out) / max(seconds, 1e-9))
+    return out
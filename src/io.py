@@ -1,13 +1,95 @@
-from pathlib import Path; import joblib, json
-def save_artifacts(path, model, imputer, scaler, meta):
+from pathlib import Path; import joblib, json, hashlib, os, threading
+
+ARTIFACT_FILES = {"model": "model.pkl", "imputer": "imputer.pkl", "scaler": "scaler.pkl"}
+
+def _hash_files(p, meta):
+    h = hashlib.sha256()
+    for name in ARTIFACT_FILES.values():
+        with open(p/name, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    # meta is part of the version too: a new threshold alone must count as a new model
+    h.update(json.dumps({k: v for k, v in meta.items() if k != "content_hash"}, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+def _write_atomic(target, write):
+    """Write via a temp file in the same dir and os.replace() it over `target`.
+
+    Replacing (new inode) rather than rewriting in place keeps files that a running
+    process has memory-mapped intact: it keeps reading the old version.
+    """
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+def save_artifacts(path, model, imputer, scaler, meta, compress=0):
+    """
+    Write model/imputer/scaler pickles plus meta.json.
+
+    compress=0 (default) keeps numpy arrays raw and page-aligned inside the
+    pickles, so load_artifacts(..., mmap_mode="r") can map them instead of
+    copying them, and forked workers share those pages. Pass e.g. compress=3
+    for smaller files when memory-mapping is not needed.
+    A sha256 of the pickles and the meta payload is stored as meta["content_hash"].
+
+    Every file is written to a temp file and renamed over the old one, so models
+    already loaded (and memory-mapped) from `path` are unaffected by a re-save.
+    """
     p = Path(path); p.mkdir(parents=True, exist_ok=True)
-    joblib.dump(model, p/"model.pkl")
-    joblib.dump(imputer, p/"imputer.pkl")
-    joblib.dump(scaler, p/"scaler.pkl")
-    with open(p/"meta.json","w") as f: json.dump(meta, f, indent=2)
-def load_artifacts(path):
+    for name, obj in zip(ARTIFACT_FILES.values(), (model, imputer, scaler)):
+        _write_atomic(p/name, lambda tmp: joblib.dump(obj, tmp, compress=compress))
+    meta = {**(meta or {}), "compress": compress}
+    meta["content_hash"] = _hash_files(p, meta)
+    _write_atomic(p/"meta.json", lambda tmp: tmp.write_text(json.dumps(meta, indent=2)))
+
+class LazyArtifact:
+    """Stands in for a pickled object and unpickles it on first attribute access."""
+    def __init__(self, path, mmap_mode=None):
+        self._path, self._mmap_mode = Path(path), mmap_mode
+        self._obj, self._lock = None, threading.Lock()
+    def load(self):
+        if self._obj is None:
+            with self._lock:
+                if self._obj is None:
+                    self._obj = joblib.load(self._path, mmap_mode=self._mmap_mode)
+        return self._obj
+    @property
+    def loaded(self):
+        return self._obj is not None
+    def __getattr__(self, name):
+        return getattr(self.load(), name)
+    def __repr__(self):
+        return f"LazyArtifact({self._path.name}, loaded={self.loaded})"
+
+def unwrap(obj):
+    """The real object behind a LazyArtifact (loading it), or `obj` itself."""
+    return obj.load() if isinstance(obj, LazyArtifact) else obj
+
+def load_artifacts(path, mmap_mode=None, lazy=False):
+    """
+    Load (model, imputer, scaler, meta) written by save_artifacts.
+
+    mmap_mode="r" memory-maps numpy arrays stored uncompressed (read-only, shared
+    across processes). lazy=True returns LazyArtifact proxies that defer each
+    unpickle until the component is first used; meta.json is always read eagerly.
+    """
     p = Path(path)
-    return (joblib.load(p/"model.pkl"),
-            joblib.load(p/"imputer.pkl"),
-            joblib.load(p/"scaler.pkl"),
-            json.loads((p/"meta.json").read_text()))
\ No newline at end of file
+    meta = json.loads((p/"meta.json").read_text())
+    if lazy:
+        objs = [LazyArtifact(p/name, mmap_mode) for name in ARTIFACT_FILES.values()]
+    else:
+        objs = [joblib.load(p/name, mmap_mode=mmap_mode) for name in ARTIFACT_FILES.values()]
+    return (*objs, meta)
+
+def artifact_hash(path):
+    """Content hash of an artifact dir: meta.json's value, or computed for dirs saved before it existed."""
+    p = Path(path)
+    meta = json.loads((p/"meta.json").read_text())
+    return meta.get("content_hash") or _hash_files(p, meta)
+
+def artifacts_changed(path, known_hash):
+    """True if the artifacts at `path` differ from the ones hashed as `known_hash`."""
+    return artifact_hash(path) != known_hash
@@ -0,0 +1,249 @@
+# src/metrics.py
+import contextvars
+import cProfile
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+# Prometheus' default latency buckets (seconds), plus finer ones for sub-millisecond stages
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+                   2.5, 5.0, 10.0)
+
+# the request being timed in this thread/task: (Metrics, route) or None when not sampled
+_current = contextvars.ContextVar("metrics_request", default=None)
+_NULL = nullcontext()
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus semantics)."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        i = 0
+        for b in self.buckets:
+            if value <= b:
+                break
+            i += 1
+        self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _labels(**labels) -> str:
+    def esc(v):
+        return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return ",".join(f'{k}="{esc(v)}"' for k, v in labels.items())
+
+
+def stage(name: str):
+    """
+    Time a block as one stage of the current request, e.g. `with stage("predict"): ...`.
+
+    Outside a sampled request this returns a shared no-op context manager, so
+    library code (serving, plotting) can call it unconditionally.
+    """
+    cur = _current.get()
+    if cur is None:
+        return _NULL
+    return cur[0]._stage(cur[1], name)
+
+
+class Metrics:
+    """
+    Per-route request latency, per-stage latency and request counts for a web app.
+
+    Request counts are exact. Latency histograms (request and stage) are only
+    recorded for a random `sample_rate` fraction of requests; for the others the
+    only per-request cost is one random() call and a counter increment, and
+    stage() is a no-op.
+
+    Optionally the next `profile_requests` sampled requests are run under
+    cProfile and their merged stats are written to `profile_dir` as a .prof file
+    (open with `python -m pstats` or snakeviz).
+
+    Args:
+        sample_rate (float): Fraction of requests whose latencies are recorded (0..1).
+        buckets (tuple[float]): Histogram upper bounds in seconds.
+        profile_requests (int): Profile this many requests, then stop (0 = off).
+        profile_dir: Where .prof files go (default: current directory).
+    """
+
+    def __init__(self, sample_rate: float = 1.0, buckets=DEFAULT_BUCKETS, profile_requests: int = 0,
+                 profile_dir=None):
+        self.sample_rate = sample_rate
+        self.buckets = buckets
+        self.profile_dir = Path(profile_dir or ".")
+        self._requests = {}  # (route, method, status) -> count
+        self._latency = {}   # (route, method, status) -> Histogram
+        self._stages = {}    # (route, stage) -> Histogram
+        self._lock = threading.Lock()
+        self._profile_left = 0
+        self._profile_stats = None
+        self._started = time.time()
+        if profile_requests:
+            self.profile(profile_requests)
+
+    @classmethod
+    def from_env(cls, prefix: str = "METRICS_") -> "Metrics":
+        """Build from METRICS_SAMPLE_RATE, METRICS_PROFILE_REQUESTS and METRICS_PROFILE_DIR."""
+        return cls(sample_rate=float(os.getenv(f"{prefix}SAMPLE_RATE", 1.0)),
+                   profile_requests=int(os.getenv(f"{prefix}PROFILE_REQUESTS", 0)),
+                   profile_dir=os.getenv(f"{prefix}PROFILE_DIR"))
+
+    # ---- recording -------------------------------------------------------
+
+    def profile(self, n_requests: int) -> None:
+        """Run the next n sampled requests under cProfile."""
+        with self._lock:
+            self._profile_left = n_requests
+            self._profile_stats = None
+
+    def start_request(self, route: str):
+        """
+        Begin timing a request. Returns an opaque token for end_request, or None
+        if this request is not sampled.
+        """
+        if self.sample_rate <= 0 or (self.sample_rate < 1 and random.random() >= self.sample_rate):
+            return None
+        profiler = None
+        if self._profile_left > 0:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:  # another request in this process is already being profiled
+                profiler = None
+        ctx = _current.set((self, route))
+        return ctx, profiler, time.perf_counter()
+
+    def end_request(self, token, route: str, method: str, status) -> None:
+        key = (route, method, str(status))
+        elapsed = None
+        if token is not None:
+            ctx, profiler, t0 = token
+            elapsed = time.perf_counter() - t0
+            _current.reset(ctx)
+            if profiler is not None:
+                profiler.disable()
+                self._add_profile(profiler)
+        with self._lock:
+            self._requests[key] = self._requests.get(key, 0) + 1
+            if elapsed is not None:
+                hist = self._latency.get(key)
+                if hist is None:
+                    hist = self._latency[key] = Histogram(self.buckets)
+                hist.observe(elapsed)
+
+    @contextmanager
+    def _stage(self, route, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            with self._lock:
+                hist = self._stages.get((route, name))
+                if hist is None:
+                    hist = self._stages[(route, name)] = Histogram(self.buckets)
+                hist.observe(elapsed)
+
+    def _add_profile(self, profiler):
+        with self._lock:
+            if self._profile_left <= 0:
+                return
+            if self._profile_stats is None:
+                self._profile_stats = pstats.Stats(profiler)
+            else:
+                self._profile_stats.add(profiler)
+            self._profile_left -= 1
+            if self._profile_left > 0:
+                return
+            stats, self._profile_stats = self._profile_stats, None
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        path = self.profile_dir / f"profile-{int(time.time())}-{os.getpid()}.prof"
+        stats.dump_stats(path)
+        logging.info("[metrics] wrote request profile to %s", path)
+
+    # ---- export ----------------------------------------------------------
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            requests = dict(self._requests)
+            latency = {k: (list(h.counts), h.sum, h.count) for k, h in self._latency.items()}
+            stages = {k: (list(h.counts), h.sum, h.count) for k, h in self._stages.items()}
+
+        lines = ["# HELP http_requests_total Requests handled, by route, method and status.",
+                 "# TYPE http_requests_total counter"]
+        for (route, method, status), n in sorted(requests.items()):
+            lines.append(f"http_requests_total{{{_labels(route=route, method=method, status=status)}}} {n}")
+
+        lines += ["# HELP http_request_duration_seconds Request latency (sampled requests only).",
+                  "# TYPE http_request_duration_seconds histogram"]
+        for (route, method, status), h in sorted(latency.items()):
+            lines += self._histogram_lines("http_request_duration_seconds",
+                                           dict(route=route, method=method, status=status), *h)
+
+        lines += ["# HELP http_request_stage_duration_seconds Time spent per stage "
+                  "(parse, impute, predict, download, render, encode; sampled requests only).",
+                  "# TYPE http_request_stage_duration_seconds histogram"]
+        for (route, name), h in sorted(stages.items()):
+            lines += self._histogram_lines("http_request_stage_duration_seconds", dict(route=route, stage=name), *h)
+
+        lines += ["# HELP metrics_sample_rate Fraction of requests whose latencies are recorded.",
+                  "# TYPE metrics_sample_rate gauge",
+                  f"metrics_sample_rate {self.sample_rate}",
+                  "# HELP process_start_time_seconds Start time of the process since unix epoch.",
+                  "# TYPE process_start_time_seconds gauge",
+                  f"process_start_time_seconds {self._started}"]
+        return "\n".join(lines) + "\n"
+
+    def _histogram_lines(self, name, labels, counts, total, count):
+        out, cum = [], 0
+        for le, c in zip([*map(str, self.buckets), "+Inf"], counts):
+            cum += c
+            out.append(f"{name}_bucket{{{_labels(**labels, le=le)}}} {cum}")
+        out.append(f"{name}_sum{{{_labels(**labels)}}} {total}")
+        out.append(f"{name}_count{{{_labels(**labels)}}} {count}")
+        return out
+
+    # ---- Flask -----------------------------------------------------------
+
+    def init_app(self, app, endpoint: str = "/metrics") -> "Metrics":
+        """Time every request of a Flask app and serve render() at `endpoint`."""
+        from flask import Response, g, request
+
+        def route():
+            return request.url_rule.rule if request.url_rule is not None else "unmatched"
+
+        @app.before_request
+        def _metrics_start():
+            g._metrics_token = self.start_request(route())
+
+        @app.after_request
+        def _metrics_end(response):
+            self.end_request(g.pop("_metrics_token", None), route(), request.method, response.status_code)
+            return response
+
+        @app.teardown_request
+        def _metrics_teardown(exc):
+            # unhandled exceptions skip after_request; still count them (as 500) and release the context
+            if "_metrics_token" in g:
+                self.end_request(g.pop("_metrics_token"), route(), request.method, 500)
+
+        @app.get(endpoint)
+        def metrics():
+            return Response(self.render(), mimetype="text/plain; version=0.0.4")
+
+        return self
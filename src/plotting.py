@@ -0,0 +1,67 @@
+# src/plotting.py
+import io
+
+import numpy as np
+
+from .metrics import stage
+
+
+def minmax_downsample(x: np.ndarray, y: np.ndarray, n_buckets: int):
+    """
+    Reduce a line series to at most 2 points per bucket (its min and max).
+
+    With one bucket per horizontal pixel the drawn line looks the same as the
+    full series, but drawing cost depends on the image width instead of the
+    number of rows. Points stay in their original x order; NaNs are dropped.
+
+    Args:
+        x (np.ndarray): X values, in plotting order (e.g. dates).
+        y (np.ndarray): Y values.
+        n_buckets (int): Number of buckets, typically the plot width in pixels.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The kept (x, y) points.
+    """
+    x, y = np.asarray(x), np.asarray(y, dtype=float)
+    keep = ~np.isnan(y)
+    x, y = x[keep], y[keep]
+    n = len(y)
+    if n <= 2 * n_buckets:
+        return x, y
+
+    bucket = np.arange(n) * n_buckets // n
+    # sort by (bucket, y): first element of each bucket is its min, last is its max
+    order = np.lexsort((y, bucket))
+    starts = np.searchsorted(bucket[order], np.arange(n_buckets))
+    ends = np.append(starts[1:], n) - 1
+    idx = np.unique(np.concatenate([order[starts], order[ends]]))
+    return x[idx], y[idx]
+
+
+def render_price_png(dates, close, ticker: str, width_px: int = 800, height_px: int = 400, dpi: int = 100) -> bytes:
+    """
+    Render a closing-price line chart to PNG bytes.
+
+    Uses a bare matplotlib Figure (no pyplot global state, so it is safe in threaded
+    servers) with fixed margins instead of bbox_inches="tight", which would draw the
+    figure twice. The series is min/max-downsampled to the plot width first.
+    """
+    from matplotlib.figure import Figure  # imported here so scoring-only processes never load matplotlib
+
+    with stage("render"):
+        x, y = minmax_downsample(np.asarray(dates), np.asarray(close, dtype=float), max(width_px, 1))
+
+        fig = Figure(figsize=(width_px / dpi, height_px / dpi), dpi=dpi)
+        fig.subplots_adjust(left=0.1, right=0.97, top=0.9, bottom=0.14)
+        ax = fig.add_subplot()
+        ax.plot(x, y, label=f"{ticker} Close")
+        ax.set_title(f"{ticker} Closing Price")
+        ax.set_xlabel("Date")
+        ax.set_ylabel("Price")
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+
+    with stage("encode"):  # savefig draws the canvas and PNG-compresses it
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png")
+    return buf.getvalue()
@@ -0,0 +1,155 @@
+# src/registry.py
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import namedtuple
+from pathlib import Path
+
+from .io import load_artifacts, artifact_hash
+
+LoadedModel = namedtuple("LoadedModel", "model imputer scaler meta version loaded_at load_seconds scorer",
+                         defaults=(None,))
+
+
+class ModelRegistry:
+    """
+    Holds the active model artifacts and hot-swaps them when a new version lands.
+
+    A background thread polls the artifact directory. The version is the content of
+    `version_file` if it exists, otherwise the content hash in meta.json (written by
+    save_artifacts, after the pickles). When it changes, the new artifacts are loaded
+    off the request path and swapped in with a single reference assignment.
+
+    Request handlers should call current() once and use that snapshot for the whole
+    request, so in-flight requests finish on the model they started with.
+
+    Args:
+        path: Artifact directory (as written by save_artifacts).
+        poll_interval (float): Seconds between checks; 0 disables the watcher.
+        version_file (str): Optional file in `path` whose content names the version.
+        prepare: Optional callable (model, imputer, meta) -> scorer, run on each newly
+            loaded version before it is swapped in (e.g. fast_scorer.compile_scorer).
+            The result is exposed as LoadedModel.scorer (None if it fails).
+        **load_kwargs: Passed to load_artifacts (e.g. mmap_mode="r").
+    """
+
+    def __init__(self, path, poll_interval: float = 5.0, version_file: str = "VERSION", prepare=None,
+                 **load_kwargs):
+        self.path = Path(path)
+        self.poll_interval = poll_interval
+        self.version_file = version_file
+        self.prepare = prepare
+        self.load_kwargs = load_kwargs
+        self.last_error = None
+        self._active = None
+        self._load_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._fork_hook = False
+
+    def current(self):
+        """The active LoadedModel, or None if nothing has loaded yet."""
+        return self._active
+
+    def version(self):
+        """Version string of the artifacts currently on disk."""
+        vf = self.path / self.version_file
+        if vf.exists():
+            return vf.read_text().strip()
+        return artifact_hash(self.path)
+
+    def reload(self, force: bool = False) -> bool:
+        """Load the on-disk version if it differs from the active one. Returns True if swapped."""
+        with self._load_lock:
+            try:
+                version = self.version()
+                active = self._active
+                if not force and active is not None and active.version == version:
+                    return False
+                t0 = time.perf_counter()
+                model, imputer, scaler, meta = load_artifacts(self.path, **self.load_kwargs)
+                load_seconds = time.perf_counter() - t0
+                scorer = self._prepare(model, imputer, meta)
+            except Exception as e:
+                # keep serving the previous model; try again on the next poll
+                self.last_error = f"{type(e).__name__}: {e}"
+                logging.warning("[registry] could not load artifacts from %s: %s", self.path, e)
+                return False
+            self._active = LoadedModel(model, imputer, scaler, meta, version, time.time(), load_seconds, scorer)
+            self.last_error = None
+            logging.info("[registry] active version %s (loaded in %.3fs)", version, load_seconds)
+            return True
+
+    def _prepare(self, model, imputer, meta):
+        if self.prepare is None:
+            return None
+        try:
+            return self.prepare(model, imputer, meta)
+        except Exception as e:
+            # an optional fast path must never block a model from going live
+            logging.warning("[registry] prepare step failed, serving without it: %s", e)
+            return None
+
+    def start(self) -> "ModelRegistry":
+        """
+        Load synchronously once, then keep watching in a daemon thread.
+
+        The watcher is restarted in forked children (threads don't survive fork()),
+        so a registry loaded in a pre-fork parent keeps hot-reloading in every worker.
+        A registry stop()ped before the fork stays stopped in the children; a pre-fork
+        launcher that wants one shared model does that and polls in the parent instead.
+        """
+        self.reload()
+        if self.poll_interval > 0 and (self._thread is None or not self._thread.is_alive()):
+            self._stop.clear()
+            self._start_watcher()
+        if not self._fork_hook and hasattr(os, "register_at_fork"):
+            ref = weakref.ref(self)
+            os.register_at_fork(after_in_child=lambda: _after_fork(ref))
+            self._fork_hook = True
+        return self
+
+    def _start_watcher(self):
+        self._thread = threading.Thread(target=self._watch, name="model-registry", daemon=True)
+        self._thread.start()
+
+    def _after_fork(self):
+        # the parent's watcher may have held these at fork time; the child gets fresh ones
+        stopped = self._stop.is_set()
+        self._load_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if stopped:
+            self._stop.set()
+        elif self.poll_interval > 0:
+            self._start_watcher()
+
+    def stop(self, wait: bool = False) -> None:
+        """Stop the watcher; with wait=True, also wait for a reload in progress to finish."""
+        self._stop.set()
+        thread = self._thread
+        if wait and thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            self.reload()
+
+    def status(self) -> dict:
+        """Summary for health endpoints."""
+        active = self._active
+        return {
+            "version": active.version if active else None,
+            "loaded_at": active.loaded_at if active else None,
+            "load_seconds": round(active.load_seconds, 4) if active else None,
+            "fast_scorer": active.scorer is not None if active else False,
+            "last_error": self.last_error,
+        }
+
+
+def _after_fork(ref):
+    registry = ref()
+    if registry is not None:
+        registry._after_fork()
@@ -0,0 +1,219 @@
+# src/serving.py
+import asyncio
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from .metrics import stage
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib json module is used instead
+    orjson = None
+
+
+def loads_json(body):
+    """Decode a JSON request body (bytes or str) with orjson when it is installed."""
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+def dumps_json(obj) -> bytes:
+    """Encode a JSON response body with orjson when it is installed."""
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode()
+
+
+def parse_rows(features, n_features=None) -> np.ndarray:
+    """
+    Validate a 'features' payload and return it as a 2-D float matrix.
+
+    Accepts a single row (list of numbers) or a batch (list of equal-length rows).
+    The whole payload is checked in one np.asarray call instead of an
+    isinstance() per value.
+
+    Args:
+        features: Decoded JSON value from the request body.
+        n_features (int | None): Expected row length, if known.
+
+    Returns:
+        np.ndarray: Float matrix of shape (n_rows, n_features).
+
+    Raises:
+        ValueError: If the payload is not a numeric row / list of rows.
+    """
+    if not isinstance(features, list) or not features:
+        raise ValueError("Body must be JSON with numeric list 'features'.")
+    try:
+        arr = np.asarray(features)
+    except ValueError:  # ragged rows
+        raise ValueError("All rows in 'features' must have the same length.")
+    if arr.dtype.kind not in "biuf":
+        raise ValueError("Body must be JSON with numeric list 'features'.")
+    if arr.ndim == 1:
+        arr = arr.reshape(1, -1)
+    elif arr.ndim != 2:
+        raise ValueError("'features' must be a list of numbers or a list of rows.")
+    if n_features is not None and arr.shape[1] != n_features:
+        raise ValueError(f"Expected {n_features} features per row, got {arr.shape[1]}.")
+    return arr.astype(float, copy=False)
+
+
+def parse_payload(data, art, max_rows: int = None, store=None):
+    """
+    Rows to score from a decoded /predict body.
+
+    `{"features": row}` or `{"features": [row, ...]}` go through parse_rows;
+    `{"ticker": "AAPL"}` takes the latest row from a FeatureStore, in the
+    feature order recorded in the model's meta (default: the store's columns).
+
+    Args:
+        data: Decoded JSON body.
+        art: Active LoadedModel (from ModelRegistry.current()).
+        max_rows (int | None): Largest batch accepted.
+        store (FeatureStore | None): Source for ticker requests.
+
+    Returns:
+        tuple[np.ndarray, bool]: The matrix and whether the request was a batch.
+    """
+    data = data if isinstance(data, dict) else {}
+    features = data.get("features")
+    if features is None and isinstance(data.get("ticker"), str) and store is not None:
+        columns = (art.meta or {}).get("features") or store.columns
+        try:
+            return store.latest(data["ticker"], 1, columns).astype(float), False
+        except KeyError:
+            raise ValueError(f"No stored features for ticker '{data['ticker']}'.")
+    X = parse_rows(features, getattr(art.imputer, "n_features_in_", None))
+    if max_rows is not None and X.shape[0] > max_rows:
+        raise ValueError(f"Too many rows: {X.shape[0]} > {max_rows}.")
+    # a flat list is a single row; a list of lists is a batch even if it has one row
+    return X, isinstance(features[0], list)
+
+
+def score_loaded(art, X: np.ndarray) -> list:
+    """Score with one registry snapshot, using its compiled scorer when it has one."""
+    if art.scorer is not None:
+        return art.scorer(X)
+    return predict_rows(art.model, art.imputer, art.meta, X)
+
+
+def predict_rows(model, imputer, meta, X: np.ndarray) -> list:
+    """
+    Impute and score a feature matrix with one vectorized call per stage.
+
+    Returns one result dict per row, in the same shape the single-row
+    /predict endpoint has always returned.
+    """
+    with stage("impute"):
+        X_imp = imputer.transform(X)
+
+    if hasattr(model, "predict_proba"):
+        with stage("predict"):
+            proba_up = model.predict_proba(X_imp)[:, 1]
+        threshold = (meta or {}).get("threshold", 0.5)
+        return [{"proba_up": round(float(p), 6), "pred_up": int(p >= threshold)} for p in proba_up]
+
+    with stage("predict"):
+        pred = model.predict(X_imp)
+    return [{"prediction": float(p)} for p in pred]
+
+
+class MicroBatcher:
+    """
+    Merge concurrent single-row requests into one vectorized call.
+
+    Each submit() call hands a row to a background thread, which waits up to
+    `window_s` after the first row for more rows (or until `max_batch` rows),
+    stacks them into a matrix and calls `score_fn(X)` once. Callers block until
+    their own row's result is ready.
+
+    Args:
+        score_fn: Callable taking an (n, k) matrix and returning n results.
+        window_s (float): How long to wait for more rows after the first one.
+        max_batch (int): Flush early once this many rows are queued.
+    """
+
+    def __init__(self, score_fn, window_s: float = 0.002, max_batch: int = 256):
+        self.score_fn = score_fn
+        self.window_s = window_s
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, row, timeout: float = None):
+        """Score one row (1-D sequence) and return its result."""
+        self._ensure_worker()
+        fut = Future()
+        self._queue.put((np.asarray(row, dtype=float), fut))
+        return fut.result(timeout=timeout)
+
+    def _ensure_worker(self):
+        # started lazily so importing the app (or forking it) never leaves a dead thread behind
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+                self._thread.start()
+
+    def _collect(self):
+        items = [self._queue.get()]
+        deadline = time.monotonic() + self.window_s
+        while len(items) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                items.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return items
+
+    def _run(self):
+        while True:
+            items = self._collect()
+            # rows of different lengths can't share a matrix; score each group separately
+            groups = {}
+            for row, fut in items:
+                groups.setdefault(row.shape[0], []).append((row, fut))
+            for group in groups.values():
+                futs = [fut for _, fut in group]
+                try:
+                    results = self.score_fn(np.vstack([row for row, _ in group]))
+                except Exception as e:
+                    for fut in futs:
+                        fut.set_exception(e)
+                    continue
+                for fut, res in zip(futs, results):
+                    fut.set_result(res)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical async calls.
+
+    While a call for `key` is in flight, later callers await the same task
+    instead of starting another one, so N simultaneous requests for the same
+    ticker/date range cost one download. Results are not kept after the call
+    finishes; caching is left to the caller. Must be used from one event loop.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self.stats = {"calls": 0, "coalesced": 0}
+
+    async def run(self, key, fn):
+        """Await fn() (a coroutine function), sharing the call with concurrent callers of the same key."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            self.stats["calls"] += 1
+        else:
+            self.stats["coalesced"] += 1
+        # shield: one caller disconnecting must not cancel the fetch the others are waiting on
+        return await asyncio.shield(task)
@@ -0,0 +1,121 @@
+# src/storage.py
+from pathlib import Path
+
+import pandas as pd
+
+# Explicit dtypes for the price tables the pipeline stages pass around
+PRICE_DTYPES = {"Date": "datetime64[ns]", "Close": "float64", "Volume": "float64"}
+
+_FORMATS = {
+    ".csv": "csv",
+    ".json": "json",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "ipc",
+    ".feather": "ipc",
+    ".ipc": "ipc",
+}
+
+
+def table_format(path, default: str = None) -> str:
+    """Storage format for a path, from its suffix (or `default` for unknown suffixes)."""
+    suffix = Path(path).suffix.lower()
+    if suffix not in _FORMATS:
+        if default:
+            return default
+        raise ValueError(f"Unsupported file type '{suffix}'. Use one of: {', '.join(sorted(_FORMATS))}")
+    return _FORMATS[suffix]
+
+
+def _apply_dtypes(df: pd.DataFrame, dtypes: dict) -> pd.DataFrame:
+    for col, dtype in (dtypes or {}).items():
+        if col in df.columns and str(df[col].dtype) != dtype:
+            df[col] = pd.to_datetime(df[col], errors="coerce").astype(dtype) if dtype.startswith("datetime") \
+                else df[col].astype(dtype)
+    return df
+
+
+def read_table(path, columns=None, start=None, end=None, dtypes=None, date_col: str = "Date",
+               fmt: str = None) -> pd.DataFrame:
+    """
+    Read a CSV / JSON / JSON-lines / Parquet / Arrow IPC table.
+
+    Args:
+        path: File to read; the format comes from the suffix.
+        columns (list[str] | None): Only read these columns (e.g. ['Date', 'Close', 'Volume']).
+        start, end: Keep rows with start <= date_col < end. For Parquet and Arrow the filter
+            is pushed down to the reader (Parquet skips whole row groups by their statistics).
+        dtypes (dict | None): Column -> dtype to enforce, e.g. PRICE_DTYPES.
+        date_col (str): Column used by start/end.
+        fmt (str | None): Override the suffix-based format ('csv', 'json', 'jsonl', 'parquet', 'ipc').
+
+    Returns:
+        pd.DataFrame
+    """
+    fmt = fmt or table_format(path)
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+
+    if fmt in {"parquet", "ipc"}:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        flt = None
+        if start is not None:
+            flt = ds.field(date_col) >= pa.scalar(start.to_pydatetime())
+        if end is not None:
+            cond = ds.field(date_col) < pa.scalar(end.to_pydatetime())
+            flt = cond if flt is None else flt & cond
+        table = ds.dataset(path, format=fmt).to_table(columns=columns, filter=flt)
+        return _apply_dtypes(table.to_pandas(), dtypes)
+
+    if fmt == "csv":
+        csv_dtypes = {c: t for c, t in (dtypes or {}).items() if not t.startswith("datetime")}
+        df = pd.read_csv(path, usecols=columns, dtype=csv_dtypes or None)
+    else:
+        df = pd.read_json(path, lines=(fmt == "jsonl"))
+        if columns is not None:
+            df = df[columns]
+    df = _apply_dtypes(df, dtypes)
+
+    if (start is not None or end is not None) and date_col in df.columns:
+        dates = pd.to_datetime(df[date_col], errors="coerce")
+        mask = pd.Series(True, index=df.index)
+        if start is not None:
+            mask &= dates >= start
+        if end is not None:
+            mask &= dates < end
+        df = df[mask].reset_index(drop=True)
+    return df
+
+
+def write_table(df: pd.DataFrame, path, dtypes=None, row_group_size: int = 128_000, fmt: str = None) -> None:
+    """
+    Write a table in the format implied by the path suffix.
+
+    Parquet is written in row groups of `row_group_size` so date-range reads can skip
+    most of the file; Arrow IPC is written uncompressed so it can be memory-mapped.
+    JSON keeps the pipeline's existing records/ISO-date layout.
+    """
+    fmt = fmt or table_format(path)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    df = _apply_dtypes(df.copy(), dtypes) if dtypes else df
+
+    if fmt in {"parquet", "ipc"}:
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+            pq.write_table(table, path, row_group_size=row_group_size)
+        else:
+            import pyarrow.feather as feather
+            feather.write_feather(table, path, compression="uncompressed")
+    elif fmt == "csv":
+        df.to_csv(path, index=False)
+    else:
+        lines = fmt == "jsonl"
+        Path(path).write_text(df.to_json(orient="records", date_format="iso", lines=lines,
+                                         indent=None if lines else 2))
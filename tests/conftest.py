@@ -0,0 +1,57 @@
+# tests/conftest.py
+import importlib
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+HOMEWORK13 = ROOT / "homework" / "homework13"
+
+
+def make_artifacts(path, n_features: int = 7, seed: int = 0) -> None:
+    """Small random-forest artifacts with the 7 FEATURE_COLUMNS inputs the homework13 apps expect."""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.impute import SimpleImputer
+    from sklearn.preprocessing import StandardScaler
+    from src.io import save_artifacts
+
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(500, n_features))
+    y = (X[:, 0] + rng.normal(size=len(X)) > 0).astype(int)
+    imputer = SimpleImputer(strategy="median").fit(X)
+    model = RandomForestClassifier(n_estimators=10, random_state=seed).fit(imputer.transform(X), y)
+    save_artifacts(path, model, imputer, StandardScaler().fit(X), {"threshold": 0.5})
+
+
+@pytest.fixture(scope="session")
+def homework13_env(tmp_path_factory):
+    """Environment for the homework13 apps: fresh artifacts and empty caches in a temp dir, no polling."""
+    tmp = tmp_path_factory.mktemp("homework13")
+    make_artifacts(tmp / "artifacts")
+    env = {"ARTIFACT_DIR": str(tmp / "artifacts"), "MODEL_POLL_SECONDS": "0", "PRICE_CACHE_DIR": str(tmp / "prices"),
+           "FEATURE_STORE_DIR": str(tmp / "features"), "METRICS_SAMPLE_RATE": "1"}
+    return tmp, env
+
+
+@pytest.fixture(scope="session")
+def homework13(homework13_env):
+    """Imports a homework13 app module (app_flask, app_async) with homework13_env applied."""
+    _, env = homework13_env
+    saved = {k: os.environ.get(k) for k in env}
+    os.environ.update(env)
+    sys.path.insert(0, str(HOMEWORK13))
+    try:
+        yield importlib.import_module
+    finally:
+        sys.path.remove(str(HOMEWORK13))
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
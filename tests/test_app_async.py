@@ -0,0 +1,91 @@
+# tests/test_app_async.py
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cache import PriceCache, ResponseCache
+
+
+def _fake_prices(ticker, start, end, auto_adjust=True):
+    dates = pd.bdate_range(start, end, inclusive="left")
+    return pd.DataFrame({"Date": dates, "Close": np.linspace(100, 110, len(dates)), "Volume": 1.0})
+
+
+@pytest.fixture
+def app_async(homework13, tmp_path, monkeypatch):
+    module = homework13("app_async")
+    monkeypatch.setattr(module, "PRICES", PriceCache(tmp_path / "prices", fetch=_fake_prices))
+    monkeypatch.setattr(module, "PLOTS", ResponseCache())
+    monkeypatch.setattr(module, "_plot_slots", None)
+    return module
+
+
+async def _request(app, method, path, query=b"", body=b"", chunk=None):
+    """Drive the ASGI app directly; returns (status, headers, body)."""
+    chunk = chunk or max(1, len(body))
+    messages = [{"type": "http.request", "body": body[i:i + chunk], "more_body": i + chunk < len(body)}
+                for i in range(0, max(1, len(body)), chunk)]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "query_string": query, "headers": []}
+    await app(scope, receive, send)
+    start, out = sent
+    return start["status"], dict(start["headers"]), out["body"]
+
+
+def _call(module, *args, **kwargs):
+    return asyncio.run(_request(module.app, *args, **kwargs))
+
+
+def test_routing(app_async):
+    status, headers, body = _call(app_async, "GET", "/health")
+    assert status == 200 and json.loads(body)["status"] == "ok"
+    assert headers[b"content-type"] == b"application/json"
+    assert _call(app_async, "GET", "/nope")[0] == 404
+    assert _call(app_async, "GET", "/predict")[0] == 405
+    assert _call(app_async, "GET", "/metrics")[0] == 200
+
+
+def test_predict_over_chunked_body_matches_batch(app_async):
+    rows = np.random.default_rng(0).normal(size=(5, 7)).tolist()
+    singles = [json.loads(_call(app_async, "POST", "/predict", body=json.dumps({"features": r}).encode(), chunk=7)[2])
+               for r in rows]
+    status, _, body = _call(app_async, "POST", "/predict/batch", body=json.dumps({"features": rows}).encode())
+    assert status == 200 and json.loads(body)["results"] == singles
+
+
+def test_oversized_body_is_413(app_async, monkeypatch):
+    monkeypatch.setattr(app_async, "MAX_BODY_BYTES", 64)
+    assert _call(app_async, "POST", "/predict", body=b"x" * 100, chunk=16)[0] == 413
+
+
+@pytest.mark.parametrize("query", [b"start=garbage", b"start=2024-01-01&end=2024-13-40"])
+def test_plot_rejects_malformed_dates(app_async, query):
+    status, _, body = _call(app_async, "GET", "/plot", query=query)
+    assert status == 400 and "YYYY-MM-DD" in json.loads(body)["error"]
+    assert app_async.PRICES.stats["fetches"] == 0
+
+
+def test_plot_sheds_load_with_503_when_slots_are_taken(app_async):
+    query = b"ticker=AAPL&start=2024-01-01&end=2024-03-01"
+
+    async def scenario():
+        app_async._plot_slots = asyncio.Semaphore(1)
+        async with app_async._plot_slots:
+            shed = await _request(app_async.app, "GET", "/plot", query=query)
+        served = await _request(app_async.app, "GET", "/plot", query=query)
+        return shed, served
+
+    (shed_status, _, shed_body), (status, headers, body) = asyncio.run(scenario())
+    assert shed_status == 503 and "retry" in json.loads(shed_body)["error"]
+    assert status == 200 and headers[b"content-type"] == b"image/png" and body[:4] == b"\x89PNG"
+    assert app_async.PRICES.stats["fetches"] == 1
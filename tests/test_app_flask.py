@@ -0,0 +1,74 @@
+# tests/test_app_flask.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cache import PriceCache, ResponseCache
+
+
+def _fake_prices(ticker, start, end, auto_adjust=True):
+    dates = pd.bdate_range(start, end, inclusive="left")
+    return pd.DataFrame({"Date": dates, "Close": np.linspace(100, 110, len(dates)), "Volume": 1.0})
+
+
+@pytest.fixture
+def app_flask(homework13, tmp_path, monkeypatch):
+    module = homework13("app_flask")
+    monkeypatch.setattr(module, "PRICES", PriceCache(tmp_path / "prices", fetch=_fake_prices))
+    monkeypatch.setattr(module, "PLOTS", ResponseCache())
+    return module
+
+
+def test_plot_etag_revalidates_with_304(app_flask):
+    client = app_flask.app.test_client()
+    first = client.get("/plot?ticker=AAPL&start=2024-01-01&end=2024-03-01")
+    assert first.status_code == 200 and first.mimetype == "image/png"
+    etag = first.headers["ETag"]
+
+    again = client.get("/plot?ticker=AAPL&start=2024-01-01&end=2024-03-01", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.data == b""
+    assert app_flask.PLOTS.stats["hits"] == 1
+
+
+@pytest.mark.parametrize("query", ["start=garbage", "start=2024-01-01&end=2024-13-40"])
+def test_plot_rejects_malformed_dates(app_flask, query):
+    resp = app_flask.app.test_client().get(f"/plot?{query}")
+    assert resp.status_code == 400
+    assert "YYYY-MM-DD" in resp.get_json()["error"]
+    assert app_flask.PRICES.stats["fetches"] == 0
+
+
+def _rows(n, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, 7)).tolist()
+
+
+def test_batch_matches_single_row_predictions(app_flask):
+    client = app_flask.app.test_client()
+    rows = _rows(12)
+    singles = [client.post("/predict", json={"features": row}).get_json() for row in rows]
+    batch = client.post("/predict/batch", json={"features": rows}).get_json()["results"]
+    assert batch == singles
+    assert client.post("/predict", json={"features": rows}).get_json()["results"] == singles
+
+
+def test_micro_batched_predictions_match_direct_scoring(app_flask, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from src.serving import MicroBatcher
+
+    calls = []
+
+    def score(X):
+        calls.append(len(X))
+        return app_flask._score(X)
+
+    monkeypatch.setattr(app_flask, "BATCHER", MicroBatcher(score, window_s=0.05))
+    client = app_flask.app.test_client()
+    rows = _rows(16, seed=1)
+    expected = app_flask._score(np.array(rows, dtype=float))
+    with ThreadPoolExecutor(8) as pool:
+        got = list(pool.map(lambda row: app_flask.app.test_client().post("/predict", json={"features": row}).get_json(),
+                            rows))
+    assert got == expected
+    assert max(calls) > 1  # concurrent rows really were merged into one call
+    assert client.post("/predict", json={"features": rows[0]}).get_json() == expected[0]
@@ -0,0 +1,81 @@
+# tests/test_app_task.py
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "homework" / "homework15"))
+from app_task import QuantileSketch, my_task, my_task_streaming  # noqa: E402
+
+REL = 0.001  # QuantileSketch default relative accuracy
+
+
+def _prices(n=5_000, seed=0, shuffled=False):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2020-01-01", periods=n, freq="h")
+    df = pd.DataFrame({"Date": dates, "Close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n))),
+                       "Volume": rng.integers(1, 1_000, n).astype(float)})
+    df.loc[rng.choice(n, 20, replace=False), "Close"] *= 50  # outliers for the clip
+    df.loc[rng.choice(n, 30, replace=False), "Volume"] = np.nan
+    dupes = df.sample(300, random_state=seed).assign(Close=lambda d: d["Close"] + 1.0)
+    df = pd.concat([df, dupes], ignore_index=True)  # later duplicates with different values
+    if shuffled:
+        df = df.sample(frac=1, random_state=seed)
+    else:
+        df = df.sort_values("Date", kind="stable")
+    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d %H:%M:%S")
+    return df.reset_index(drop=True)
+
+
+def _write(df, path):
+    if path.suffix == ".jsonl":
+        df.to_json(path, orient="records", lines=True)
+    elif path.suffix == ".json":
+        df.to_json(path, orient="records")
+    elif path.suffix == ".csv":
+        df.to_csv(path, index=False)
+    else:
+        df.to_parquet(path, index=False)
+    return str(path)
+
+
+def _read(path):
+    df = pd.read_parquet(path)
+    df["Date"] = pd.to_datetime(df["Date"]).astype("datetime64[ns]")
+    return df.reset_index(drop=True)
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".jsonl", ".json", ".parquet"])
+def test_streaming_matches_in_memory(tmp_path, suffix):
+    src = _write(_prices(), tmp_path / f"in{suffix}")
+    my_task(src, str(tmp_path / "full.parquet"))
+    my_task_streaming(src, str(tmp_path / "stream.parquet"), chunksize=700)
+    full, stream = _read(tmp_path / "full.parquet"), _read(tmp_path / "stream.parquet")
+
+    pd.testing.assert_frame_equal(stream[["Date", "Volume"]], full[["Date", "Volume"]], check_dtype=False)
+    # clip bounds come from the sketch: equal within its relative accuracy
+    np.testing.assert_allclose(stream["Close"], full["Close"], rtol=REL)
+    unclipped = (full["Close"] > full["Close"].min()) & (full["Close"] < full["Close"].max())
+    assert (stream["Close"][unclipped] == full["Close"][unclipped]).all()
+
+
+def test_streaming_keeps_same_rows_for_unsorted_input(tmp_path):
+    src = _write(_prices(shuffled=True), tmp_path / "in.csv")
+    my_task(src, str(tmp_path / "full.parquet"))
+    my_task_streaming(src, str(tmp_path / "stream.parquet"), chunksize=700)
+    full = _read(tmp_path / "full.parquet")
+    stream = _read(tmp_path / "stream.parquet").sort_values("Date", ignore_index=True)
+    pd.testing.assert_frame_equal(stream[["Date", "Volume"]], full[["Date", "Volume"]], check_dtype=False)
+    np.testing.assert_allclose(stream["Close"], full["Close"], rtol=REL)
+
+
+def test_quantile_sketch_relative_accuracy():
+    values = np.random.default_rng(1).lognormal(3, 1, 100_000)
+    sketch = QuantileSketch(REL)
+    for chunk in np.array_split(values, 7):
+        sketch.add(chunk)
+    for q in (0.001, 0.5, 0.999):
+        exact = np.quantile(values, q)
+        assert abs(sketch.quantile(q) - exact) <= REL * exact * 1.0001
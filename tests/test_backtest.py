@@ -0,0 +1,40 @@
+# tests/test_backtest.py
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import SGDClassifier
+
+from src.backtest import run_backtest, walk_forward_folds
+from src.features import FEATURE_COLUMNS
+
+
+@pytest.fixture(scope="module")
+def frame():
+    rng = np.random.default_rng(0)
+    n = 1400
+    X = rng.normal(size=(n, len(FEATURE_COLUMNS)))
+    ret = 0.01 * (X[:, 0] + rng.normal(size=n))
+    df = pd.DataFrame(X, columns=FEATURE_COLUMNS, index=pd.date_range("2020-01-01", periods=n, freq="D"))
+    df["Return_next"] = ret
+    df["Target"] = (ret > 0).astype(int)
+    return df
+
+
+def test_folds_cover_each_row_once():
+    folds = walk_forward_folds(100, 40, 10)
+    scored = np.concatenate([np.arange(t.start, t.stop) for _, t in folds])
+    np.testing.assert_array_equal(scored, np.arange(40, 100))
+
+
+def test_overlapping_test_windows_rejected():
+    with pytest.raises(ValueError, match="step"):
+        walk_forward_folds(100, 40, 10, step=5)
+
+
+@pytest.mark.parametrize("model", [None, SGDClassifier(random_state=0)])
+def test_results_do_not_depend_on_n_jobs(frame, model):
+    kw = dict(model=model, train_size=300, test_size=40, chain_folds=4)
+    serial = run_backtest(frame, n_jobs=1, **kw)
+    parallel = run_backtest(frame, n_jobs=4, **kw)
+    pd.testing.assert_frame_equal(serial["predictions"], parallel["predictions"])
+    assert serial["summary"]["total_return"] == parallel["summary"]["total_return"]
@@ -0,0 +1,67 @@
+# tests/test_bootcamp_app.py
+import importlib.util
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+MAIN = Path(__file__).resolve().parent.parent / "bootcamp_backup_2025-08-29_12-51-03" / "app" / "main.py"
+
+
+def _write(path, data):
+    np.savetxt(path, data, fmt="%g")
+    # force a new mtime even if the rewrite lands within the filesystem's timestamp resolution
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def _data(seed, rows=1000):
+    rng = np.random.default_rng(seed)
+    data = rng.integers(0, 50, size=(rows, 25)).astype(float)  # integers: many values sit exactly on bin edges
+    data[:, 4] = rng.normal(3000, 800, rows).round(2)
+    data[rng.random(rows) < 0.05, 4] = np.nan
+    return data
+
+
+@pytest.fixture
+def bootcamp(tmp_path, monkeypatch):
+    data = tmp_path / "german.data-numeric"
+    _write(data, _data(0))
+    monkeypatch.setenv("DATA_PATH", str(data))
+    for name in ["MODEL_PATH", "FEATURES_PATH", "CODE_TABLE_PATH"]:
+        monkeypatch.setenv(name, str(tmp_path / "missing"))
+    spec = importlib.util.spec_from_file_location("bootcamp_main", MAIN)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module, data
+
+
+@pytest.mark.parametrize("col,i", [("credit_amount", 4), ("duration_months", 1), ("target", 24)])
+@pytest.mark.parametrize("bins", [1, 7, 30, 256])
+def test_histogram_matches_numpy(bootcamp, col, i, bins):
+    module, data = bootcamp
+    values = np.loadtxt(data)[:, i]
+    expected_counts, expected_edges = np.histogram(values[np.isfinite(values)], bins=bins)
+    counts, edges = module.DATA_INDEX.histogram(col, bins)
+    np.testing.assert_array_equal(counts, expected_counts)
+    np.testing.assert_allclose(edges, expected_edges)
+    assert module.DATA_INDEX.histogram(col, bins) is module.DATA_INDEX._snapshot()[2][(i, bins)]
+
+
+def test_changed_file_is_reparsed(bootcamp):
+    module, data = bootcamp
+    before = module.DATA_INDEX.histogram("credit_amount", 10)
+    _write(data, _data(1, rows=300))
+    counts, _ = module.DATA_INDEX.histogram("credit_amount", 10)
+    assert counts.sum() == np.isfinite(np.loadtxt(data)[:, 4]).sum()
+    assert counts.sum() != before[0].sum()
+
+
+def test_plot_endpoint(bootcamp):
+    module, _ = bootcamp
+    client = module.app.test_client()
+    resp = client.get("/plot?col=credit_amount&bins=20")
+    assert resp.status_code == 200 and resp.mimetype == "image/png"
+    assert client.get("/plot?col=nope").status_code == 400
+    assert client.get("/plot?bins=0").status_code == 400
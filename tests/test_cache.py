@@ -0,0 +1,82 @@
+# tests/test_cache.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cache import PriceCache
+
+
+class FakeFetch:
+    """download_data stand-in: one row per business day in [start, end), recording each call."""
+
+    def __init__(self, fail_first: int = 0):
+        self.calls = []
+        self.fail_first = fail_first
+
+    def __call__(self, ticker, start, end, auto_adjust=True):
+        self.calls.append((start, end))
+        if len(self.calls) <= self.fail_first:
+            return pd.DataFrame()  # what yfinance returns when a download fails
+        dates = pd.bdate_range(start, end, inclusive="left")
+        close = np.arange(len(dates), dtype=float) + dates.day
+        return pd.DataFrame({"Date": dates, "Close": close, "Volume": 1.0})
+
+
+@pytest.fixture
+def fetch():
+    return FakeFetch()
+
+
+def test_only_missing_segments_are_fetched(tmp_path, fetch):
+    cache = PriceCache(tmp_path, fetch=fetch)
+    feb = cache.get("AAPL", "2024-02-01", "2024-03-01")
+    assert fetch.calls == [("2024-02-01", "2024-03-01")]
+    assert feb["Date"].min() == pd.Timestamp("2024-02-01") and feb["Date"].max() < pd.Timestamp("2024-03-01")
+
+    # inside the covered range: no fetch
+    cache.get("AAPL", "2024-02-05", "2024-02-10")
+    assert len(fetch.calls) == 1
+
+    # wider on both sides: just the head and tail segments
+    wide = cache.get("AAPL", "2024-01-01", "2024-04-01")
+    assert fetch.calls[1:] == [("2024-01-01", "2024-02-01"), ("2024-03-01", "2024-04-01")]
+    assert list(wide["Date"]) == list(pd.bdate_range("2024-01-01", "2024-04-01", inclusive="left"))
+    assert wide["Date"].is_unique
+
+
+def test_ranges_persist_on_disk(tmp_path, fetch):
+    PriceCache(tmp_path, fetch=fetch).get("AAPL", "2024-02-01", "2024-03-01")
+    other = PriceCache(tmp_path, fetch=fetch)
+    other.get("AAPL", "2024-02-01", "2024-03-01")
+    assert len(fetch.calls) == 1
+    assert other.stats["disk_hits"] == 1
+    assert not list(tmp_path.glob("*.tmp")) and not list(tmp_path.glob(".*.tmp"))
+
+
+def test_open_ended_end_is_today(tmp_path, fetch):
+    cache = PriceCache(tmp_path, fetch=fetch)
+    start = (pd.Timestamp.today().normalize() - pd.Timedelta(days=20)).strftime("%Y-%m-%d")
+    cache.get("AAPL", start)
+    cache.get("AAPL", start)
+    today = pd.Timestamp.today().strftime("%Y-%m-%d")
+    assert fetch.calls == [(start, today)]
+
+
+def test_empty_fetch_is_not_cached_as_covered(tmp_path):
+    fetch = FakeFetch(fail_first=1)
+    cache = PriceCache(tmp_path, fetch=fetch)
+    assert cache.get("AAPL", "2024-01-01", "2024-02-01").empty
+    jan = cache.get("AAPL", "2024-01-01", "2024-02-01")
+    assert len(fetch.calls) == 2
+    assert len(jan) == len(pd.bdate_range("2024-01-01", "2024-02-01", inclusive="left"))
+
+
+def test_empty_tail_keeps_covered_range(tmp_path):
+    fetch = FakeFetch()
+    cache = PriceCache(tmp_path, fetch=fetch)
+    cache.get("AAPL", "2024-02-01", "2024-03-01")
+    fetch.fail_first = 2  # the next call (the tail segment) fails
+    cache.get("AAPL", "2024-02-01", "2024-04-01")
+    march = cache.get("AAPL", "2024-03-01", "2024-04-01")
+    assert fetch.calls[1:] == [("2024-03-01", "2024-04-01")] * 2
+    assert not march.empty
@@ -0,0 +1,46 @@
+# tests/test_cleaning.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cleaning import CleaningPipeline, drop_missing, fill_missing_median, normalize_data
+
+
+@pytest.fixture
+def raw():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(200, 4)) * [1, 10, 100, 0.1], columns=["a", "b", "c", "d"])
+    df.loc[rng.random(200) < 0.1, "a"] = np.nan
+    df.loc[rng.random(200) < 0.7, "d"] = np.nan  # dropped at threshold 0.5
+    df["flat"] = 3.0  # zero range
+    df["label"] = "x"
+    return df
+
+
+def _sequential(df, cols):
+    df = drop_missing(df.copy(), 0.5)
+    kept = [c for c in cols if c in df.columns]
+    df = fill_missing_median(df, kept)
+    return normalize_data(df, kept)
+
+
+def test_pipeline_matches_sequential_functions(raw):
+    cols = ["a", "b", "c", "d", "flat"]
+    expected = _sequential(raw, cols)
+    out = CleaningPipeline().drop_missing(0.5).fill_missing_median(cols).normalize(cols).fit_transform(raw, copy=True)
+    assert list(out.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(out, expected, check_exact=False, rtol=1e-12)
+
+
+def test_saved_pipeline_transforms_like_fitted(raw, tmp_path):
+    cols = ["a", "b", "c"]
+    pipe = CleaningPipeline().drop_missing(0.5).fill_missing_median(cols).normalize(cols).fit(raw)
+    pipe.save(tmp_path / "cleaning.json")
+    live = raw.iloc[:50].copy()
+    pd.testing.assert_frame_equal(CleaningPipeline.load(tmp_path / "cleaning.json").transform(live, copy=True),
+                                  pipe.transform(live, copy=True))
+
+
+def test_transform_requires_fit(raw):
+    with pytest.raises(RuntimeError):
+        CleaningPipeline().normalize(["a"]).transform(raw)
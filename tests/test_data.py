@@ -0,0 +1,58 @@
+# tests/test_data.py
+import threading
+import time
+
+import pandas as pd
+
+from src.data import download_many
+
+
+def test_download_many_yields_every_ticker_concurrently():
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def fetch(ticker, start, end, auto_adjust=True):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return pd.DataFrame({"Date": pd.bdate_range(start, end, inclusive="left"), "Close": 1.0})
+
+    tickers = [f"T{i}" for i in range(8)]
+    stats = {}
+    got = dict(download_many(tickers, "2024-01-01", "2024-01-15", max_workers=4, fetch=fetch, stats=stats))
+    assert sorted(got) == tickers
+    assert all(len(df) == 10 for df in got.values())
+    assert 1 < peak[0] <= 4
+    assert all(s["ok"] and s["attempts"] == 1 and s["rows"] == 10 for s in stats.values())
+
+
+def test_download_many_retries_then_reports_failures():
+    calls = {}
+
+    def fetch(ticker, start, end, auto_adjust=True):
+        calls[ticker] = calls.get(ticker, 0) + 1
+        if ticker == "BAD" or calls[ticker] == 1:
+            raise ConnectionError("rate limited")
+        return pd.DataFrame({"Date": [pd.Timestamp(start)], "Close": [1.0]})
+
+    stats = {}
+    got = dict(download_many(["OK", "BAD"], "2024-01-02", "2024-01-03", retries=2, backoff=0.001,
+                             fetch=fetch, stats=stats))
+    assert list(got) == ["OK"]
+    assert stats["OK"]["attempts"] == 2
+    assert stats["BAD"] == {**stats["BAD"], "ok": False, "attempts": 3, "rows": 0}
+    assert "rate limited" in stats["BAD"]["error"]
+
+
+def test_rate_limit_spaces_download_starts():
+    starts = []
+
+    def fetch(ticker, start, end, auto_adjust=True):
+        starts.append(time.monotonic())
+        return pd.DataFrame({"Date": [pd.Timestamp(start)]})
+
+    list(download_many(list("ABCD"), "2024-01-02", "2024-01-03", max_workers=4, rate_limit=20, fetch=fetch))
+    gaps = [b - a for a, b in zip(sorted(starts), sorted(starts)[1:])]
+    assert min(gaps) >= 0.04
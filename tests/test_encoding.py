@@ -0,0 +1,115 @@
+# tests/test_encoding.py
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.encoding import CodeTable, RowEncoder
+
+DATA = Path(__file__).resolve().parent.parent / "bootcamp_backup_2025-08-29_12-51-03" / "data"
+
+# column layout and feature names used by bootcamp model/train_model.py
+RAW_COLUMNS = [
+    "checking_status", "duration", "credit_history", "purpose", "credit_amount",
+    "savings_status", "employment_since", "installment_rate_pct", "personal_status_sex",
+    "other_debtors", "residence_since", "property_magnitude", "age",
+    "other_installment_plans", "housing", "number_existing_credits", "job",
+    "people_liable_maintenance", "telephone", "foreign_worker", "target",
+]
+FEATURE_NAMES = [
+    "checking_status", "duration_months", "credit_history", "purpose", "credit_amount",
+    "savings_status", "employment_since", "installment_rate_pct", "personal_status_sex", "other_debtors",
+    "residence_since", "property_magnitude", "age_years", "other_installment_plans", "housing",
+    "number_credits", "job", "people_liable", "telephone", "foreign_worker",
+    "existing_credit", "dependents", "own_telephone", "foreign_worker_flag",
+]
+MAPS = {
+    "checking_status": {"A11": "<0", "A12": "0<= <200", "A13": ">=200", "A14": "no_checking"},
+    "credit_history": {f"A3{i}": f"ch{i}" for i in range(5)},
+    "purpose": {f"A4{i}": f"p{i}" for i in (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10)},
+    "savings_status": {f"A6{i}": f"s{i}" for i in range(1, 6)},
+    "employment_since": {f"A7{i}": f"e{i}" for i in range(1, 6)},
+    "personal_status_sex": {f"A9{i}": f"ps{i}" for i in range(1, 5)},
+    "other_debtors": {f"A10{i}": f"od{i}" for i in range(1, 4)},
+    "property_magnitude": {f"A12{i}": f"pm{i}" for i in range(1, 5)},
+    "other_installment_plans": {f"A14{i}": f"oi{i}" for i in range(1, 4)},
+    "housing": {f"A15{i}": f"h{i}" for i in range(1, 4)},
+    "job": {f"A17{i}": f"j{i}" for i in range(1, 5)},
+    "telephone": {"A191": "none", "A192": "yes_registered"},
+    "foreign_worker": {"A201": "yes", "A202": "no"},
+}
+
+
+@pytest.fixture(scope="module")
+def german():
+    if not (DATA / "german.data").exists():
+        pytest.skip("German credit data not available")
+    raw = pd.read_csv(DATA / "german.data", sep=r"\s+", header=None, names=RAW_COLUMNS)
+    numeric = pd.read_csv(DATA / "german.data-numeric", sep=r"\s+", header=None)
+    numeric.columns = FEATURE_NAMES + ["target"]
+    table = CodeTable.from_aligned(raw[list(MAPS)], numeric[FEATURE_NAMES], MAPS)
+    return raw, numeric[FEATURE_NAMES], table
+
+
+def test_from_aligned_uses_numeric_file_values(german):
+    _, _, table = german
+    # slot 0 of german.data-numeric is checking status coded 1..4, not positions 0..3
+    assert table.code("checking_status", "A11") == 1
+    assert table.code("checking_status", "no_checking") == 4
+    assert table.values["credit_history"] == {"A30": 0, "A31": 1, "A32": 2, "A33": 3, "A34": 4}
+    # slot 3 holds credit amount / 100 and slots 15+ one-hot indicators: no string codes there
+    assert "purpose" not in table.columns
+    assert "job" not in table.columns
+    # slots are matched by name only: the telephone codes in slot 13 don't make it other_installment_plans
+    assert table.columns == ["checking_status", "credit_history"]
+
+
+@pytest.mark.parametrize("row", [0, 1, 17, 500, 999])
+def test_encoded_row_matches_german_data_numeric(german, row):
+    raw, numeric, table = german
+    expected = numeric.iloc[row].to_numpy(dtype=np.float64)
+    # send the A-codes for every slot the table covers, the numeric file's value elsewhere
+    payload = {name: raw.iloc[row][name] if name in table.columns else float(number)
+               for name, number in zip(FEATURE_NAMES, expected)}
+    assert any(isinstance(v, str) for v in payload.values())
+    np.testing.assert_array_equal(RowEncoder(FEATURE_NAMES, table).encode(payload)[0], expected)
+
+
+def test_strings_rejected_for_uncovered_slots(german):
+    _, _, table = german
+    encoder = RowEncoder(FEATURE_NAMES, table)
+    with pytest.raises(ValueError, match="purpose"):
+        encoder.encode({"purpose": "A43"})
+    with pytest.raises(ValueError, match="Unknown value"):
+        encoder.encode({"checking_status": "A15"})
+
+
+def test_labels_only_accepted_for_their_own_column(german):
+    _, _, table = german
+    assert table.code("credit_history", "ch2") == 2
+    for col, value in [("checking_status", "ch2"), ("checking_status", "A30"), ("credit_history", "no_checking")]:
+        with pytest.raises(ValueError, match="Unknown value"):
+            table.code(col, value)
+    with pytest.raises(ValueError, match="without codes"):
+        CodeTable({"checking_status": MAPS["checking_status"]}, values={"telephone": {"A191": 1, "A192": 2}})
+
+
+def test_code_table_round_trip(german, tmp_path):
+    _, _, table = german
+    table.save(tmp_path / "code_table.json")
+    loaded = CodeTable.load(tmp_path / "code_table.json")
+    assert loaded.values == table.values
+    assert loaded.maps == table.maps
+    assert loaded.code("checking_status", "no_checking") == 4
+
+
+def test_encode_frame_positions():
+    table = CodeTable({"checking_status": MAPS["checking_status"]})
+    codes = table.encode("checking_status", np.array(["A14", "A11", "A99"]))
+    np.testing.assert_array_equal(codes, [3, 0, -1])
+    # lists, missing values and pandas string columns
+    np.testing.assert_array_equal(table.encode("checking_status", ["A12", None, "A12"]), [1, -1, 1])
+    frame = table.encode_frame(pd.DataFrame({"checking_status": pd.Series(["A13", None, "A11"], dtype="str")}))
+    assert frame["checking_status"].tolist()[::2] == [">=200", "<0"]
+    assert frame["checking_status"].isna().tolist() == [False, True, False]
@@ -0,0 +1,48 @@
+# tests/test_fast_scorer.py
+import numpy as np
+import pytest
+from sklearn.ensemble import ExtraTreesRegressor, RandomForestClassifier
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression, Ridge
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+from src.fast_scorer import compile_scorer
+from src.serving import predict_rows
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, 7))
+    y = (X[:, 0] + 0.5 * X[:, 1] + rng.normal(scale=0.5, size=400) > 0).astype(int)
+    X[rng.random(X.shape) < 0.05] = np.nan
+    imputer = SimpleImputer(strategy="median").fit(X)
+    X_test = rng.normal(size=(100, 7))
+    X_test[rng.random(X_test.shape) < 0.1] = np.nan
+    return X, y, imputer, X_test
+
+
+@pytest.mark.parametrize("make_model", [
+    lambda: make_pipeline(StandardScaler(), LogisticRegression()),
+    lambda: DecisionTreeClassifier(max_depth=6, random_state=0),
+    lambda: RandomForestClassifier(n_estimators=20, random_state=0),
+    lambda: Ridge(),
+    lambda: ExtraTreesRegressor(n_estimators=10, random_state=0),
+])
+def test_fast_scorer_matches_sklearn(data, make_model):
+    X, y, imputer, X_test = data
+    model = make_model().fit(imputer.transform(X), y)
+    meta = {"threshold": 0.5}
+    scorer = compile_scorer(model, imputer, meta)
+    assert scorer is not None
+    assert scorer(X_test) == predict_rows(model, imputer, meta, X_test)
+
+
+def test_unsupported_model_falls_back(data):
+    X, y, imputer, _ = data
+    model = make_pipeline(StandardScaler(), LogisticRegression()).fit(imputer.transform(X), y)
+    # an indicator column changes the feature layout, which the scorer doesn't reproduce
+    indicator = SimpleImputer(add_indicator=True).fit(X)
+    assert compile_scorer(model, indicator, {}) is None
@@ -0,0 +1,70 @@
+# tests/test_feature_store.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.feature_store import FeatureStore
+from src.features import FEATURE_COLUMNS
+
+
+def _frame(n, start="2024-01-01", value=0.0):
+    dates = pd.date_range(start, periods=n, freq="D")
+    data = {c: np.arange(n, dtype=np.float32) + value + i for i, c in enumerate(FEATURE_COLUMNS)}
+    return pd.DataFrame({"Date": dates, **data})
+
+
+def test_write_same_row_count_returns_new_values(tmp_path):
+    store = FeatureStore(tmp_path)
+    store.write("AAPL", _frame(5))
+    np.testing.assert_array_equal(store.latest("AAPL")[0], _frame(5).iloc[-1][FEATURE_COLUMNS].to_numpy(np.float32))
+
+    store.write("AAPL", _frame(5, value=100.0))
+    np.testing.assert_array_equal(store.latest("AAPL")[0], _frame(5, value=100.0).iloc[-1][FEATURE_COLUMNS].to_numpy(np.float32))
+
+
+def test_write_seen_by_another_store_instance(tmp_path):
+    reader, writer = FeatureStore(tmp_path), FeatureStore(tmp_path)
+    writer.write("AAPL", _frame(5))
+    assert reader.latest("AAPL")[0, 0] == 4
+    writer.write("AAPL", _frame(5, value=50.0))
+    assert reader.latest("AAPL")[0, 0] == 54
+
+
+def test_append_extends_cached_maps(tmp_path):
+    store = FeatureStore(tmp_path)
+    store.write("AAPL", _frame(5))
+    assert len(store.read("AAPL")) == 5
+    store.append("AAPL", _frame(3, start="2024-01-06", value=10.0))
+    frame = store.read("AAPL")
+    assert len(frame) == 8
+    assert frame[FEATURE_COLUMNS[0]].iloc[-1] == 12
+
+
+def test_column_mismatch_is_a_clear_error(tmp_path):
+    FeatureStore(tmp_path, columns=FEATURE_COLUMNS[:3]).write("AAPL", _frame(5))
+    with pytest.raises(ValueError, match="lack column"):
+        FeatureStore(tmp_path).latest("AAPL")
+    with pytest.raises(ValueError, match="no column"):
+        FeatureStore(tmp_path, columns=FEATURE_COLUMNS[:3]).latest("AAPL", columns=["Volume"])
+
+
+def test_missing_ticker_is_key_error(tmp_path):
+    with pytest.raises(KeyError):
+        FeatureStore(tmp_path).latest("MSFT")
+
+
+def test_open_maps_are_bounded_lru(tmp_path):
+    store = FeatureStore(tmp_path, max_open=2)
+    for t in ["AAA", "BBB", "CCC"]:
+        store.write(t, _frame(5))
+    store.latest("AAA")
+    store.latest("BBB")
+    store.latest("AAA")  # BBB is now the least recently read
+    store.latest("CCC")
+    assert list(store._maps) == ["AAA", "CCC"]
+    # views handed out before eviction stay valid, and evicted tickers are re-mapped on demand
+    view = store.columns_view("AAA")[1][FEATURE_COLUMNS[0]]
+    assert store.latest("BBB")[0, 0] == 4
+    assert store.latest("CCC")[0, 0] == 4
+    assert list(store._maps) == ["BBB", "CCC"]
+    assert view[-1] == 4
@@ -0,0 +1,50 @@
+# tests/test_features.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features import FEATURE_COLUMNS, FeatureState, build_features, build_features_panel
+
+
+def _prices(n, seed=0, gaps=True):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.01, n))
+    volume = rng.integers(1_000, 10_000, n).astype(float)
+    if gaps:
+        close[[i for i in (30, 31, 75) if i < n]] = np.nan
+    return pd.DataFrame({"Date": pd.date_range("2022-01-03", periods=n, freq="B"), "Close": close, "Volume": volume})
+
+
+def test_feature_state_matches_build_features():
+    df = _prices(120)
+    expected = build_features(df)[FEATURE_COLUMNS]
+    state = FeatureState()
+    rows = pd.DataFrame([state.update(c, v) for c, v in zip(df["Close"], df["Volume"])], columns=FEATURE_COLUMNS)
+    pd.testing.assert_frame_equal(rows, expected, check_exact=False, rtol=1e-9, atol=1e-12)
+
+
+def test_feature_state_from_frame_and_restore():
+    df = _prices(150, gaps=False)
+    expected = build_features(df)[FEATURE_COLUMNS].iloc[-1]
+
+    state = FeatureState.from_frame(df.iloc[:-1])
+    row = state.update(df["Close"].iloc[-1], df["Volume"].iloc[-1])
+    np.testing.assert_allclose(pd.Series(row)[FEATURE_COLUMNS], expected, rtol=1e-9)
+
+    restored = FeatureState.restore(FeatureState.from_frame(df.iloc[:-1]).snapshot())
+    row = restored.update(df["Close"].iloc[-1], df["Volume"].iloc[-1])
+    np.testing.assert_allclose(pd.Series(row)[FEATURE_COLUMNS], expected, rtol=1e-9)
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_panel_matches_per_ticker_loop(n_jobs):
+    frames = {t: _prices(n, seed=i) for i, (t, n) in enumerate({"AAA": 90, "BBB": 15, "CCC": 60}.items())}
+    long = pd.concat([f.assign(Ticker=t) for t, f in frames.items()], ignore_index=True)
+    long = long.sample(frac=1, random_state=0)  # the panel sorts by (Ticker, Date) itself
+
+    panel = build_features_panel(long, n_jobs=n_jobs)
+    loop = pd.concat([build_features(f).assign(Ticker=t) for t, f in sorted(frames.items())], ignore_index=True)
+
+    cols = ["Return", "Return_next", "Target"] + FEATURE_COLUMNS
+    pd.testing.assert_frame_equal(panel[cols], loop[cols], check_exact=False, rtol=1e-9, atol=1e-12)
+    assert panel.attrs["build_stats"]["tickers"] == 3
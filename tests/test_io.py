@@ -0,0 +1,44 @@
+# tests/test_io.py
+import numpy as np
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from src.fast_scorer import compile_scorer
+from src.io import LazyArtifact, load_artifacts, save_artifacts
+
+
+def _fit(seed):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(200, 5))
+    y = (X[:, 0] + rng.normal(scale=0.5, size=200) > 0).astype(int)
+    imputer = SimpleImputer().fit(X)
+    scaler = StandardScaler().fit(X)
+    return LogisticRegression().fit(scaler.transform(X), y), imputer, scaler
+
+
+def test_resave_leaves_mapped_model_unchanged(tmp_path):
+    model, imputer, scaler = _fit(0)
+    save_artifacts(tmp_path, model, imputer, scaler, {"threshold": 0.5})
+    loaded, *_ = load_artifacts(tmp_path, mmap_mode="r")
+    before = np.array(loaded.coef_)
+
+    other, imputer2, scaler2 = _fit(1)
+    save_artifacts(tmp_path, other, imputer2, scaler2, {"threshold": 0.5})
+
+    np.testing.assert_array_equal(loaded.coef_, before)
+    reloaded, *_ = load_artifacts(tmp_path, mmap_mode="r")
+    np.testing.assert_array_equal(reloaded.coef_, other.coef_)
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_lazy_artifacts_compile_a_scorer(tmp_path):
+    model, imputer, scaler = _fit(0)
+    save_artifacts(tmp_path, model, imputer, scaler, {"threshold": 0.5})
+    lazy_model, lazy_imputer, _, meta = load_artifacts(tmp_path, mmap_mode="r", lazy=True)
+    assert isinstance(lazy_model, LazyArtifact) and not lazy_model.loaded
+
+    scorer = compile_scorer(lazy_model, lazy_imputer, meta)
+    assert scorer is not None
+    X = np.random.default_rng(2).normal(size=(10, 5))
+    np.testing.assert_array_equal(scorer(X), compile_scorer(model, imputer, meta)(X))
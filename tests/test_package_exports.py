@@ -0,0 +1,47 @@
+# tests/test_package_exports.py
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import src
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _loaded_after(code: str) -> set:
+    """Modules from a fixed list that are in sys.modules after running `code` in a fresh interpreter."""
+    probe = (f"import sys\n{code}\nimport json\n"
+             "print(json.dumps([m for m in ('pandas', 'yfinance', 'sklearn', 'src.data', 'src.features', "
+             "'src.io') if m in sys.modules]))")
+    out = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, timeout=120)
+    assert out.returncode == 0, out.stderr
+    return set(json.loads(out.stdout.splitlines()[-1]))
+
+
+def test_import_src_loads_nothing_heavy():
+    assert _loaded_after("import src") == set()
+
+
+def test_export_loads_only_its_own_module():
+    loaded = _loaded_after("import src\nsrc.build_features")
+    assert {"pandas", "src.features"} <= loaded
+    assert not loaded & {"yfinance", "src.data", "src.io"}
+
+
+def test_exports_resolve_to_submodule_objects():
+    from src.features import build_features
+    from src.io import load_artifacts
+
+    assert src.build_features is build_features
+    assert src.load_artifacts is load_artifacts
+    assert "build_features" in vars(src)  # cached after the first lookup
+    assert set(src.__all__) <= set(dir(src))
+
+
+def test_unknown_attribute_is_attribute_error():
+    with pytest.raises(AttributeError, match="no attribute 'nope'"):
+        src.nope
+    assert not hasattr(src, "nope")
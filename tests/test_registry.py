@@ -0,0 +1,65 @@
+# tests/test_registry.py
+import os
+import threading
+
+import numpy as np
+import pytest
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from src.io import save_artifacts
+from src.registry import ModelRegistry
+
+
+@pytest.fixture
+def art_dir(tmp_path):
+    X = np.random.default_rng(0).normal(size=(50, 3))
+    y = (X[:, 0] > 0).astype(int)
+    save_artifacts(tmp_path, LogisticRegression().fit(X, y), SimpleImputer().fit(X), StandardScaler().fit(X), {"threshold": 0.5})
+    return tmp_path
+
+
+def _child_threads() -> int:
+    """Fork, count the child's registry watcher threads and return that count."""
+    r, w = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(r)
+        os.write(w, bytes([sum(t.name == "model-registry" for t in threading.enumerate())]))
+        os._exit(0)
+    os.close(w)
+    count = os.read(r, 1)[0]
+    os.close(r)
+    os.waitpid(pid, 0)
+    return count
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_watcher_restarted_in_children(art_dir):
+    registry = ModelRegistry(art_dir, poll_interval=60).start()
+    try:
+        assert _child_threads() == 1
+    finally:
+        registry.stop(wait=True)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_stopped_registry_stays_stopped_in_children(art_dir):
+    registry = ModelRegistry(art_dir, poll_interval=60).start()
+    registry.stop(wait=True)
+    assert not registry._thread.is_alive()
+    assert _child_threads() == 0
+    assert registry.current() is not None
+
+
+def test_meta_only_change_is_a_new_version(art_dir):
+    registry = ModelRegistry(art_dir, poll_interval=0).start()
+    active = registry.current()
+    assert active.meta["threshold"] == 0.5
+
+    # same pickles, new threshold
+    save_artifacts(art_dir, active.model, active.imputer, active.scaler, {"threshold": 0.9})
+    assert registry.reload()
+    assert registry.current().meta["threshold"] == 0.9
+    assert not registry.reload()
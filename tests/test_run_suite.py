@@ -0,0 +1,46 @@
+# tests/test_run_suite.py
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BENCHMARKS = ROOT / "benchmarks"
+sys.path.insert(0, str(BENCHMARKS))
+
+from run_suite import compare  # noqa: E402
+
+
+def _result(name, seconds, mb):
+    return {"name": name, "seconds_median": seconds, "peak_mb": mb}
+
+
+def test_compare_flags_only_meaningful_growth():
+    baseline = {"results": [_result("slow", 0.100, 10), _result("tiny", 0.0001, 10), _result("fat", 0.1, 10),
+                            _result("gone", 0.1, 10)]}
+    rows = compare([_result("slow", 0.200, 10), _result("tiny", 0.0005, 10), _result("fat", 0.1, 20),
+                    _result("new", 1.0, 10)], baseline, threshold=0.25)
+    flagged = {r["name"]: r["regression"] for r in rows}
+    # "tiny" grew 5x but by less than min_seconds; cases on only one side are skipped
+    assert flagged == {"slow": True, "tiny": False, "fat": True}
+
+
+def _run(*args, cwd):
+    return subprocess.run([sys.executable, str(BENCHMARKS / "run_suite.py"), "--repeat", "1", "--only", "io",
+                           "--only", "*panel*", *args], cwd=cwd, capture_output=True, text=True, timeout=300)
+
+
+def test_suite_runs_offline_and_compares_with_baseline(tmp_path):
+    out, baseline = tmp_path / "latest.json", tmp_path / "baseline.json"
+    first = _run("--out", str(out), "--baseline", str(baseline), "--save-baseline", cwd=tmp_path)
+    assert first.returncode == 0, first.stderr
+    report = json.loads(baseline.read_text())
+    names = [r["name"] for r in report["results"]]
+    assert names == ["features.build_features_panel[tickers=1]", "features.build_features_panel[tickers=100]",
+                     "io.load_artifacts[mmap=none]", "io.load_artifacts[mmap=r]"]
+    assert all(r["seconds_median"] > 0 and r["throughput"] for r in report["results"])
+    assert report["yfinance_stub_calls"] == 0
+
+    second = _run("--out", str(out), "--baseline", str(baseline), "--threshold", "100", cwd=tmp_path)
+    assert second.returncode == 0, second.stderr
+    assert f"Against {baseline}" in second.stdout and "regression(s)" not in second.stdout
@@ -0,0 +1,88 @@
+# tests/test_serve.py
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+HOMEWORK13 = Path(__file__).resolve().parent.parent / "homework" / "homework13"
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork") or shutil.which("pgrep") is None,
+                                reason="serve.py pre-forks workers; their pids are listed with pgrep")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _children(pid: int) -> set:
+    out = subprocess.run(["pgrep", "-P", str(pid)], capture_output=True, text=True).stdout
+    return {int(p) for p in out.split()}
+
+
+def _wait(condition, proc, timeout: float = 60, what: str = "condition"):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if proc.poll() is not None:
+            pytest.fail(f"serve.py exited with {proc.returncode} while waiting for {what}")
+        if time.monotonic() > deadline:
+            pytest.fail(f"timed out waiting for {what}")
+        time.sleep(0.1)
+
+
+def _health(port: int) -> dict:
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=10) as r:
+        return json.loads(r.read())
+
+
+@pytest.fixture
+def server(homework13_env, tmp_path):
+    _, env = homework13_env
+    port, ready = _free_port(), tmp_path / "ready"
+    proc = subprocess.Popen([sys.executable, str(HOMEWORK13 / "serve.py"), "--port", str(port), "--workers", "2",
+                             "--threads", "2", "--ready-file", str(ready), "--graceful-timeout", "10"],
+                            cwd=HOMEWORK13, env={**os.environ, **env},
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait(ready.exists, proc, what="the first generation to be ready")
+        yield proc, port
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def test_sighup_replaces_workers_and_keeps_serving(server):
+    proc, port = server
+    old = _children(proc.pid)
+    assert len(old) == 2
+    assert _health(port)["status"] == "ok"
+
+    proc.send_signal(signal.SIGHUP)
+    # the new generation is forked first; the old one is drained once the new one is ready
+    _wait(lambda: (lambda now: len(now) == 2 and not now & old)(_children(proc.pid)), proc,
+          what="the old workers to be replaced")
+    for _ in range(4):
+        assert _health(port)["status"] == "ok"
+
+
+def test_dead_worker_is_replaced(server):
+    proc, port = server
+    old = _children(proc.pid)
+    victim = min(old)
+    os.kill(victim, signal.SIGKILL)
+    _wait(lambda: (lambda now: len(now) == 2 and victim not in now)(_children(proc.pid)), proc,
+          what="the killed worker to be replaced")
+    assert _health(port)["status"] == "ok"